@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import ThrottleBucket
+
+
+class Command(BaseCommand):
+    help = "Delete throttle buckets that have fully refilled, in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of buckets deleted per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        # A bucket whose TAT has passed allows a full burst, same as no row
+        now = time.time()
+        batch_size = options["batch_size"]
+
+        deleted = 0
+        while True:
+            batch = list(
+                ThrottleBucket.objects.filter(tat__lte=now)
+                .order_by("tat")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+
+            # Re-check the TAT so buckets used since the select are kept
+            with transaction.atomic():
+                count, _ = ThrottleBucket.objects.filter(
+                    pk__in=batch, tat__lte=now
+                ).delete()
+            deleted += count
+            if len(batch) < batch_size:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} throttle buckets."))
@@ -0,0 +1,149 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+
+from apps.users.hashers import HashingGateBusy
+
+from .timing import KINDS, collect_timings, current_timings
+
+logger = logging.getLogger(__name__)
+
+
+class HashingGateMiddleware:
+    """
+    Answer requests that couldn't get a password hashing slot with 503.
+
+    API requests get a JSON body like DRF errors; pages get plain text.
+    Retry-After tells both when to try again.
+    """
+
+    message = "Too many sign-in attempts are being processed. Try again shortly."
+    # Most API clients send `Accept: */*`, so go by path, not negotiation
+    api_prefix = "/api/"
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingGateBusy):
+            return None
+
+        if request.path.startswith(self.api_prefix):
+            resp = JsonResponse({"detail": self.message}, status=503)
+        else:
+            resp = HttpResponse(self.message, status=503, content_type="text/plain")
+        resp["Retry-After"] = str(exception.retry_after)
+        return resp
+
+
+class ServerTimingMiddleware:
+    """
+    Time a sample of requests by kind of work (see apps/core/timing.py).
+
+    `SERVER_TIMING_SAMPLE_RATE` of requests get query, storage and render
+    times collected. Each sampled request logs one line of key=value fields
+    (also passed as `extra["server_timing"]` for structured handlers), and
+    gets a `Server-Timing` header when `SERVER_TIMING_HEADER` is set.
+
+    List this first in MIDDLEWARE, so the total covers other middleware and
+    the deferred render of template responses is timed last.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with collect_timings() as timings, self._wrap_queries(timings):
+            response = self.get_response(request)
+        return self._report(request, response, timings, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            # Connections are per thread, so wrap the ones of the thread that
+            # runs the request's sync code (views, ORM calls)
+            wrappers = await sync_to_async(self._wrap_queries)(timings)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(wrappers.close)()
+        return self._report(request, response, timings, start)
+
+    def _sampled(self) -> bool:
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def _wrap_queries(self, timings) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+        return stack
+
+    def _report(self, request, response, timings, start):
+        total = time.perf_counter() - start
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "app_ms": round(timings.app_seconds(total) * 1000, 1),
+        }
+        for kind in KINDS:
+            fields[f"{kind}_ms"] = round(timings.seconds[kind] * 1000, 1)
+            fields[f"{kind}_count"] = timings.calls[kind]
+        logger.info(
+            "server_timing %s",
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"server_timing": fields},
+        )
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = timings.header(total)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called last, just before the handler renders the response; the
+        # post-render callback closes the span
+        if timings := current_timings():
+            timings.start("render")
+
+            def rendered(response):
+                timings.stop("render")
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ThrottleBucket",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                (
+                    "tat",
+                    models.FloatField(
+                        help_text="Theoretical arrival time (epoch seconds)."
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["tat"], name="core_throttle_tat_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,139 @@
+"""
+Mixins for querying and rendering the dashboard file list.
+"""
+
+import hashlib
+from typing import Any
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.files.cache import (
+    FRAGMENT_TIMEOUT,
+    entry_timeout,
+    get_active_file_stats,
+    versioned_key,
+)
+from apps.files.models import UploadedFile
+from apps.files.search import search_files
+
+from .utils.fragments import inject_csrf, render_fragment
+from .utils.pagination import KnownCountPaginator
+
+
+class FileListMixin:
+    """
+    Page through the current user's active files and render list fragments.
+
+    Besides the full list partial, single rows and the pagination bar can be
+    rendered on their own, so AJAX handlers can send deltas instead of
+    re-rendering a whole page. An optional `search` parameter (query string
+    or form field) narrows the list by filename.
+    """
+
+    list_partial_template = "_partials/_files_list.html"
+    row_partial_template = "_partials/_file_row.html"
+    pagination_partial_template = "_partials/_files_pagination.html"
+    PAGE_SIZE = 10
+    ORDERING = ("-uploaded_at", "-id")
+    search_param = "search"
+
+    def _search(self, request) -> str:
+        """
+        Return the filename search term for this request, if any.
+        """
+        term = request.GET.get(self.search_param) or request.POST.get(
+            self.search_param, ""
+        )
+        return term.strip()[: UploadedFile._meta.get_field("filename").max_length]
+
+    def _page(self, request, page_number: Any) -> Page:
+        """
+        Return a paginated page of the current user's uploaded files.
+        Falls back gracefully on invalid or out-of-range page numbers.
+
+        Without a search, the total count comes from the per-user stats
+        cache, so a page costs a single slice query.
+        """
+        qs = (
+            UploadedFile.objects.filter(user=request.user)
+            .active()
+            .order_by(*self.ORDERING)
+        )
+        if search := self._search(request):
+            paginator = Paginator(search_files(qs, search), self.PAGE_SIZE)
+        else:
+            stats = get_active_file_stats(request.user.pk)
+            paginator = KnownCountPaginator(qs, self.PAGE_SIZE, count=stats.count)
+        return paginator.get_page(page_number)
+
+    def _list_html(self, request, page: Page) -> SafeString:
+        """
+        Render the file list partial for a page.
+
+        Rendered HTML is cached per (user, page, ordering, search) under the
+        user's collection version, and the CSRF token is injected after the
+        lookup, so a cache hit skips both the page query and the template
+        render.
+        """
+        search = self._search(request)
+        key = versioned_key(
+            request.user.pk,
+            "list",
+            page.number,
+            ",".join(self.ORDERING),
+            hashlib.md5(search.encode()).hexdigest(),
+        )
+        html = cache.get(key)
+        if html is None:
+            ctx = {
+                "files": page.object_list,
+                "page_obj": page,
+                "paginator": page.paginator,
+                "search": search,
+            }
+            html = render_fragment(self.list_partial_template, ctx, request)
+            cache.set(key, html, entry_timeout(FRAGMENT_TIMEOUT))
+        return mark_safe(inject_csrf(html, request))
+
+    def _row_html(self, request, file: UploadedFile) -> SafeString:
+        """
+        Render a single file row.
+        """
+        html = render_fragment(self.row_partial_template, {"f": file}, request)
+        return mark_safe(inject_csrf(html, request))
+
+    def _pagination_html(self, request, page: Page) -> SafeString:
+        """
+        Render the pagination bar for a page (empty when there is one page).
+
+        Only counts are needed, so this never evaluates the page's rows.
+        """
+        ctx = {
+            "page_obj": page,
+            "paginator": page.paginator,
+            "search": self._search(request),
+        }
+        return render_to_string(self.pagination_partial_template, ctx, request)
+
+    def _fill_row(self, page: Page) -> UploadedFile | None:
+        """
+        Return the file that now ends `page` after a row above it was removed.
+        """
+        if page.number < page.paginator.num_pages:
+            end = page.number * self.PAGE_SIZE
+            return page.paginator.object_list[end - 1 : end].first()
+        return None
+
+    def _counts(self, page: Page) -> dict:
+        """
+        Page position and totals included in every AJAX list response.
+        """
+        return {
+            "page": page.number,
+            "num_pages": page.paginator.num_pages,
+            "count": page.paginator.count,
+            "page_size": self.PAGE_SIZE,
+        }
@@ -1 +1,63 @@
-# Create your models here.
+from django.db import connections, models
+
+# QuerySet / manager helpers
+
+
+class ThrottleBucketManager(models.Manager):
+    """
+    Manager with an atomic GCRA step for throttling.
+    """
+
+    def acquire(self, key: str, now: float, interval: float, period: float) -> float:
+        """
+        Take one request from the bucket for `key` and return 0.0, or the
+        seconds to wait if the bucket is empty.
+
+        Each request pushes the bucket's theoretical arrival time (TAT) one
+        `interval` (period / limit) further; a request is allowed while
+        the pushed TAT stays within `period` of now. The allowed path is a
+        single upsert, so concurrent workers can't lose each other's
+        requests. Postgres and SQLite (3.35+) share the syntax.
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        table, key_col, tat_col = qn(self.model._meta.db_table), qn("key"), qn("tat")
+        greatest = "MAX" if connection.vendor == "sqlite" else "GREATEST"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({key_col}, {tat_col}) VALUES (%s, %s) "
+                f"ON CONFLICT ({key_col}) DO UPDATE "
+                f"SET {tat_col} = {greatest}({table}.{tat_col}, %s) + %s "
+                f"WHERE {table}.{tat_col} <= %s "
+                f"RETURNING {tat_col}",
+                [key, now + interval, now, interval, now + period - interval],
+            )
+            if cursor.fetchone() is not None:
+                return 0.0
+
+        tat = self.filter(key=key).values_list("tat", flat=True).first()
+        return max(0.0, (tat or now) - period + interval - now)
+
+
+# Models
+
+
+class ThrottleBucket(models.Model):
+    """
+    Rate-limit state for one throttle key, shared by every worker.
+
+    Stores a single timestamp per key (GCRA), so storage stays constant no
+    matter how many requests the key makes. Rows whose TAT has passed are
+    equivalent to no row and can be deleted at any time.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    tat = models.FloatField(help_text="Theoretical arrival time (epoch seconds).")
+
+    objects = ThrottleBucketManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["tat"], name="core_throttle_tat_idx")]
+
+    def __str__(self):
+        return self.key
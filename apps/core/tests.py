@@ -1 +1,368 @@
-# Create your tests here.
+import re
+import time
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.middleware.csrf import _unmask_cipher_token
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.core.middleware import ServerTimingMiddleware
+from apps.core.models import ThrottleBucket
+from apps.core.throttling import ScopedRateThrottle
+from apps.core.timing import RequestTimings
+from apps.core.utils.fragments import CSRF_PLACEHOLDER
+from apps.files.cache import get_collection_version
+from apps.files.models import UploadedFile
+from apps.files.tests.factories import SharedLinkFactory, UploadedFileFactory
+from tests.query_budget import check_query_budget
+
+AJAX = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+
+@pytest.fixture
+def dashboard_client(client, user):
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_dashboard_ajax_page_reports_cached_count(dashboard_client, user):
+    UploadedFileFactory.create_batch(12, user=user)
+
+    resp = dashboard_client.get(reverse("core:dashboard"), {"page": 2}, **AJAX)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 12
+    assert data["page"] == 2
+    assert data["num_pages"] == 2
+
+
+@pytest.mark.django_db
+def test_dashboard_skips_count_query_when_cached(
+    dashboard_client, user, django_assert_max_num_queries
+):
+    UploadedFileFactory.create_batch(3, user=user)
+    url = reverse("core:dashboard")
+    dashboard_client.get(url, **AJAX)  # warm the cache
+
+    # session + user + page slice
+    with django_assert_max_num_queries(3) as ctx:
+        dashboard_client.get(url, **AJAX)
+    assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_dashboard_serves_cached_list_without_page_query(
+    dashboard_client, user, django_assert_max_num_queries
+):
+    UploadedFileFactory.create_batch(3, user=user)
+    url = reverse("core:dashboard")
+    dashboard_client.get(url, **AJAX)  # warm the cache
+
+    # session + user only
+    with django_assert_max_num_queries(2) as ctx:
+        resp = dashboard_client.get(url, **AJAX)
+    assert not any("files_uploadedfile" in q["sql"] for q in ctx.captured_queries)
+    assert resp.json()["html"].count("<li") == 3
+
+
+@pytest.mark.django_db
+def test_dashboard_cached_list_gets_request_csrf_token(dashboard_client, user):
+    UploadedFileFactory(user=user)
+    url = reverse("core:dashboard")
+    dashboard_client.get(url, **AJAX)
+
+    resp = dashboard_client.get(url, **AJAX)
+    html = resp.json()["html"]
+    tokens = re.findall(r'name="csrfmiddlewaretoken" value="([^"]+)"', html)
+    assert CSRF_PLACEHOLDER not in html
+    assert len(tokens) == 2
+    # Masked tokens differ per call but unmask to the session's secret
+    secret = resp.wsgi_request.META["CSRF_COOKIE"]
+    assert all(_unmask_cipher_token(t) == secret for t in tokens)
+
+
+@pytest.mark.django_db
+def test_dashboard_list_cache_invalidated_by_file_changes(dashboard_client, user):
+    f = UploadedFileFactory(user=user, filename="before.txt")
+    url = reverse("core:dashboard")
+    dashboard_client.get(url, **AJAX)
+
+    f.filename = "after.txt"
+    f.save()
+    html = dashboard_client.get(url, **AJAX).json()["html"]
+    assert "after.txt" in html
+    assert "before.txt" not in html
+
+    UploadedFileFactory(user=user, filename="new.txt")
+    assert "new.txt" in dashboard_client.get(url, **AJAX).json()["html"]
+
+
+@pytest.mark.django_db
+def test_dashboard_list_cache_invalidated_by_share_changes(dashboard_client, user):
+    f = UploadedFileFactory(user=user)
+    before = get_collection_version(user.pk)
+
+    SharedLinkFactory(file=f)
+    assert get_collection_version(user.pk) != before
+
+
+@pytest.mark.django_db
+def test_dashboard_upload_returns_inserted_row(dashboard_client, user):
+    UploadedFileFactory.create_batch(10, user=user)
+    upload = SimpleUploadedFile("fresh.txt", b"hello", content_type="text/plain")
+
+    resp = dashboard_client.post(reverse("core:dashboard"), {"file": upload}, **AJAX)
+    assert resp.status_code == 201
+    data = resp.json()
+    assert "html" not in data
+    assert data["row_html"].count("<li") == 1
+    assert f'id="f-{data["id"]}"' in data["row_html"]
+    assert "fresh.txt" in data["row_html"]
+    assert (data["count"], data["num_pages"], data["page_size"]) == (11, 2, 10)
+    assert "?page=2" in data["pagination_html"]
+
+
+@pytest.mark.django_db
+def test_dashboard_delete_returns_fill_row_from_next_page(dashboard_client, user):
+    UploadedFileFactory.create_batch(12, user=user)
+    ordered = list(
+        UploadedFile.objects.filter(user=user).order_by("-uploaded_at", "-id")
+    )
+    victim, fill = ordered[0], ordered[10]
+
+    resp = dashboard_client.post(
+        reverse("files:delete_file", args=[victim.pk]), {"page": 1}, **AJAX
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["id"] == str(victim.pk)
+    assert (data["page"], data["count"], data["num_pages"]) == (1, 11, 2)
+    assert f'id="f-{fill.pk}"' in data["fill_html"]
+
+
+@pytest.mark.django_db
+def test_dashboard_delete_on_last_page_has_no_fill_row(dashboard_client, user):
+    UploadedFileFactory.create_batch(11, user=user)
+    last = UploadedFile.objects.filter(user=user).order_by("uploaded_at", "id")[0]
+
+    resp = dashboard_client.post(
+        reverse("files:delete_file", args=[last.pk]), {"page": 2}, **AJAX
+    )
+    data = resp.json()
+    # Page 2 emptied out, so the client is pointed back at page 1
+    assert (data["page"], data["num_pages"]) == (1, 1)
+    assert data["fill_html"] == ""
+    assert data["pagination_html"].strip() == ""
+
+
+@pytest.mark.django_db
+def test_dashboard_search_filters_list_and_keeps_term_in_links(dashboard_client, user):
+    for i in range(12):
+        UploadedFileFactory(user=user, filename=f"photo-{i:02}.jpg")
+    UploadedFileFactory(user=user, filename="notes.txt")
+
+    resp = dashboard_client.get(reverse("core:dashboard"), {"search": "photo"}, **AJAX)
+    data = resp.json()
+    assert (data["count"], data["num_pages"]) == (12, 2)
+    assert "notes.txt" not in data["html"]
+    assert "search=photo" in data["html"]
+
+
+@pytest.mark.django_db
+def test_dashboard_ajax_list_revalidates_with_etag(
+    dashboard_client, user, django_assert_max_num_queries
+):
+    f = UploadedFileFactory(user=user)
+    url = reverse("core:dashboard")
+    dashboard_client.get(url, **AJAX)  # sets the CSRF cookie, like a page load
+    first = dashboard_client.get(url, **AJAX)
+    etag = first["ETag"]
+    assert "X-Requested-With" in first["Vary"]
+
+    # session + user only
+    with django_assert_max_num_queries(2) as ctx:
+        resp = dashboard_client.get(url, HTTP_IF_NONE_MATCH=etag, **AJAX)
+    assert resp.status_code == 304
+    assert not any("files_uploadedfile" in q["sql"] for q in ctx.captured_queries)
+
+    f.delete()
+    resp = dashboard_client.get(url, HTTP_IF_NONE_MATCH=etag, **AJAX)
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, budget",
+    # session + user + stats + page; searches also count their matches
+    [({}, 4), ({"page": 2}, 4), ({"search": "test"}, 5)],
+)
+def test_dashboard_ajax_list_query_budget(dashboard_client, user, params, budget):
+    url = reverse("core:dashboard")
+    check_query_budget(
+        lambda: dashboard_client.get(url, params, **AJAX),
+        budget=budget,
+        seed=lambda n: UploadedFileFactory.create_batch(n, user=user),
+    )
+
+
+@pytest.mark.django_db
+def test_dashboard_upload_query_budget(dashboard_client, user):
+    def upload(name):
+        upload = SimpleUploadedFile(name, b"hello", content_type="text/plain")
+        resp = dashboard_client.post(
+            reverse("core:dashboard"), {"file": upload}, **AJAX
+        )
+        assert resp.status_code == 201
+
+    names = iter(f"upload-{i}.txt" for i in range(10))
+    check_query_budget(
+        upload,
+        budget=5,
+        seed=lambda n: UploadedFileFactory.create_batch(n, user=user),
+        prepare=lambda: next(names),
+    )
+
+
+@pytest.mark.django_db
+def test_throttle_bucket_allows_burst_then_spaces_requests():
+    now = 1_000_000.0
+    # 3 per minute: a burst of 3, then one every 20 seconds
+    waits = [ThrottleBucket.objects.acquire("k", now, 20, 60) for _ in range(4)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(20)
+
+    assert ThrottleBucket.objects.acquire("k", now + 19, 20, 60) > 0
+    assert ThrottleBucket.objects.acquire("k", now + 20, 20, 60) == 0
+    assert ThrottleBucket.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_scoped_throttle_limits_across_requests(monkeypatch, user):
+    monkeypatch.setitem(ScopedRateThrottle.THROTTLE_RATES, "shares:meta", "2/minute")
+    link = SharedLinkFactory(file__user=user)
+    url = reverse("files_api:shares-detail", kwargs={"token": str(link.token)})
+
+    client = APIClient()
+    assert [client.get(url).status_code for _ in range(2)] == [200, 200]
+    resp = client.get(url)
+    assert resp.status_code == 429
+    assert 0 < int(resp["Retry-After"]) <= 30
+
+
+@pytest.mark.django_db
+def test_cleanup_throttle_buckets_keeps_active_buckets():
+    now = time.time()
+    ThrottleBucket.objects.create(key="refilled", tat=now - 1)
+    ThrottleBucket.objects.create(key="active", tat=now + 60)
+
+    call_command("cleanup_throttle_buckets", stdout=StringIO())
+    assert list(ThrottleBucket.objects.values_list("key", flat=True)) == ["active"]
+
+
+# Server-Timing
+
+
+def _timing_entries(resp):
+    # {"db": 'db;dur=1.2;desc="3"', ...}
+    entries = [entry.strip() for entry in resp["Server-Timing"].split(",")]
+    return {entry.split(";")[0]: entry for entry in entries}
+
+
+@pytest.fixture
+def server_timing(settings):
+    settings.SERVER_TIMING_SAMPLE_RATE = 1.0
+    settings.SERVER_TIMING_HEADER = True
+    # Full pages link static files; skip the collectstatic manifest
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+    return settings
+
+
+@pytest.mark.django_db
+def test_server_timing_header_breaks_down_dashboard(server_timing, dashboard_client):
+    resp = dashboard_client.get(reverse("core:dashboard"))
+
+    assert resp.status_code == 200
+    entries = _timing_entries(resp)
+    assert set(entries) == {"db", "render", "app", "total"}
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="\d+"', entries["db"])
+    assert re.fullmatch(r'render;dur=[\d.]+;desc="\d+"', entries["render"])
+
+
+@pytest.mark.django_db
+def test_server_timing_logs_sampled_requests(server_timing, dashboard_client, caplog):
+    server_timing.SERVER_TIMING_HEADER = False
+
+    with caplog.at_level("INFO", logger="apps.core.middleware"):
+        resp = dashboard_client.get(reverse("core:dashboard"))
+
+    assert "Server-Timing" not in resp
+    (record,) = [r for r in caplog.records if r.msg.startswith("server_timing")]
+    fields = record.server_timing
+    assert fields["path"] == reverse("core:dashboard")
+    assert fields["status"] == 200
+    assert fields["db_count"] > 0
+    assert fields["render_count"] > 0
+    assert "total_ms=" in record.getMessage()
+
+
+@pytest.mark.django_db
+def test_server_timing_off_when_not_sampled(server_timing, dashboard_client, caplog):
+    server_timing.SERVER_TIMING_SAMPLE_RATE = 0
+
+    with caplog.at_level("INFO", logger="apps.core.middleware"):
+        resp = dashboard_client.get(reverse("core:dashboard"))
+
+    assert "Server-Timing" not in resp
+    assert not caplog.records
+
+
+@pytest.mark.django_db
+def test_server_timing_includes_storage_calls(server_timing, client):
+    server_timing.STORAGES = {
+        **server_timing.STORAGES,
+        "media": server_timing.STORAGES["default"],
+        "default": {"BACKEND": "apps.files.storage.timed.TimedStorage"},
+    }
+    link = SharedLinkFactory()
+
+    resp = client.get(reverse("files:share_download", kwargs={"token": link.token}))
+
+    assert resp.status_code == 302
+    assert _timing_entries(resp)["storage"].endswith('desc="1"')
+
+
+@pytest.mark.django_db
+def test_server_timing_times_async_requests(server_timing, rf):
+    @sync_to_async
+    def view(request):
+        UploadedFile.objects.count()
+        return HttpResponse()
+
+    middleware = ServerTimingMiddleware(view)
+    resp = async_to_sync(middleware)(rf.get("/"))
+
+    assert iscoroutinefunction(middleware)
+    assert _timing_entries(resp)["db"].endswith('desc="1"')
+
+
+def test_request_timings_count_nested_spans_once():
+    timings = RequestTimings()
+    timings.start("storage")
+    timings.start("storage")
+    timings.stop("storage")
+    timings.stop("storage")
+
+    assert timings.calls["storage"] == 1
+    assert timings.app_seconds(total=0) == 0.0
+    assert timings.header(total=0.5).endswith("app;dur=500.0, total;dur=500.0")
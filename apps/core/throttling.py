@@ -0,0 +1,52 @@
+"""
+DRF throttles backed by the shared `ThrottleBucket` table.
+
+Drop-in replacements for DRF's anon, user and scoped throttles: scopes,
+rates and cache keys are unchanged, but limits are enforced with GCRA in
+the database instead of a per-process list of timestamps, so every worker
+counts against the same limit and each key costs one row.
+"""
+
+from rest_framework import throttling
+
+from .models import ThrottleBucket
+
+
+class GCRARateThrottle(throttling.SimpleRateThrottle):
+    """
+    SimpleRateThrottle that keeps its state in `ThrottleBucket`.
+
+    A limit of N per period allows a burst of N, then one request every
+    period / N.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.wait_seconds = ThrottleBucket.objects.acquire(
+            self.key,
+            now=self.timer(),
+            interval=self.duration / self.num_requests,
+            period=self.duration,
+        )
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle, GCRARateThrottle):
+    pass
+
+
+class UserRateThrottle(throttling.UserRateThrottle, GCRARateThrottle):
+    pass
+
+
+class ScopedRateThrottle(throttling.ScopedRateThrottle, GCRARateThrottle):
+    pass
@@ -0,0 +1,138 @@
+"""
+Per-request timing of database, storage and rendering work.
+
+`ServerTimingMiddleware` (apps/core/middleware.py) starts a `RequestTimings`
+for sampled requests and makes it current for the request's context. Code
+that does timed work reports into whatever collector is current, and does
+nothing when there is none:
+
+- queries, through a DB execute wrapper installed by the middleware
+- storage calls, through `TimedStorage` (apps/files/storage/timed.py)
+- template renders, through the `TimedDjangoTemplates` backend
+- DRF and TemplateResponse renders, timed by the middleware itself
+
+Spans of one kind don't nest: a template included while rendering another,
+or a storage call made by a storage wrapper, is only counted once. Spans of
+different kinds can overlap, e.g. a query run lazily by a template counts
+towards both db and render.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as BackendTemplate
+
+# Kinds reported, in Server-Timing order
+KINDS = ("db", "storage", "render")
+
+_current: ContextVar["RequestTimings | None"] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@dataclass
+class RequestTimings:
+    """
+    Seconds and call counts per kind of work, for one request.
+    """
+
+    seconds: Counter = field(default_factory=Counter)
+    calls: Counter = field(default_factory=Counter)
+    _depth: Counter = field(default_factory=Counter, repr=False)
+    _started: dict = field(default_factory=dict, repr=False)
+
+    def start(self, kind: str) -> None:
+        if self._depth[kind] == 0:
+            self._started[kind] = time.perf_counter()
+        self._depth[kind] += 1
+
+    def stop(self, kind: str) -> None:
+        self._depth[kind] -= 1
+        if self._depth[kind] == 0:
+            self.seconds[kind] += time.perf_counter() - self._started.pop(kind)
+            self.calls[kind] += 1
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """
+        `connection.execute_wrapper` callable that times each query.
+        """
+        self.start("db")
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stop("db")
+
+    def header(self, total: float) -> str:
+        """
+        Format as a `Server-Timing` header value (durations in ms).
+
+        `app` is the rest of the request: view code, serializers and
+        middleware.
+        """
+        entries = []
+        for kind in KINDS:
+            if self.calls[kind]:
+                entries.append(
+                    f'{kind};dur={self.seconds[kind] * 1000:.1f};desc="{self.calls[kind]}"'
+                )
+        entries.append(f"app;dur={self.app_seconds(total) * 1000:.1f}")
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def app_seconds(self, total: float) -> float:
+        return max(total - sum(self.seconds[kind] for kind in KINDS), 0.0)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_timings():
+    """
+    Make a new `RequestTimings` current for the enclosed code.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(kind: str):
+    """
+    Time the enclosed code as `kind` on the current request, if any.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    timings.start(kind)
+    try:
+        yield
+    finally:
+        timings.stop(kind)
+
+
+class TimedTemplate(BackendTemplate):
+    def render(self, context=None, request=None):
+        with timed("render"):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with renders timed for the current request.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
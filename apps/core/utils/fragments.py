@@ -0,0 +1,34 @@
+"""
+Helpers for caching rendered template fragments that contain CSRF forms.
+
+Fragments are rendered with a fixed placeholder instead of the CSRF token,
+and the request's own token is substituted after the cache lookup, so the
+cached HTML can be reused across requests.
+"""
+
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+
+CSRF_PLACEHOLDER = "csrf-token-placeholder"
+
+# Matches the attributes emitted by {% csrf_token %}; filenames and other
+# escaped text can never contain the literal quotes.
+_CSRF_ATTRS = 'name="csrfmiddlewaretoken" value="{}"'
+
+
+def render_fragment(template_name: str, context: dict, request=None) -> str:
+    """
+    Render a template with the CSRF placeholder in place of the real token.
+    """
+    return render_to_string(
+        template_name, {**context, "csrf_token": CSRF_PLACEHOLDER}, request
+    )
+
+
+def inject_csrf(html: str, request) -> str:
+    """
+    Replace CSRF placeholders in a rendered fragment with the request's token.
+    """
+    return html.replace(
+        _CSRF_ATTRS.format(CSRF_PLACEHOLDER), _CSRF_ATTRS.format(get_token(request))
+    )
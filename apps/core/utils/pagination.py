@@ -0,0 +1,52 @@
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class KnownCountPaginator(Paginator):
+    """
+    Paginator that takes the total count up front instead of querying it.
+    """
+
+    def __init__(self, object_list, per_page, *, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        return self._known_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates large counts instead of running COUNT(*).
+
+    On Postgres the planner's row estimate for the query is used once it
+    reaches `exact_below`; smaller results, and other databases, are counted
+    exactly. Page links near the end of a large result may be approximate.
+    """
+
+    exact_below = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        qs = self.object_list
+        if isinstance(qs, QuerySet) and connections[qs.db].vendor == "postgresql":
+            estimate = estimate_count(qs)
+            if estimate >= self.exact_below:
+                return estimate
+        return super().count
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Return the planner's row estimate for a queryset (Postgres only).
+
+    Comes from table statistics, so it costs no scan but is only as fresh
+    as the last ANALYZE.
+    """
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
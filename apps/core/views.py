@@ -1,15 +1,19 @@
-from typing import Any
-
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Page, Paginator
+from django.core.paginator import Page
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
-from django.template.loader import render_to_string
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from django.views.generic import TemplateView, View
 
+from apps.files.cache import listing_etag
 from apps.files.forms import FileUploadForm
-from apps.files.models import UploadedFile
 
+from .mixins import FileListMixin
 from .utils.request import is_ajax
 
 
@@ -21,77 +25,85 @@ class HomeView(TemplateView):
     template_name = "core/home.html"
 
 
-class DashboardView(LoginRequiredMixin, View):
+class DashboardView(LoginRequiredMixin, FileListMixin, View):
     """
     File upload dashboard for logged-in users.
     Supports AJAX and standard form submissions.
     """
 
     template_name = "core/dashboard.html"
-    list_partial_template = "_partials/_files_list.html"
-    PAGE_SIZE = 10
 
     # --- helpers ---
 
-    def _page(self, request, page_number: Any) -> Page:
-        """
-        Return a paginated page of the current user's uploaded files.
-        Falls back gracefully on invalid or out-of-range page numbers.
-        """
-        qs = (
-            UploadedFile.objects.filter(user=request.user)
-            .active()
-            .order_by("-uploaded_at", "-id")
-        )
-        paginator = Paginator(qs, self.PAGE_SIZE)
-        return paginator.get_page(page_number)
-
     def _context(self, request, page: Page, form: FileUploadForm | None = None) -> dict:
         """
         Build the template context for rendering.
         """
         return {
             "form": form or FileUploadForm(user=request.user),
-            "files": page.object_list,
+            "files_html": self._list_html(request, page),
             "page_obj": page,
             "paginator": page.paginator,
+            "search": self._search(request),
         }
 
     def _payload(self, page: Page, html: str) -> dict:
         """
         JSON envelope for successful list renders (used by AJAX).
         """
-        return {
-            "success": True,
-            "html": html,
-            "page": page.number,
-            "num_pages": page.paginator.num_pages,
-            "count": page.paginator.count,
-        }
+        return {"success": True, "html": html, **self._counts(page)}
+
+    def _ajax_list(self, request):
+        """
+        Serve a list page as JSON, or 304 if the client's copy is current.
+
+        The ETag covers the CSRF cookie too, since the cached HTML carries
+        tokens derived from it.
+        """
+        etag = listing_etag(
+            request.user.pk,
+            sorted(request.GET.lists()),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+        )
+        response = get_conditional_response(request, etag=etag) if etag else None
+        if response is None:
+            page = self._page(request, request.GET.get("page", 1))
+            html = self._list_html(request, page)
+            response = JsonResponse(self._payload(page, html))
+        if etag:
+            response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        # The same URL serves the full page to non-AJAX requests
+        patch_vary_headers(response, ["X-Requested-With"])
+        return response
 
     # --- HTTP methods ---
 
     def get(self, request):
-        page = self._page(request, request.GET.get("page", 1))
-        ctx = self._context(request, page)
-
         if is_ajax(request):
-            html = render_to_string(self.list_partial_template, ctx, request)
-            return JsonResponse(self._payload(page, html))
+            return self._ajax_list(request)
 
-        return render(request, self.template_name, ctx)
+        page = self._page(request, request.GET.get("page", 1))
+        return render(request, self.template_name, self._context(request, page))
 
     def post(self, request):
         form = FileUploadForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
-            form.save()
+            obj = form.save()
 
             if is_ajax(request):
-                # Rebuild the first page (newest first) after upload
+                # New files land at the top of page 1; send just that row
                 first_page = self._page(request, 1)
-                ctx = self._context(request, first_page)
-                html = render_to_string(self.list_partial_template, ctx, request)
-                return JsonResponse(self._payload(first_page, html), status=201)
+                return JsonResponse(
+                    {
+                        "success": True,
+                        "id": str(obj.pk),
+                        "row_html": self._row_html(request, obj),
+                        "pagination_html": self._pagination_html(request, first_page),
+                        **self._counts(first_page),
+                    },
+                    status=201,
+                )
 
             return redirect("core:dashboard")
 
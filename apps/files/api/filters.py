@@ -0,0 +1,31 @@
+from rest_framework.filters import BaseFilterBackend
+
+from ..search import search_files
+
+
+class FilenameSearchFilter(BaseFilterBackend):
+    """
+    Filter files by a case-insensitive substring of their filename.
+
+    Backed by a trigram index (Postgres) or FTS5 table (SQLite), so it stays
+    cheap for users with many files. Applied before ordering and pagination.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        return search_files(queryset, request.query_params.get(self.search_param, ""))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Only return files whose filename contains this text "
+                    "(case-insensitive)."
+                ),
+                "schema": {"type": "string"},
+            },
+        ]
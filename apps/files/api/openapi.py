@@ -17,6 +17,17 @@ file_id_param = OpenApiParameter(
     description="Unique identifier of the uploaded file.",
 )
 
+file_fields_param = OpenApiParameter(
+    name="fields",
+    location=OpenApiParameter.QUERY,
+    type=OpenApiTypes.STR,
+    required=False,
+    description=(
+        "Comma-separated subset of file fields to return "
+        "(`id`, `filename`, `size`, `file`, `uploaded_at`). Defaults to all."
+    ),
+)
+
 share_token_param = OpenApiParameter(
     name="token",
     location=OpenApiParameter.PATH,
@@ -1,11 +1,244 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from apps.core.utils.pagination import KnownCountPaginator
+
+
+@dataclass(frozen=True)
+class Cursor:
+    ordering: str
+    value: Any
+    pk: str
+    reverse: bool = False
+
+
+class FileCursorPagination(BasePagination):
+    """
+    Keyset paginator for file list responses.
+
+    Rows are ordered by the requested ordering field with `id` as a
+    tie-breaker, and cursors carry the (value, id) of the boundary row, so
+    each page is one indexed range query with no COUNT(*) or OFFSET.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering_fields = ("uploaded_at", "filename", "size")
+    default_ordering = "-uploaded_at"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.model = queryset.model
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.reverse)
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if cursor:
+            queryset = queryset.filter(self._after(cursor.value, cursor.pk, reverse))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset) -> str:
+        """
+        Return the first ordering term applied to the queryset, if supported.
+        """
+        order_by = queryset.query.order_by
+        if order_by and isinstance(order_by[0], str):
+            term = order_by[0]
+            if term.lstrip("-") in self.ordering_fields:
+                return term
+        return self.default_ordering
+
+    # Links
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, row, reverse):
+        field = self.ordering.lstrip("-")
+        cursor = Cursor(self.ordering, getattr(row, field), str(row.pk), reverse)
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(cursor)
+        )
+
+    # Cursor encoding
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        value = cursor.value
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = {"o": cursor.ordering, "v": value, "id": cursor.pk}
+        if cursor.reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request) -> Cursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            if payload["o"] != self.ordering:
+                raise ValueError("Cursor does not match the requested ordering.")
+            field = self.model._meta.get_field(self.ordering.lstrip("-"))
+            pk = self.model._meta.pk.to_python(payload["id"])
+            value = field.to_python(payload["v"])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+        return Cursor(self.ordering, value, pk, bool(payload.get("r")))
+
+    # Query helpers
+
+    def _descending(self, reverse: bool) -> bool:
+        return self.ordering.startswith("-") != reverse
+
+    def _order_by(self, reverse):
+        field = self.ordering.lstrip("-")
+        sign = "-" if self._descending(reverse) else ""
+        return [f"{sign}{field}", f"{sign}pk"]
+
+    def _after(self, value, pk, reverse) -> Q:
+        """
+        Filter for rows that come after (value, pk) in the scan direction.
+        """
+        field = self.ordering.lstrip("-")
+        op = "lt" if self._descending(reverse) else "gt"
+        return Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
 
 
 class FilePagination(PageNumberPagination):
     """
     Paginator for file list responses.
+
+    Uses page numbers by default. Clients opt in to keyset pagination with
+    `?pagination=cursor` (or by following a `cursor` link), which skips
+    the COUNT(*) and OFFSET of page-number mode.
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+    cursor_class = FileCursorPagination
+    mode_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        # Views that already know the total (e.g. from a cache) skip COUNT(*)
+        get_count = getattr(view, "get_cached_count", None)
+        count = get_count() if get_count else None
+        if count is not None:
+            self.django_paginator_class = partial(KnownCountPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_cursor(self, request) -> bool:
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == "cursor"
+            or self.cursor_class.cursor_query_param in params
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        # `count` is only present in page-number mode
+        resp = super().get_paginated_response_schema(schema)
+        resp["required"] = ["results"]
+        return resp
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Set to `cursor` for keyset pagination (no `count`; "
+                    "follow `next`/`previous` links)."
+                ),
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            {
+                "name": self.cursor_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from a `next` or `previous` link.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -1,14 +1,20 @@
+import operator
 import os
 import re
 
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import FileSystemStorage
 from django.urls import reverse
+from django.utils.encoding import filepath_to_uri
+from django.utils.functional import cached_property
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from ..models import SharedLink, UploadedFile
 from ..quota import enforce_user_quota
+from ..storage.backends import unwrap_storage
 from ..ttl import compute_expires_at
 from ..upload_policy import validate_uploaded_file
 
@@ -109,10 +115,8 @@ class UploadedFileCreateSerializer(BaseUploadedFileSerializer):
         validated_data["size"] = file.size
         validated_data["user"] = user
 
-        # Set optional expiration (TTL)
-        expires_at = compute_expires_at()
-        if expires_at:
-            validated_data["expires_at"] = expires_at
+        # Set expiration (TTL), or the "never expires" sentinel
+        validated_data["expires_at"] = compute_expires_at()
 
         return super().create(validated_data)
 
@@ -143,6 +147,72 @@ class UploadedFileReadUpdateSerializer(BaseUploadedFileSerializer):
         return super().update(instance, validated_data)
 
 
+class UploadedFileRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path for listing and retrieving uploads.
+
+    - Produces the same output as `UploadedFileReadUpdateSerializer`.
+    - Resolves one getter per field once per response instead of binding
+      DRF fields per row.
+    - Emits only the fields named in `context["fields"]` (default: all).
+    """
+
+    FIELDS = tuple(BaseUploadedFileSerializer.Meta.fields)
+
+    def to_representation(self, instance):
+        return {name: getter(instance) for name, getter in self._getters}
+
+    @cached_property
+    def _getters(self) -> list:
+        getters = {
+            "id": lambda obj: str(obj.pk),
+            "filename": operator.attrgetter("filename"),
+            "size": operator.attrgetter("size"),
+            "file": self._file_url,
+            "uploaded_at": self._datetime_getter(),
+        }
+        fields = self.context.get("fields") or self.FIELDS
+        return [(name, getters[name]) for name in self.FIELDS if name in fields]
+
+    def _datetime_getter(self):
+        field = serializers.DateTimeField()
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        tz = field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+            return lambda obj: field.to_representation(obj.uploaded_at)
+
+        # Same result as DateTimeField.to_representation for aware datetimes
+        def iso_8601(obj):
+            value = obj.uploaded_at.astimezone(tz).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return iso_8601
+
+    @cached_property
+    def _media_prefix(self) -> str | None:
+        """
+        Absolute URL prefix for files on local storage (None for others).
+
+        Local URLs are just the quoted name under MEDIA_URL, so the join and
+        absolute-URI work is done once; remote storages may sign each URL.
+        """
+        storage = unwrap_storage(UploadedFile._meta.get_field("file").storage)
+        if not isinstance(storage, FileSystemStorage):
+            return None
+        request = self.context.get("request")
+        base = storage.base_url
+        return request.build_absolute_uri(base) if request else base
+
+    def _file_url(self, obj):
+        file = obj.file
+        if not file:
+            return None
+        if self._media_prefix is not None:
+            return self._media_prefix + filepath_to_uri(file.name).lstrip("/")
+        request = self.context.get("request")
+        return request.build_absolute_uri(file.url) if request else file.url
+
+
 class ShareTTLSerializer(serializers.Serializer):
     """
     Input serializer for share link expiration.
@@ -0,0 +1,157 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+
+from apps.files.tests.factories import SharedLinkFactory, UploadedFileFactory
+from tests.query_budget import check_query_budget
+
+from .url_helpers import (
+    files_detail_url,
+    files_list_url,
+    files_share_regenerate_url,
+    files_share_url,
+    share_download_url,
+    share_meta_url,
+)
+
+# Helpers
+
+
+def _ok(resp, code=status.HTTP_200_OK):
+    assert resp.status_code == code, getattr(resp, "data", resp)
+    return resp
+
+
+def _seed_files(user):
+    return lambda n: UploadedFileFactory.create_batch(n, user=user)
+
+
+def _seed_links(user):
+    def seed(n):
+        for f in UploadedFileFactory.create_batch(n, user=user):
+            SharedLinkFactory(file=f)
+
+    return seed
+
+
+# Tests
+
+# Budgets include one upsert per applicable throttle: user (and anon, for
+# anonymous requests) plus the endpoint's scope, if it has one
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"ordering": "filename", "search": "test"},
+        {"pagination": "cursor", "fields": "id,filename"},
+    ],
+)
+def test_file_list_budget(authed_client, user, params):
+    # throttle + stats + count + page; cursor mode skips the count
+    check_query_budget(
+        lambda: _ok(authed_client.get(files_list_url(page_size=100, **params))),
+        budget=4,
+        seed=_seed_links(user),
+    )
+
+
+@pytest.mark.django_db
+def test_file_retrieve_budget(authed_client, user):
+    f = UploadedFileFactory(user=user)
+    check_query_budget(
+        lambda: _ok(authed_client.get(files_detail_url(f.id))),
+        budget=2,
+        seed=_seed_links(user),
+    )
+
+
+@pytest.mark.django_db
+def test_file_upload_budget(authed_client, user):
+    def upload(name):
+        upload = SimpleUploadedFile(name, b"hello", content_type="text/plain")
+        resp = authed_client.post(files_list_url(), {"file": upload})
+        return _ok(resp, status.HTTP_201_CREATED)
+
+    names = iter(f"upload-{i}.txt" for i in range(10))
+    # 2 throttles + quota sum + duplicate-name check + insert
+    check_query_budget(
+        upload, budget=5, seed=_seed_files(user), prepare=lambda: next(names)
+    )
+
+
+@pytest.mark.django_db
+def test_file_rename_budget(authed_client, user):
+    def rename(f):
+        resp = authed_client.patch(
+            files_detail_url(f.id), {"filename": f"renamed-{f.pk}"}, format="json"
+        )
+        return _ok(resp)
+
+    # throttle + select + duplicate-name check + update
+    check_query_budget(
+        rename,
+        budget=4,
+        seed=_seed_files(user),
+        prepare=lambda: UploadedFileFactory(user=user),
+    )
+
+
+@pytest.mark.django_db
+def test_file_delete_budget(authed_client, user):
+    def delete(f):
+        resp = authed_client.delete(files_detail_url(f.id))
+        return _ok(resp, status.HTTP_204_NO_CONTENT)
+
+    # throttle + select + cascade to links + delete
+    check_query_budget(
+        delete,
+        budget=4,
+        seed=_seed_links(user),
+        prepare=lambda: SharedLinkFactory(file__user=user).file,
+    )
+
+
+@pytest.mark.django_db
+def test_file_share_budgets(authed_client, user):
+    f = UploadedFileFactory(user=user)
+    seed = _seed_links(user)
+
+    check_query_budget(
+        lambda: _ok(authed_client.post(files_share_url(f.id)), status.HTTP_201_CREATED),
+        budget=5,
+    )
+    check_query_budget(
+        lambda: _ok(authed_client.post(files_share_url(f.id))), budget=4, seed=seed
+    )
+    check_query_budget(
+        lambda: _ok(
+            authed_client.post(files_share_regenerate_url(f.id)),
+            status.HTTP_201_CREATED,
+        ),
+        budget=5,
+        seed=seed,
+    )
+    check_query_budget(
+        lambda: _ok(authed_client.delete(files_share_url(f.id))), budget=3, seed=seed
+    )
+
+
+@pytest.mark.django_db
+def test_share_endpoint_budgets(api_client, authed_client, user):
+    link = SharedLinkFactory(file__user=user)
+
+    check_query_budget(
+        lambda: _ok(api_client.get(share_meta_url(link.token))), budget=4
+    )
+    check_query_budget(
+        lambda: _ok(
+            api_client.get(share_download_url(link.token)), status.HTTP_302_FOUND
+        ),
+        budget=4,
+    )
+    check_query_budget(
+        lambda: _ok(authed_client.delete(share_meta_url(link.token))), budget=4
+    )
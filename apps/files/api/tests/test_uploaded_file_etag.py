@@ -0,0 +1,136 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import time_machine
+from django.utils import timezone
+from rest_framework import status
+
+from apps.files.tests.factories import UploadedFileFactory
+
+from .url_helpers import files_detail_url, files_list_url
+
+# Helpers
+
+
+def _etag(client, **params):
+    # The first listing caches the stats that vouch for the ETag
+    client.get(files_list_url(**params))
+    return client.get(files_list_url(**params))["ETag"]
+
+
+@pytest.fixture
+def signing_storage(settings):
+    """
+    Switch media storage to S3 with presigned URLs (after saving files).
+    """
+
+    # Keep the stats that vouch for ETags cached across the time travel
+    settings.LISTING_CACHE_SECONDS = 60 * 60
+
+    def use():
+        # Presigning happens offline, so no bucket is needed
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "default": {
+                "BACKEND": "apps.files.storage.s3.TunedS3Storage",
+                "OPTIONS": {
+                    "bucket_name": "bucket",
+                    "access_key": "key",
+                    "secret_key": "secret",
+                    "querystring_expire": 300,
+                },
+            },
+        }
+
+    return use
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_list_returns_304_without_list_queries_when_unchanged(
+    authed_client, user, django_assert_num_queries
+):
+    UploadedFileFactory.create_batch(3, user=user)
+
+    assert not authed_client.get(files_list_url()).has_header("ETag")
+    first = authed_client.get(files_list_url())
+    etag = first["ETag"]
+    assert etag.startswith('W/"')
+    assert "no-cache" in first["Cache-Control"]
+
+    with django_assert_num_queries(1) as ctx:
+        resp = authed_client.get(files_list_url(), HTTP_IF_NONE_MATCH=etag)
+    assert "core_throttlebucket" in ctx.captured_queries[0]["sql"]  # rate limit
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_list_etag_depends_on_query_params(authed_client, user):
+    UploadedFileFactory(user=user)
+
+    etag = _etag(authed_client)
+    resp = authed_client.get(files_list_url(ordering="size"), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_after_rename(authed_client, user):
+    f = UploadedFileFactory(user=user)
+    etag = _etag(authed_client)
+
+    authed_client.patch(files_detail_url(f.id), {"filename": "renamed"}, format="json")
+
+    resp = authed_client.get(files_list_url(), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.get("ETag") != etag
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_when_a_file_expires(authed_client, user):
+    UploadedFileFactory(user=user, expires_at=timezone.now() + timedelta(minutes=5))
+    etag = _etag(authed_client)
+
+    with time_machine.travel(timezone.now() + timedelta(minutes=10)):
+        resp = authed_client.get(files_list_url(), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_list_etag_rolls_over_before_presigned_urls_expire(
+    authed_client, user, signing_storage
+):
+    UploadedFileFactory(user=user)
+    signing_storage()
+    start = datetime(2026, 1, 1, tzinfo=UTC)  # a signing window boundary
+
+    with time_machine.travel(start, tick=False):
+        etag = _etag(authed_client)
+        resp = authed_client.get(files_list_url(), HTTP_IF_NONE_MATCH=etag)
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+
+    with time_machine.travel(start + timedelta(seconds=150), tick=False):
+        resp = authed_client.get(files_list_url(), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_200_OK
+    assert "Signature=" in resp.data["results"][0]["file"]
+
+
+@pytest.mark.django_db
+def test_list_etag_without_file_urls_ignores_signing(
+    authed_client, user, signing_storage
+):
+    UploadedFileFactory(user=user)
+    signing_storage()
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+
+    with time_machine.travel(start, tick=False):
+        etag = _etag(authed_client, fields="id,filename")
+
+    with time_machine.travel(start + timedelta(seconds=150), tick=False):
+        resp = authed_client.get(
+            files_list_url(fields="id,filename"), HTTP_IF_NONE_MATCH=etag
+        )
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
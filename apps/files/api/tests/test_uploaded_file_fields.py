@@ -0,0 +1,69 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from apps.files.api.serializers import (
+    UploadedFileReadUpdateSerializer,
+    UploadedFileRowSerializer,
+)
+from apps.files.tests.factories import UploadedFileFactory
+
+from .url_helpers import files_detail_url, files_list_url
+
+
+@pytest.mark.django_db
+def test_row_serializer_matches_model_serializer():
+    files = UploadedFileFactory.create_batch(3)
+    files[0].file.name = "uploads/with space/ünïcode #1.txt"
+    request = APIRequestFactory().get("/")
+    context = {"request": request}
+
+    lean = UploadedFileRowSerializer(files, many=True, context=context).data
+    full = UploadedFileReadUpdateSerializer(files, many=True, context=context).data
+    assert lean == full
+
+
+@pytest.mark.django_db
+def test_list_returns_only_requested_fields(
+    authed_client, user, django_assert_num_queries
+):
+    UploadedFileFactory.create_batch(2, user=user)
+
+    with django_assert_num_queries(3) as ctx:  # throttle + stats (count) + page
+        resp = authed_client.get(files_list_url(fields="id,filename"))
+    assert resp.status_code == status.HTTP_200_OK
+    assert all(set(obj) == {"id", "filename"} for obj in resp.data["results"])
+
+    # Only the requested (and ordering) columns are loaded
+    page_sql = ctx.captured_queries[-1]["sql"]
+    assert '"size"' not in page_sql
+    assert '"file"' not in page_sql
+
+
+@pytest.mark.django_db
+def test_list_fields_combine_with_ordering_and_cursor(authed_client, user):
+    UploadedFileFactory.create_batch(3, user=user)
+
+    url = files_list_url(
+        fields="filename", ordering="size", pagination="cursor", page_size=2
+    )
+    resp = authed_client.get(url)
+    assert resp.status_code == status.HTTP_200_OK
+    assert [set(obj) for obj in resp.data["results"]] == [{"filename"}] * 2
+    assert resp.data["next"]
+
+
+@pytest.mark.django_db
+def test_retrieve_returns_only_requested_fields(authed_client, user):
+    f = UploadedFileFactory(user=user)
+
+    resp = authed_client.get(f"{files_detail_url(f.id)}?fields=size")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data == {"size": f.size}
+
+
+@pytest.mark.django_db
+def test_unknown_fields_are_rejected(authed_client):
+    resp = authed_client.get(files_list_url(fields="id,owner"))
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert "owner" in str(resp.data["fields"])
@@ -0,0 +1,109 @@
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from apps.files.models import UploadedFile
+from apps.files.tests.factories import UploadedFileFactory
+
+from .url_helpers import files_list_url
+
+# Helpers
+
+
+def _walk(client, url, direction="next"):
+    """
+    Follow `next` (or `previous`) links and return (ids, pages).
+    """
+    ids, pages = [], 0
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == status.HTTP_200_OK, resp.content
+        page = [obj["id"] for obj in resp.data["results"]]
+        ids = ids + page if direction == "next" else page + ids
+        pages += 1
+        url = resp.data[direction]
+    return ids, pages
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_page_number_mode_is_default(authed_client, user):
+    UploadedFileFactory.create_batch(3, user=user)
+
+    resp = authed_client.get(files_list_url())
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["count"] == 3
+
+
+@pytest.mark.django_db
+def test_cursor_mode_walks_all_files_in_order(authed_client, user):
+    UploadedFileFactory.create_batch(7, user=user)
+    UploadedFileFactory.create_batch(2)  # other owners
+
+    expected = [
+        str(pk)
+        for pk in UploadedFile.objects.filter(user=user)
+        .order_by("-uploaded_at", "-id")
+        .values_list("id", flat=True)
+    ]
+
+    first = files_list_url(pagination="cursor", page_size=3)
+    resp = authed_client.get(first)
+    assert "count" not in resp.data
+    assert resp.data["previous"] is None
+
+    ids, pages = _walk(authed_client, first)
+    assert ids == expected
+    assert pages == 3
+
+
+@pytest.mark.django_db
+def test_cursor_mode_breaks_ties_on_id(authed_client, user):
+    UploadedFileFactory.create_batch(5, user=user)
+    UploadedFile.objects.filter(user=user).update(uploaded_at=timezone.now())
+
+    ids, _ = _walk(authed_client, files_list_url(pagination="cursor", page_size=2))
+    assert len(ids) == 5
+    assert len(set(ids)) == 5
+
+
+@pytest.mark.django_db
+def test_cursor_mode_previous_links_walk_back(authed_client, user):
+    UploadedFileFactory.create_batch(5, user=user)
+
+    url = files_list_url(pagination="cursor", page_size=2, ordering="size")
+    forward, _ = _walk(authed_client, url)
+
+    # Jump to the last page, then walk back
+    last_url = url
+    while True:
+        resp = authed_client.get(last_url)
+        if not resp.data["next"]:
+            break
+        last_url = resp.data["next"]
+    backward, _ = _walk(authed_client, last_url, direction="previous")
+
+    assert backward == forward
+
+
+@pytest.mark.django_db
+def test_cursor_mode_respects_ordering(authed_client, user):
+    for name in ["b.txt", "c.txt", "a.txt"]:
+        UploadedFileFactory(user=user, filename=name)
+
+    url = files_list_url(pagination="cursor", page_size=2, ordering="filename")
+    ids, _ = _walk(authed_client, url)
+    names = list(
+        UploadedFile.objects.filter(user=user)
+        .order_by("filename")
+        .values_list("id", flat=True)
+    )
+    assert ids == [str(pk) for pk in names]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(authed_client):
+    resp = authed_client.get(files_list_url(cursor="not-a-cursor"))
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
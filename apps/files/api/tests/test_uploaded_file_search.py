@@ -0,0 +1,35 @@
+import pytest
+from rest_framework import status
+
+from apps.files.tests.factories import UploadedFileFactory
+
+from .url_helpers import files_list_url
+
+
+@pytest.mark.django_db
+def test_list_search_filters_by_filename(authed_client, user):
+    for name in ["invoice-01.pdf", "invoice-02.pdf", "notes.txt"]:
+        UploadedFileFactory(user=user, filename=name)
+
+    resp = authed_client.get(files_list_url(search="invoice", ordering="filename"))
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["count"] == 2
+    names = [obj["filename"] for obj in resp.data["results"]]
+    assert names == ["invoice-01.pdf", "invoice-02.pdf"]
+
+
+@pytest.mark.django_db
+def test_list_search_combines_with_cursor_pagination(authed_client, user):
+    for i in range(5):
+        UploadedFileFactory(user=user, filename=f"scan-{i}.png")
+    UploadedFileFactory(user=user, filename="other.png")
+
+    url = files_list_url(
+        search="scan", pagination="cursor", page_size=2, ordering="filename"
+    )
+    names = []
+    while url:
+        resp = authed_client.get(url)
+        names += [obj["filename"] for obj in resp.data["results"]]
+        url = resp.data["next"]
+    assert names == [f"scan-{i}.png" for i in range(5)]
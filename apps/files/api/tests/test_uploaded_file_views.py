@@ -107,13 +107,16 @@ def test_rename_filename_rejects_blank(authed_client, user):
 
 
 @pytest.mark.django_db
-def test_delete_file_removes_from_storage(authed_client, user):
+def test_delete_file_removes_from_storage(
+    authed_client, user, django_capture_on_commit_callbacks
+):
     f = UploadedFileFactory(user=user)
     name = f.file.name
     storage = f.file.storage or default_storage
 
     assert storage.exists(name)  # precondition
 
-    resp = authed_client.delete(files_detail_url(f.id))
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = authed_client.delete(files_detail_url(f.id))
     assert resp.status_code in (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK)
     assert not storage.exists(name)  # file should be gone from storage
@@ -11,10 +11,10 @@ from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
-from storages.backends.s3boto3 import S3Boto3Storage
 
 from ...mixins import SharedLinkPresignMixin
 from ...models import SharedLink
+from ...storage.backends import is_s3_storage
 from ..openapi import detail_message_resp, share_token_param
 from ..serializers import SharedLinkMetaSerializer
 
@@ -121,7 +121,7 @@ class SharedLinkViewSet(SharedLinkPresignMixin, GenericViewSet):
         """
         link = self.get_object()
 
-        if link.file.user != request.user:
+        if link.file.user_id != request.user.pk:
             return Response(
                 {"detail": "Not allowed."}, status=status.HTTP_403_FORBIDDEN
             )
@@ -144,7 +144,7 @@ class SharedLinkViewSet(SharedLinkPresignMixin, GenericViewSet):
 
         # S3-specific kwargs for presigning
         url_kwargs = {}
-        if isinstance(default_storage, S3Boto3Storage):
+        if is_s3_storage(default_storage):
             url_kwargs = {
                 "expire": self.expires_in_seconds(link),
                 "parameters": self.response_headers(uploaded.filename),
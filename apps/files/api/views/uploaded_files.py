@@ -1,6 +1,10 @@
+import time
 from datetime import timedelta
 
+from django.core.files.storage import default_storage
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import cached_property
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -8,18 +12,22 @@ from drf_spectacular.utils import (
 )
 from rest_framework import filters, permissions, serializers, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import UnsupportedMediaType
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from ...cache import get_active_file_stats, invalidate_collection, listing_etag
 from ...models import SharedLink, UploadedFile
-from ..openapi import file_id_param
+from ...storage.backends import signed_url_lifetime
+from ..filters import FilenameSearchFilter
+from ..openapi import file_fields_param, file_id_param
 from ..pagination import FilePagination
 from ..serializers import (
     SharedLinkSerializer,
     ShareTTLSerializer,
     UploadedFileCreateSerializer,
     UploadedFileReadUpdateSerializer,
+    UploadedFileRowSerializer,
 )
 
 
@@ -30,15 +38,25 @@ from ..serializers import (
     list=extend_schema(
         summary="List uploaded files",
         description=(
-            "Returns a paginated list of files owned by the authenticated user."
+            "Returns a paginated list of files owned by the authenticated user.\n\n"
+            "Uses page numbers by default. Pass `pagination=cursor` for keyset "
+            "pagination, which omits `count` and is cheaper for deep pages.\n\n"
+            "Pass `search` to filter by filename substring; it combines with "
+            "`ordering` and both pagination modes. Pass `fields` to return only "
+            "some fields.\n\n"
+            "Responses carry a weak `ETag`; send it back in `If-None-Match` to "
+            "get `304 Not Modified` while nothing in the listing has changed."
         ),
+        parameters=[file_fields_param],
+        responses=UploadedFileReadUpdateSerializer(many=True),
     ),
     retrieve=extend_schema(
         summary="Retrieve a file",
         description=(
             "Returns metadata for a single file owned by the authenticated user."
         ),
-        parameters=[file_id_param],
+        parameters=[file_id_param, file_fields_param],
+        responses=UploadedFileReadUpdateSerializer,
     ),
     create=extend_schema(
         summary="Upload a new file",
@@ -71,11 +89,15 @@ class UploadedFileViewSet(ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     # Filters
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [FilenameSearchFilter, filters.OrderingFilter]
     ordering = ["-uploaded_at", "-id"]  # default ordering
     ordering_fields = ["uploaded_at", "filename", "size"]
     pagination_class = FilePagination
 
+    # Sparse fieldsets (`?fields=`) on read actions
+    read_actions = {"list", "retrieve"}
+    fields_query_param = "fields"
+
     def get_queryset(self):
         # Restrict files to those owned by the current user
         return UploadedFile.objects.filter(user=self.request.user).active()
@@ -95,14 +117,95 @@ class UploadedFileViewSet(ModelViewSet):
             return UploadedFileCreateSerializer
         if self.action in {"share", "share_regenerate"}:
             return SharedLinkSerializer
+        if self.action in self.read_actions:
+            return UploadedFileRowSerializer
         return UploadedFileReadUpdateSerializer
 
+    # Sparse fieldsets
+
+    @cached_property
+    def requested_fields(self) -> tuple[str, ...] | None:
+        """
+        Fields named in `?fields=`, validated against the serializer's fields.
+        """
+        raw = self.request.query_params.get(self.fields_query_param)
+        if raw is None:
+            return None
+
+        fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+        allowed = UploadedFileRowSerializer.FIELDS
+        unknown = [f for f in fields if f not in allowed]
+        if unknown or not fields:
+            raise ValidationError(
+                {
+                    self.fields_query_param: [
+                        f"Unknown field(s): {', '.join(unknown) or '(none)'}. "
+                        f"Choose from: {', '.join(allowed)}."
+                    ]
+                }
+            )
+        return fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.read_actions and self.requested_fields:
+            # Load only the requested columns, plus those the ordering needs
+            ordering = [
+                term.lstrip("-")
+                for term in queryset.query.order_by
+                if isinstance(term, str)
+            ]
+            queryset = queryset.only(*self.requested_fields, *ordering)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in self.read_actions:
+            context["fields"] = self.requested_fields
+        return context
+
+    def get_cached_count(self) -> int | None:
+        """
+        Total for unsearched listings, from the per-user stats cache.
+
+        The stats query stands in for the paginator's COUNT(*), and keeps
+        the stats cached for `listing_etag`.
+        """
+        if self.request.query_params.get(FilenameSearchFilter.search_param):
+            return None
+        return get_active_file_stats(self.request.user.pk).count
+
     def _get_share_ttl(self):
         # Validate and return the requested share TTL (seconds)
         ttl = ShareTTLSerializer(data=self.request.data)
         ttl.is_valid(raise_exception=True)
         return ttl.validated_data["expires_in"]
 
+    def list(self, request, *args, **kwargs):
+        """
+        Override default `list` to answer unchanged listings with 304.
+        """
+        parts = [
+            request.get_host(),
+            sorted(request.query_params.lists()),
+            request.accepted_media_type,
+        ]
+        lifetime = signed_url_lifetime(default_storage)
+        if lifetime and "file" in (self.requested_fields or ("file",)):
+            # Presigned download links expire; a new ETag every half lifetime
+            # keeps a 304 from vouching for links that no longer work
+            parts.append(int(time.time() // max(lifetime // 2, 1)))
+
+        etag = listing_etag(request.user.pk, *parts)
+        response = get_conditional_response(request, etag=etag) if etag else None
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        if etag:
+            response["ETag"] = etag
+        # Clients may store the listing but must revalidate before reuse
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     def create(self, request, *args, **kwargs):
         """
         Override default `create` to restrict file uploads to multipart/form-data.
@@ -174,6 +277,8 @@ class UploadedFileViewSet(ModelViewSet):
         revoked = (
             SharedLink.objects.active(now).filter(file=file).update(expires_at=now)
         )
+        if revoked:
+            invalidate_collection(file.user_id)
 
         detail = "Link revoked." if revoked else "No active link to revoke."
         return Response(
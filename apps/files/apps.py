@@ -1,4 +1,9 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_migrate
+
+from .search import INSTALLED_BY, install_search_index
 
 
 class FilesConfig(AppConfig):
@@ -8,3 +13,14 @@ class FilesConfig(AppConfig):
 
     def ready(self):
         from . import signals  # noqa: F401
+
+        post_migrate.connect(ensure_search_index, sender=self)
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Restore the filename search index if a migration rebuilt the table.
+    """
+    connection = connections[using]
+    if INSTALLED_BY in MigrationRecorder(connection).applied_migrations():
+        install_search_index(connection)
@@ -0,0 +1,140 @@
+"""
+Versioned per-user cache entries for file listings.
+
+Each user has a collection version that is bumped whenever one of their
+files changes. Cached values embed the version in their key, so a bump
+invalidates all of them without tracking which keys exist.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import UploadedFile
+
+# Upper bounds on how long derived entries live, independent of versioning;
+# LISTING_CACHE_SECONDS lowers both
+STATS_TIMEOUT = 60 * 60
+FRAGMENT_TIMEOUT = 10 * 60
+
+
+@dataclass(frozen=True)
+class FileStats:
+    count: int
+    next_expiry: datetime | None
+
+
+def entry_timeout(limit: int) -> int:
+    """
+    Return how long to keep a derived entry: `limit`, capped by
+    LISTING_CACHE_SECONDS.
+    """
+    return min(limit, settings.LISTING_CACHE_SECONDS)
+
+
+def _version_key(user_id) -> str:
+    return f"files:version:{user_id}"
+
+
+def get_collection_version(user_id) -> int:
+    """
+    Return the current collection version for a user's files.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted key never reuses an old version
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def versioned_key(user_id, *parts) -> str:
+    """
+    Build a cache key scoped to the user's current collection version.
+    """
+    version = get_collection_version(user_id)
+    return ":".join(["files", str(user_id), str(version), *map(str, parts)])
+
+
+def bump_collection_version(user_id) -> None:
+    """
+    Invalidate every cached listing entry for a user.
+    """
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_collection(user_id) -> None:
+    """
+    Bump the user's collection version after a change to their files.
+
+    Bumps immediately so the current request sees its own write, and again
+    on commit so no concurrent reader keeps pre-commit data cached under
+    the new version.
+    """
+    bump_collection_version(user_id)
+    transaction.on_commit(lambda: bump_collection_version(user_id))
+
+
+def get_active_file_stats(user_id, now=None) -> FileStats:
+    """
+    Return the user's active file count, served from cache when possible.
+
+    The cached entry remembers the earliest upcoming expiry; once that
+    moment passes, the collection version is bumped and the stats are
+    recomputed, so expiries invalidate the cache like writes do.
+    """
+    now = now or timezone.now()
+    key = versioned_key(user_id, "stats")
+
+    stats = cache.get(key)
+    if stats is not None:
+        if stats.next_expiry is None or stats.next_expiry > now:
+            return stats
+        bump_collection_version(user_id)
+        key = versioned_key(user_id, "stats")
+
+    agg = (
+        UploadedFile.objects.filter(user_id=user_id)
+        .active(now)
+        .aggregate(count=Count("pk"), next_expiry=Min("expires_at"))
+    )
+    stats = FileStats(count=agg["count"], next_expiry=agg["next_expiry"])
+    cache.set(key, stats, entry_timeout(STATS_TIMEOUT))
+    return stats
+
+
+def listing_etag(user_id, *parts) -> str | None:
+    """
+    Return a weak ETag for a rendering of the user's file listing.
+
+    Combines the collection version (after applying any expiry that has
+    passed) with whatever else shapes the response, such as query params.
+    Computing it costs cache reads only, so unchanged listings can be
+    answered with 304 before any list query runs.
+
+    Returns None while the user's stats aren't cached: without their next
+    expiry, a file that expired since the listing was rendered would go
+    unnoticed. Listings that read the stats cache it again.
+    """
+    now = timezone.now()
+    stats = cache.get(versioned_key(user_id, "stats"))
+    if stats is None:
+        return None
+    if stats.next_expiry is not None and stats.next_expiry <= now:
+        bump_collection_version(user_id)
+        return None
+    version = get_collection_version(user_id)
+    digest = hashlib.sha1(repr((user_id, version, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
@@ -0,0 +1,158 @@
+"""
+Per-user change events for live dashboards, streamed as server-sent events.
+
+Each stream keeps a snapshot of the user's newest active files and re-reads
+it only when something may have changed: when the user's
+cached collection version moves (every write bumps it), when the earliest
+known expiry passes, or after a periodic resync for writes made by processes
+that do not share the cache. Consecutive snapshots are diffed into events.
+
+Snapshots hold at most MAX_TRACKED files, so a stream's memory and queries
+don't grow with the account. Changes to older rows can't be told apart,
+and are reported as a single `files.changed` event. Share links aren't
+shown in the file list, so they aren't tracked.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from .cache import get_collection_version
+from .models import UploadedFile
+
+# Comment lines keep idle connections open through proxies
+HEARTBEAT_SECONDS = 15
+# Re-read snapshots at least this often, even without a version bump
+RESYNC_SECONDS = 30
+# How long EventSource waits before reconnecting after a stream ends
+RETRY_MS = 3000
+# Newest files a snapshot tracks individually
+MAX_TRACKED = 500
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    data: dict
+
+    def encode(self) -> str:
+        return f"event: {self.name}\ndata: {json.dumps(self.data)}\n\n"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    # file id -> (uploaded_at, expires_at)
+    files: dict = field(default_factory=dict)
+    # Sort key of the oldest tracked file, (uploaded_at, id), when older
+    # files were left out
+    file_floor: tuple | None = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.file_floor is not None
+
+    @property
+    def next_expiry(self) -> datetime | None:
+        return min((exp for _, exp in self.files.values()), default=None)
+
+
+async def load_snapshot(user_id, now: datetime) -> Snapshot:
+    """
+    Read the user's newest active files (one indexed query of at most
+    MAX_TRACKED + 1 rows).
+    """
+    files = (
+        UploadedFile.objects.filter(user_id=user_id)
+        .active(now)
+        .order_by("-uploaded_at", "-id")
+        .values_list("pk", "uploaded_at", "expires_at")
+    )
+    file_rows = [row async for row in files[: MAX_TRACKED + 1]]
+
+    file_floor = None
+    if len(file_rows) > MAX_TRACKED:
+        del file_rows[MAX_TRACKED:]
+        pk, uploaded, _ = file_rows[-1]
+        file_floor = (uploaded, pk)
+
+    return Snapshot(
+        files={pk: (uploaded, exp) for pk, uploaded, exp in file_rows},
+        file_floor=file_floor,
+    )
+
+
+def _tracked(key, floor) -> bool:
+    return floor is None or key >= floor
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot, now: datetime) -> list[Event]:
+    """
+    Describe how `new` differs from `old` as a list of events.
+
+    Files that left the active set past their recorded expiry are reported
+    as expired, and files that left earlier as deleted. Files that only
+    moved across the edge of a truncated snapshot are skipped.
+    """
+    events = []
+    for pk in new.files.keys() - old.files.keys():
+        if _tracked((new.files[pk][0], pk), old.file_floor):
+            events.append(Event("file.created", {"id": str(pk)}))
+    for pk in old.files.keys() - new.files.keys():
+        uploaded, exp = old.files[pk]
+        if _tracked((uploaded, pk), new.file_floor):
+            name = "file.expired" if exp <= now else "file.deleted"
+            events.append(Event(name, {"id": str(pk)}))
+    return events
+
+
+async def stream_events(user_id) -> AsyncIterator[str]:
+    """
+    Yield SSE-encoded events for a user until the maximum stream age.
+
+    Clients reconnect automatically when the stream ends, which bounds how
+    long any one connection (and its worker slot) is held.
+    """
+    poll = settings.LIVE_EVENTS_POLL_SECONDS
+    started = last_sync = last_write = time.monotonic()
+    deadline = started + settings.LIVE_EVENTS_MAX_STREAM_SECONDS
+
+    snapshot = await load_snapshot(user_id, timezone.now())
+    version = await sync_to_async(get_collection_version)(user_id)
+    yield f"retry: {RETRY_MS}\n\n"
+
+    while time.monotonic() < deadline:
+        await asyncio.sleep(poll)
+        now, tick = timezone.now(), time.monotonic()
+
+        current = await sync_to_async(get_collection_version)(user_id)
+        expiry = snapshot.next_expiry
+        if (
+            current != version
+            or (expiry is not None and expiry <= now)
+            or tick - last_sync >= RESYNC_SECONDS
+        ):
+            fresh = await load_snapshot(user_id, now)
+            events = diff_snapshots(snapshot, fresh, now)
+            if (
+                not events
+                and current != version
+                and (snapshot.truncated or fresh.truncated)
+            ):
+                # Something changed, maybe beyond the tracked rows
+                events = [Event("files.changed", {})]
+            snapshot, version, last_sync = fresh, current, tick
+            if events:
+                yield "".join(event.encode() for event in events)
+                last_write = tick
+                continue
+
+        if tick - last_write >= HEARTBEAT_SECONDS:
+            yield ": heartbeat\n\n"
+            last_write = tick
@@ -1,14 +1,65 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from ...models import SharedLink
 
 
 class Command(BaseCommand):
-    help = "Delete all expired shared links."
+    help = "Delete expired shared links in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of links deleted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--retention-seconds",
+            type=int,
+            default=None,
+            help=(
+                "Keep links this long after expiry so they still return 410 "
+                "(default: SHARED_LINK_RETENTION_SECONDS)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        retention = options["retention_seconds"]
+        if retention is None:
+            retention = getattr(settings, "SHARED_LINK_RETENTION_SECONDS", 0)
+        cutoff = timezone.now() - timedelta(seconds=retention)
+        batch_size = options["batch_size"]
+
+        deleted = 0
+        last = None  # (expires_at, pk) of the last row seen
+        while True:
+            qs = SharedLink.objects.filter(expires_at__lte=cutoff)
+            if last:
+                qs = qs.filter(
+                    Q(expires_at__gt=last[0]) | Q(expires_at=last[0], pk__gt=last[1])
+                )
+            batch = list(
+                qs.order_by("expires_at", "pk").values_list("expires_at", "pk")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                break
+
+            # One short transaction per batch keeps row locks brief
+            with transaction.atomic():
+                count, _ = SharedLink.objects.filter(
+                    pk__in=[pk for _, pk in batch]
+                ).delete()
+            deleted += count
+            last = batch[-1]
 
-    def handle(self, *args, **kwargs):
-        deleted, _ = SharedLink.objects.filter(expires_at__lte=timezone.now()).delete()
         self.stdout.write(
             self.style.SUCCESS(f"Deleted {deleted} expired shared links.")
         )
@@ -1,6 +1,7 @@
 import logging
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
 from ...models import UploadedFile
@@ -11,19 +12,37 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = "Delete expired uploads and their storage objects"
 
-    def handle(self, *args, **options):
-        qs = UploadedFile.objects.filter(
-            expires_at__isnull=False,
-            expires_at__lte=timezone.now(),
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of uploads deleted per transaction (default: 500).",
         )
 
+    def handle(self, *args, **options):
+        qs = UploadedFile.objects.expired(now=timezone.now()).order_by("pk")
+        batch_size = options["batch_size"]
+
         deleted = 0
-        for pk in qs.values_list("pk", flat=True).iterator():
+        last = None
+        while True:
+            page = qs.filter(pk__gt=last) if last else qs
+            batch = list(page.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            last = batch[-1]
+
+            # Storage objects of the whole batch go in one bulk delete when
+            # the transaction commits (see signals.py)
             try:
-                count, _ = UploadedFile.objects.filter(pk=pk).delete()
-                deleted += count
+                with transaction.atomic():
+                    _, counts = UploadedFile.objects.filter(pk__in=batch).delete()
+                deleted += counts.get(UploadedFile._meta.label, 0)
             except Exception:
-                logger.exception("Failed deleting expired UploadedFile %s", pk)
-                self.stderr.write(f"Failed deleting upload {pk}")
+                logger.exception(
+                    "Failed deleting expired uploads %s..%s", batch[0], last
+                )
+                self.stderr.write(f"Failed deleting {len(batch)} uploads")
 
         self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired uploads."))
@@ -0,0 +1,149 @@
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from ...models import UploadedFile
+from ...storage.bulk import bulk_delete
+from ...storage.listing import iter_storage_objects, iter_unreferenced
+
+logger = logging.getLogger(__name__)
+
+# Collations that sort strings by code point, matching storage listings
+BINARY_COLLATIONS = {
+    "postgresql": "C",
+    "sqlite": "BINARY",
+}
+
+
+class Command(BaseCommand):
+    help = "Delete or quarantine storage objects not referenced by any upload"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            default="uploads/",
+            help="Storage prefix to scan (default: uploads/).",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Only collect objects last modified longer ago than this.",
+        )
+        parser.add_argument(
+            "--action",
+            choices=["delete", "quarantine"],
+            default="delete",
+            help="What to do with orphaned objects (default: delete).",
+        )
+        parser.add_argument(
+            "--quarantine-prefix",
+            default="quarantine/",
+            help="Destination prefix for quarantined objects.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=1000,
+            help="Number of keys fetched per storage or database page.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report orphans without touching them.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        quarantine_prefix = options["quarantine_prefix"]
+        if options["action"] == "quarantine" and quarantine_prefix.startswith(prefix):
+            raise CommandError("--quarantine-prefix must be outside --prefix.")
+
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+        page_size = options["page_size"]
+
+        try:
+            objects = iter_storage_objects(default_storage, prefix, page_size=page_size)
+            orphans = iter_unreferenced(objects, self._db_keys(prefix, page_size))
+
+            collected = skipped = failed = 0
+            to_delete = []
+            for obj in orphans:
+                if obj.modified > cutoff:
+                    skipped += 1
+                    continue
+
+                if options["dry_run"]:
+                    self.stdout.write(f"Orphan: {obj.name}")
+                    collected += 1
+                    continue
+
+                if options["action"] == "delete":
+                    # Deleted a page at a time, in one storage request on S3
+                    to_delete.append(obj.name)
+                    if len(to_delete) >= page_size:
+                        done, errors = self._delete(to_delete)
+                        collected, failed = collected + done, failed + errors
+                        to_delete = []
+                    continue
+
+                try:
+                    self._quarantine(obj.name, quarantine_prefix)
+                    collected += 1
+                except Exception:
+                    logger.exception("Failed to collect storage object %s", obj.name)
+                    self.stderr.write(f"Failed collecting {obj.name}")
+                    failed += 1
+
+            if to_delete:
+                done, errors = self._delete(to_delete)
+                collected, failed = collected + done, failed + errors
+        except NotImplementedError as e:
+            raise CommandError(str(e)) from None
+
+        verb = "Found" if options["dry_run"] else f"{options['action'].title()}d"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {collected} orphaned objects "
+                f"({skipped} within grace period, {failed} failed)."
+            )
+        )
+
+    def _delete(self, names):
+        """
+        Delete a batch of orphans; returns (deleted, failed) counts.
+        """
+        failed = bulk_delete(default_storage, names)
+        for name in failed:
+            self.stderr.write(f"Failed collecting {name}")
+        return len(names) - len(failed), len(failed)
+
+    def _db_keys(self, prefix, page_size):
+        """
+        Stream referenced storage keys in the same order as the listing.
+        """
+        order = "file"
+        collation = BINARY_COLLATIONS.get(connection.vendor)
+        if collation:
+            order = Collate("file", collation)
+
+        return (
+            UploadedFile.objects.filter(file__startswith=prefix)
+            .order_by(order)
+            .values_list("file", flat=True)
+            .iterator(chunk_size=page_size)
+        )
+
+    def _quarantine(self, name, quarantine_prefix):
+        """
+        Copy an object under the quarantine prefix, then remove the original.
+        """
+        with default_storage.open(name, "rb") as fh:
+            default_storage.save(posixpath.join(quarantine_prefix, name), fh)
+        default_storage.delete(name)
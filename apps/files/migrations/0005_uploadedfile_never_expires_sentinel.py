@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:13
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+
+NEVER_EXPIRES = datetime.datetime(9999, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+def fill_never_expires(apps, schema_editor):
+    UploadedFile = apps.get_model("files", "UploadedFile")
+    UploadedFile.objects.filter(expires_at__isnull=True).update(
+        expires_at=NEVER_EXPIRES
+    )
+
+
+def clear_never_expires(apps, schema_editor):
+    UploadedFile = apps.get_model("files", "UploadedFile")
+    UploadedFile.objects.filter(expires_at=NEVER_EXPIRES).update(expires_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0004_uploadedfile_expires_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_never_expires, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="uploadedfile",
+            name="expires_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=datetime.datetime(
+                    9999, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                ),
+            ),
+        ),
+        # Runs after the column is nullable again when migrating backwards
+        migrations.RunPython(migrations.RunPython.noop, clear_never_expires),
+        migrations.AddIndex(
+            model_name="uploadedfile",
+            index=models.Index(
+                fields=["user", "expires_at", "size"],
+                name="files_upload_user_exp_size_idx",
+            ),
+        ),
+    ]
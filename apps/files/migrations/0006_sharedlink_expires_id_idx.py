@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0005_uploadedfile_never_expires_sentinel"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="sharedlink",
+            index=models.Index(
+                fields=["expires_at", "id"], name="files_share_expires_id_idx"
+            ),
+        ),
+    ]
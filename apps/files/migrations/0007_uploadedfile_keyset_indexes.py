@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 09:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0006_sharedlink_expires_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="uploadedfile",
+            index=models.Index(
+                fields=["user", "uploaded_at", "id"],
+                name="files_upload_user_upl_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="uploadedfile",
+            index=models.Index(
+                fields=["user", "size", "id"], name="files_upload_user_size_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:02
+
+from django.db import migrations
+
+from apps.files.search import drop_search_index, install_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def drop(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0007_uploadedfile_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, drop),
+    ]
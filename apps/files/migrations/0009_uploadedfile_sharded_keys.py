@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:09
+
+import apps.files.storage.keys
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0008_uploadedfile_filename_search"),
+    ]
+
+    operations = [
+        # upload_to only affects new keys; the column is unchanged, so skip
+        # the table rebuild SQLite would otherwise do
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="uploadedfile",
+                    name="file",
+                    field=models.FileField(
+                        upload_to=apps.files.storage.keys.upload_key
+                    ),
+                ),
+            ],
+        ),
+    ]
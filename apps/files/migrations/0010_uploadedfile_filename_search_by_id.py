@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:20
+
+from django.db import migrations
+
+from apps.files.search import (
+    analyze_search_table,
+    drop_search_index,
+    install_search_index,
+    uses_fts,
+)
+
+
+def reinstall(apps, schema_editor):
+    # The SQLite index now keys entries by file id instead of rowid; the
+    # Postgres trigram index is unchanged
+    connection = schema_editor.connection
+    if not uses_fts(connection):
+        return
+    drop_search_index(connection)
+    install_search_index(connection)
+    analyze_search_table(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0009_uploadedfile_sharded_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall, migrations.RunPython.noop),
+    ]
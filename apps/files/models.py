@@ -5,6 +5,9 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from .storage.keys import upload_key
+from .ttl import NEVER_EXPIRES
+
 # QuerySet / manager helpers
 
 
@@ -15,7 +18,11 @@ class UploadedFileQuerySet(models.QuerySet):
 
     def active(self, now=None):
         now = now or timezone.now()
-        return self.exclude(expires_at__isnull=False, expires_at__lte=now)
+        return self.filter(expires_at__gt=now)
+
+    def expired(self, now=None):
+        now = now or timezone.now()
+        return self.filter(expires_at__lte=now)
 
 
 class SharedLinkQuerySet(models.QuerySet):
@@ -55,18 +62,16 @@ class UploadedFile(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    file = models.FileField(upload_to="uploads/%Y/%m/%d/")
+    file = models.FileField(upload_to=upload_key)
     filename = models.CharField(max_length=255)
     size = models.PositiveIntegerField()  # in bytes
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    expires_at = models.DateTimeField(default=NEVER_EXPIRES, db_index=True)
 
     objects = UploadedFileQuerySet.as_manager()
 
     @property
     def is_expired(self) -> bool:
-        if self.expires_at is None:
-            return False
         return timezone.now() >= self.expires_at
 
     class Meta:
@@ -75,6 +80,23 @@ class UploadedFile(models.Model):
                 fields=["user", "filename"], name="unique_filename_per_user"
             ),
         ]
+        indexes = [
+            # Serves per-user active filters and covers the quota SUM(size)
+            models.Index(
+                fields=["user", "expires_at", "size"],
+                name="files_upload_user_exp_size_idx",
+            ),
+            # Keyset pagination orders; (user, filename) is covered by the
+            # unique constraint since filenames are unique per user
+            models.Index(
+                fields=["user", "uploaded_at", "id"],
+                name="files_upload_user_upl_id_idx",
+            ),
+            models.Index(
+                fields=["user", "size", "id"],
+                name="files_upload_user_size_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.filename} ({self.user.email})"
@@ -101,4 +123,8 @@ class SharedLink(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["file", "expires_at"]),
+            # Keyset order for batched cleanup of expired links
+            models.Index(
+                fields=["expires_at", "id"], name="files_share_expires_id_idx"
+            ),
         ]
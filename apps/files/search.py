@@ -0,0 +1,193 @@
+"""
+Indexed substring search on `UploadedFile.filename`.
+
+Postgres serves `icontains` from a trigram GIN index on UPPER(filename).
+SQLite keeps an FTS5 trigram table with each file's id and filename,
+maintained by triggers on create, rename and delete (including bulk
+queryset writes). Matches are joined back on the id, not the rowid, which
+VACUUM may renumber. Terms shorter than a trigram can't use either index
+and fall back to a plain `icontains` over the user's rows.
+
+On SQLite, a common term (more than FTS_MAX_MATCHES matches) is also
+searched with `icontains`: walking the user's rows in page order finds a
+page of matches quickly, while joining thousands of index matches back to
+the files table doesn't. A capped probe of the index picks the path.
+
+Benchmark with `python benchmarks/bench_search.py`.
+"""
+
+import sqlite3
+
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+TRIGRAM_INDEX = "files_upload_fname_trgm_idx"
+FTS_TABLE = "files_uploadedfile_fts"
+BASE_TABLE = "files_uploadedfile"
+MIN_TRIGRAM_LENGTH = 3
+# Index matches above which the ordered scan is faster (page plus count,
+# see benchmarks/bench_search.py)
+FTS_MAX_MATCHES = 1000
+# Migration that first installs the index
+INSTALLED_BY = ("files", "0008_uploadedfile_filename_search")
+
+# The id column isn't indexed, so an entry is found through its own
+# filename first; filenames too short for a trigram need a scan
+_FTS_DELETE = f"""
+    DELETE FROM {FTS_TABLE} WHERE rowid IN (
+        SELECT rowid FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH '"' || replace(old.filename, '"', '""') || '"'
+    ) AND file_id = old.id;
+    DELETE FROM {FTS_TABLE}
+    WHERE length(old.filename) < {MIN_TRIGRAM_LENGTH} AND file_id = old.id;
+"""
+
+_FTS_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        AFTER INSERT ON {BASE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(file_id, filename) VALUES (new.id, new.filename);
+        END
+    """,
+    f"{FTS_TABLE}_ad": f"""
+        AFTER DELETE ON {BASE_TABLE} BEGIN
+            {_FTS_DELETE}
+        END
+    """,
+    f"{FTS_TABLE}_au": f"""
+        AFTER UPDATE OF filename ON {BASE_TABLE} BEGIN
+            {_FTS_DELETE}
+            INSERT INTO {FTS_TABLE}(file_id, filename) VALUES (new.id, new.filename);
+        END
+    """,
+}
+
+
+def uses_fts(connection) -> bool:
+    """
+    Whether this connection searches through the FTS5 table.
+
+    The trigram tokenizer needs SQLite 3.34+.
+    """
+    return connection.vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 34)
+
+
+def install_search_index(connection) -> None:
+    """
+    Create the search index for this database if it is missing.
+
+    Safe to re-run. On SQLite, the triggers and contents are also recreated
+    if a table rebuild (e.g. a later AlterField migration) dropped them.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {BASE_TABLE} "
+                f"USING gin (UPPER(filename::text) gin_trgm_ops)"
+            )
+        elif uses_fts(connection):
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [BASE_TABLE],
+            )
+            present = {row[0] for row in cursor.fetchall()}
+            if present >= _FTS_TRIGGERS.keys():
+                return
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"file_id UNINDEXED, filename, tokenize='trigram')"
+            )
+            for name, body in _FTS_TRIGGERS.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(f"CREATE TRIGGER {name} {body}")
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(file_id, filename) "
+                f"SELECT id, filename FROM {BASE_TABLE}"
+            )
+
+
+def analyze_search_table(connection) -> None:
+    """
+    Refresh SQLite's planner statistics for the files table.
+
+    Without them SQLite assumes `user_id = ?` matches a handful of rows and
+    scans every file of the user instead of starting from the FTS matches.
+    Run by the migration that installs the index; Postgres keeps its own
+    statistics up to date.
+    """
+    if uses_fts(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {BASE_TABLE}")
+
+
+def drop_search_index(connection) -> None:
+    """
+    Remove the search index created by `install_search_index`.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+        elif connection.vendor == "sqlite":
+            for name in _FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def search_files(queryset, term: str):
+    """
+    Filter an UploadedFile queryset to filenames containing `term`.
+
+    Matching is case-insensitive, and prefixes match like any other
+    substring. Combines with any ordering or pagination applied afterwards.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+
+    connection = connections[queryset.db]
+    if (
+        len(term) >= MIN_TRIGRAM_LENGTH
+        and uses_fts(connection)
+        and count_fts_matches(connection, term, limit=FTS_MAX_MATCHES + 1)
+        <= FTS_MAX_MATCHES
+    ):
+        return search_fts(queryset, term)
+
+    # On Postgres, UPPER(filename::text) LIKE ... is what the trigram index
+    # was built for
+    return queryset.filter(filename__icontains=term)
+
+
+def _phrase(term: str) -> str:
+    # One quoted FTS5 phrase, so query syntax in the term is matched literally
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def count_fts_matches(connection, term: str, limit: int) -> int:
+    """
+    Count filenames (of all users) in the FTS5 table matching `term`, up to
+    `limit`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM (SELECT 1 FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s LIMIT %s)",
+            [_phrase(term), limit],
+        )
+        return cursor.fetchone()[0]
+
+
+def search_fts(queryset, term: str):
+    """
+    Filter through the FTS5 table, whatever the term's selectivity (SQLite).
+    """
+    matches = RawSQL(
+        f"{BASE_TABLE}.id IN "
+        f"(SELECT file_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+        [_phrase(term)],
+        output_field=BooleanField(),
+    )
+    return queryset.filter(matches)
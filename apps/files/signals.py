@@ -1,23 +1,58 @@
-import logging
-
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import UploadedFile
+from .cache import invalidate_collection
+from .models import SharedLink, UploadedFile
+from .storage.bulk import delete_on_commit
 
-logger = logging.getLogger(__name__)
+# Names per query when checking blobs against uploads (SQLite's variable limit)
+REFERENCE_CHECK_BATCH_SIZE = 500
 
 
 @receiver(post_delete, sender=UploadedFile)
 def delete_file_from_storage_on_delete(sender, instance, **kwargs):
     """
     Ensure uploaded file blobs are removed from storage when the model is deleted.
+
+    Blobs go once the deleting transaction commits, batched with every other
+    upload deleted in it, and stay if it rolls back.
     """
     f = getattr(instance, "file", None)
     if f and getattr(f, "name", None):
-        try:
-            f.delete(save=False)
-        except Exception:
-            logger.exception(
-                "Failed to delete storage object for UploadedFile %s", instance.pk
-            )
+        delete_on_commit(
+            f.storage, f.name, _referenced_files, using=kwargs.get("using")
+        )
+
+
+def _referenced_files(using, names):
+    """
+    Return the storage names in `names` that an upload still points at.
+    """
+    names = list(names)
+    referenced = set()
+    for start in range(0, len(names), REFERENCE_CHECK_BATCH_SIZE):
+        batch = names[start : start + REFERENCE_CHECK_BATCH_SIZE]
+        referenced.update(
+            UploadedFile.objects.using(using)
+            .filter(file__in=batch)
+            .values_list("file", flat=True)
+        )
+    return referenced
+
+
+@receiver(post_save, sender=UploadedFile)
+@receiver(post_delete, sender=UploadedFile)
+def invalidate_listing_cache_on_change(sender, instance, **kwargs):
+    """
+    Invalidate the owner's cached listings when one of their files changes.
+    """
+    invalidate_collection(instance.user_id)
+
+
+@receiver(post_save, sender=SharedLink)
+def invalidate_listing_cache_on_share_change(sender, instance, **kwargs):
+    """
+    Invalidate the owner's cached listings when a share link is created or
+    revoked. Bulk revocations via `update()` invalidate explicitly.
+    """
+    invalidate_collection(instance.file.user_id)
@@ -0,0 +1,109 @@
+"""
+Storage wrappers and helpers for code that needs the concrete backend.
+
+Wrappers (such as the local disk cache) delegate every operation to the
+storage they wrap. Code that needs backend-specific features (S3
+presigning, listings, server-side copies) should check the unwrapped
+storage rather than `default_storage` itself.
+"""
+
+from django.core.files.storage import Storage, storages
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from .bulk import BulkStorageMixin
+
+
+class StorageWrapper(BulkStorageMixin, Storage):
+    """
+    A storage that forwards everything to `backend`.
+
+    `backend` is a storage alias from STORAGES (e.g. "origin") or a
+    storage instance. Attributes the wrapper doesn't define (like
+    `bucket` or `location`) are read from the backend.
+    """
+
+    def __init__(self, backend="origin"):
+        self.backend = storages[backend] if isinstance(backend, str) else backend
+
+    def __getattr__(self, attr):
+        if attr == "backend":  # not set yet (e.g. during unpickling)
+            raise AttributeError(attr)
+        return getattr(self.backend, attr)
+
+    # Naming
+
+    def get_valid_name(self, name):
+        return self.backend.get_valid_name(name)
+
+    def get_available_name(self, name, max_length=None):
+        return self.backend.get_available_name(name, max_length=max_length)
+
+    def generate_filename(self, filename):
+        return self.backend.generate_filename(filename)
+
+    # Reads and writes
+
+    def _open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def save(self, name, content, max_length=None):
+        return self.backend.save(name, content, max_length=max_length)
+
+    def delete(self, name):
+        self.backend.delete(name)
+
+    # Metadata
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name, *args, **kwargs):
+        return self.backend.url(name, *args, **kwargs)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def get_accessed_time(self, name):
+        return self.backend.get_accessed_time(name)
+
+    def get_created_time(self, name):
+        return self.backend.get_created_time(name)
+
+    def get_modified_time(self, name):
+        return self.backend.get_modified_time(name)
+
+    # Batches (the backend's own, when it has one)
+
+    def bulk_delete(self, names):
+        if isinstance(self.backend, BulkStorageMixin):
+            return self.backend.bulk_delete(names)
+        return super().bulk_delete(names)
+
+
+def unwrap_storage(storage) -> Storage:
+    """
+    Return the storage that actually holds the objects, below any wrappers.
+    """
+    while isinstance(storage, StorageWrapper):
+        storage = storage.backend
+    return storage
+
+
+def is_s3_storage(storage) -> bool:
+    return isinstance(unwrap_storage(storage), S3Boto3Storage)
+
+
+def signed_url_lifetime(storage) -> int | None:
+    """
+    Seconds a URL from `storage.url()` stays valid, or None if it doesn't expire.
+    """
+    backend = unwrap_storage(storage)
+    if isinstance(backend, S3Boto3Storage) and backend.querystring_auth:
+        return backend.querystring_expire
+    return None
@@ -0,0 +1,129 @@
+"""
+Batch operations on many storage objects at once.
+
+`BulkStorageMixin` gives a storage `bulk_delete`. The default fans
+`delete` out over a small thread pool, which is what local storage needs.
+Remote storages override it with batch requests (see
+apps/files/storage/s3.py).
+
+`delete_on_commit` queues blob deletes until the surrounding transaction
+commits, then removes the whole batch in one call. `bulk_delete` deletes
+a batch from any storage.
+"""
+
+import logging
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+logger = logging.getLogger(__name__)
+
+# Threads used by the fallback implementations
+BULK_WORKERS = 8
+
+# Deletes waiting for a commit: {alias: {(storage, in_use): [name, ...]}}
+_queued_deletes: ContextVar[dict] = ContextVar("queued_blob_deletes")
+
+
+class BulkStorageMixin:
+    """
+    Add batch operations to a storage.
+    """
+
+    bulk_workers = BULK_WORKERS
+
+    def bulk_delete(self, names: Iterable[str]) -> list[str]:
+        """
+        Delete the named objects and return the names that failed.
+
+        Objects that are already gone count as deleted.
+        """
+
+        def delete(name):
+            try:
+                self.delete(name)
+            except Exception:
+                logger.exception("Failed to delete storage object %s", name)
+                return name
+            return None
+
+        return [name for name in self._map(delete, names) if name is not None]
+
+    def _map(self, fn, names) -> list:
+        names = list(names)
+        if len(names) <= 1:
+            return [fn(name) for name in names]
+        workers = min(self.bulk_workers, len(names))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, names))
+
+
+class BulkFileSystemStorage(BulkStorageMixin, FileSystemStorage):
+    pass
+
+
+def delete_on_commit(storage, name: str, in_use, using: str | None = None) -> None:
+    """
+    Delete `name` from `storage` once the current transaction commits.
+
+    Deletes queued before the commit are sent together, one `bulk_delete`
+    per storage, so deleting many rows (e.g. a queryset delete) costs one
+    storage call per transaction. Outside a transaction the object is
+    deleted right away.
+
+    A rollback drops its commit callbacks but can't unqueue its names, so
+    they go out with the next commit in the same context. Names that
+    `in_use(using, names)` still reports as referenced (e.g. by rows the
+    rollback restored) are kept.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if not transaction.get_connection(using).in_atomic_block:
+        _flush({(storage, in_use): [name]}, using)
+        return
+
+    queued = _queued_deletes.get(None)
+    if queued is None:
+        queued = {}
+        _queued_deletes.set(queued)
+    pending = queued.setdefault(using, {})
+    pending.setdefault((storage, in_use), []).append(name)
+    # One callback per delete, since a savepoint rollback may drop any of
+    # them; the first one to run sends the whole queue
+    transaction.on_commit(partial(_flush_queued, using), using=using)
+
+
+def _flush_queued(using: str) -> None:
+    pending = (_queued_deletes.get(None) or {}).pop(using, None)
+    if pending:
+        _flush(pending, using)
+
+
+def _flush(pending: dict, using: str) -> None:
+    for (storage, in_use), names in pending.items():
+        referenced = in_use(using, names)
+        unused = [name for name in names if name not in referenced]
+        if unused:
+            bulk_delete(storage, unused)
+
+
+def bulk_delete(storage, names: Iterable[str]) -> list[str]:
+    """
+    Delete the named objects from any storage and return the names that failed.
+
+    Storages without `bulk_delete` get one `delete` call per name.
+    """
+    if isinstance(storage, BulkStorageMixin):
+        return storage.bulk_delete(names)
+
+    failed = []
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception("Failed to delete storage object %s", name)
+            failed.append(name)
+    return failed
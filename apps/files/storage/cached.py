@@ -0,0 +1,337 @@
+"""
+A local disk cache in front of a remote storage.
+
+Recently read and recently uploaded objects are kept on local disk, so
+server-side processing of the same object (previews, archives, scans) reads
+it from S3 once. Nothing in this tree reads upload content server-side yet
+(downloads redirect to the storage), so the cache is for processing jobs
+that open uploads through `default_storage`, and is off by default. Upload keys are unique and never rewritten in place
+(apps/files/storage/keys.py), so a cached copy can't go stale; deletes made
+through this storage drop the local copy as well.
+
+The cache is an LRU bounded by a byte budget. Each copy is stored as
+`<dir>/<ab>/<name hash>.<content sha256>` and written atomically (temp file,
+then rename), so processes sharing the directory only ever see whole files.
+Each process tracks the entries it knows about, so with several processes
+the budget is approximate; entries left by other processes are picked up
+on lookup and on startup.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+from .backends import StorageWrapper
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Objects larger than this share of the budget bypass the cache, so a single
+# large file can't flush everything else
+MAX_OBJECT_SHARE = 0.125
+TMP_DIR = "tmp"
+# Temp files older than this belong to writes that died part-way
+STALE_TMP_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    corrupt: int
+    entries: int
+    bytes: int
+
+
+@dataclass
+class _Entry:
+    path: Path
+    size: int
+    # Hashed by this process, when written or on first use
+    verified: bool = False
+
+
+class CachedStorage(StorageWrapper):
+    """
+    Wrap a storage with a byte-budgeted LRU cache on local disk.
+
+    - Read-through: binary reads are served from the cache, and misses are
+      copied into it while they are fetched.
+    - Write-through (`write_through=True`): uploads are copied into the cache
+      after the backend accepts them.
+    - Integrity: a copy this process didn't write (left by another process
+      or an earlier run) is hashed on first use, and one that doesn't
+      match its recorded digest is dropped and refetched. `verify=True`
+      hashes copies on every hit instead.
+
+    Everything else, including URLs, goes straight to the backend.
+    """
+
+    def __init__(
+        self,
+        backend="origin",
+        cache_dir=None,
+        max_bytes=None,
+        max_object_bytes=None,
+        write_through=None,
+        verify=False,
+    ):
+        super().__init__(backend)
+        self.cache_dir = Path(cache_dir or settings.STORAGE_CACHE_DIR)
+        self.max_bytes = (
+            settings.STORAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        self.max_object_bytes = (
+            int(self.max_bytes * MAX_OBJECT_SHARE)
+            if max_object_bytes is None
+            else min(max_object_bytes, self.max_bytes)
+        )
+        self.write_through = (
+            settings.STORAGE_CACHE_WRITE_THROUGH
+            if write_through is None
+            else write_through
+        )
+        self.verify = verify
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] | None = None  # oldest first
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._corrupt = 0
+
+    # Storage API
+
+    def _open(self, name, mode="rb"):
+        if any(flag in mode for flag in "wa+"):
+            self._evict(name)
+            return super()._open(name, mode)
+        if fh := self._get(name):
+            return File(fh, name)
+
+        remote = self.backend.open(name, "rb")
+        if remote.size is not None and remote.size > self.max_object_bytes:
+            return remote
+        with remote:
+            path = self._put(name, remote)
+        return File(path.open("rb"), name)
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.backend.save(name, content, max_length=max_length)
+        if self.write_through and (content.size or 0) <= self.max_object_bytes:
+            try:
+                content.seek(0)
+                self._put(name, content)
+            except (OSError, ValueError):  # unseekable or closed content
+                logger.warning("Could not cache %s after upload", name, exc_info=True)
+        return name
+
+    def delete(self, name):
+        self.backend.delete(name)
+        self._evict(name)
+
+    def bulk_delete(self, names):
+        names = list(names)
+        failed = super().bulk_delete(names)
+        for name in names:
+            self._evict(name)
+        return failed
+
+    def size(self, name):
+        key = _key(name)
+        with self._lock:
+            entry = self._index().get(key)
+        return entry.size if entry else self.backend.size(name)
+
+    # Cache
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries = self._index()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                corrupt=self._corrupt,
+                entries=len(entries),
+                bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        """
+        Drop every cached copy (the backend is untouched).
+        """
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._entries, self._bytes = None, 0
+
+    def _get(self, name):
+        """
+        Return an open handle on the cached copy of `name`, or None.
+        """
+        key = _key(name)
+        with self._lock:
+            entries = self._index()
+            entry = entries.get(key) or self._adopt(key)
+            if entry is not None:
+                entries.move_to_end(key)
+        if entry is None:
+            return self._miss()
+
+        try:
+            fh = entry.path.open("rb")
+        except FileNotFoundError:  # evicted by another process
+            self._forget(key)
+            return self._miss()
+
+        if self.verify or not entry.verified:
+            if not _matches(fh, entry.path.suffix[1:]):
+                fh.close()
+                logger.warning("Dropping corrupt cached copy of %s", name)
+                with self._lock:
+                    self._corrupt += 1
+                self._evict(name)
+                return self._miss()
+            entry.verified = True
+
+        # Shared recency hint for the next process that scans the directory
+        os.utime(entry.path)
+        with self._lock:
+            self._hits += 1
+        return fh
+
+    def _put(self, name, content) -> Path:
+        """
+        Copy `content` into the cache as `name` and return the copy's path.
+        """
+        tmp_dir = self.cache_dir / TMP_DIR
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        key = _key(name)
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+            try:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                size = tmp.tell()
+                tmp.close()
+                path = self.cache_dir / key[:2] / f"{key}.{digest.hexdigest()}"
+                path.parent.mkdir(exist_ok=True)
+                os.replace(tmp.name, path)
+            except BaseException:
+                tmp.close()
+                Path(tmp.name).unlink(missing_ok=True)
+                raise
+
+        with self._lock:
+            entries = self._index()
+            old = entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+                if old.path != path:
+                    old.path.unlink(missing_ok=True)
+            entries[key] = _Entry(path, size, verified=True)
+            self._bytes += size
+            self._shrink()
+        return path
+
+    def _evict(self, name) -> None:
+        key = _key(name)
+        entry = self._forget(key) or self._adopt(key, track=False)
+        if entry is not None:
+            entry.path.unlink(missing_ok=True)
+
+    def _forget(self, key) -> _Entry | None:
+        with self._lock:
+            entry = self._index().pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+            return entry
+
+    def _miss(self) -> None:
+        with self._lock:
+            self._misses += 1
+
+    def _shrink(self) -> None:
+        """
+        Evict least recently used entries until the cache fits its budget.
+
+        Callers hold the lock.
+        """
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            entry.path.unlink(missing_ok=True)
+            self._bytes -= entry.size
+            self._evictions += 1
+
+    def _adopt(self, key, track=True) -> _Entry | None:
+        """
+        Find a copy of `key` written by another process.
+        """
+        shard = self.cache_dir / key[:2]
+        for path in shard.glob(f"{key}.*") if shard.is_dir() else ():
+            try:
+                entry = _Entry(path, path.stat().st_size)
+            except FileNotFoundError:
+                continue
+            if track:
+                self._entries[key] = entry
+                self._bytes += entry.size
+                self._shrink()
+            return entry
+        return None
+
+    def _index(self) -> OrderedDict:
+        """
+        Return the LRU index, loading it from disk on first use.
+
+        Callers hold the lock. Copies are ordered by modification time, which
+        hits refresh, and temp files left by interrupted writes are removed.
+        """
+        if self._entries is not None:
+            return self._entries
+
+        stale = time.time() - STALE_TMP_SECONDS
+        for path in (self.cache_dir / TMP_DIR).glob("*"):
+            with contextlib.suppress(FileNotFoundError):
+                if path.stat().st_mtime < stale:
+                    path.unlink()
+
+        found = []
+        for path in self.cache_dir.glob("??/*.*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, path.stem, _Entry(path, stat.st_size)))
+        found.sort(key=lambda item: item[0])
+
+        self._entries = OrderedDict((key, entry) for _, key, entry in found)
+        self._bytes = sum(entry.size for entry in self._entries.values())
+        self._shrink()
+        return self._entries
+
+
+def _key(name: str) -> str:
+    return hashlib.sha256(name.encode()).hexdigest()
+
+
+def _matches(fh, expected: str) -> bool:
+    """
+    Whether the file's sha256 is `expected`; leaves `fh` rewound.
+    """
+    digest = hashlib.file_digest(fh, "sha256").hexdigest()
+    fh.seek(0)
+    return digest == expected
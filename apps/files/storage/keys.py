@@ -0,0 +1,79 @@
+"""
+Storage keys for uploaded files.
+
+Keys are derived from the upload's random UUID primary key, so they are
+unique without asking the storage whether a name is taken. Storages are
+configured to skip that check (S3 file_overwrite, FileSystemStorage
+allow_overwrite), which saves at least one S3 HEAD per upload. Two levels
+of hex shards keep local directories small (256 * 256 buckets). The
+original name lives in `UploadedFile.filename`; only a sanitized
+extension is kept in the key, for content-type detection.
+"""
+
+import os
+import posixpath
+import re
+
+from .backends import is_s3_storage, unwrap_storage
+
+UPLOAD_PREFIX = "uploads"
+
+_EXTENSION_RE = re.compile(r"^\.[a-z0-9]{1,16}$")
+
+# Object headers carried over by `copy_object`
+COPIED_HEADERS = (
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "ContentType",
+    "Metadata",
+)
+
+
+def build_upload_key(file_id, filename: str) -> str:
+    """
+    Return the key for an upload: uploads/<ab>/<cd>/<uuid hex><.ext>.
+    """
+    hex_id = file_id.hex
+    ext = os.path.splitext(filename)[1].lower()
+    if not _EXTENSION_RE.match(ext):
+        ext = ""
+    return posixpath.join(UPLOAD_PREFIX, hex_id[:2], hex_id[2:4], hex_id + ext)
+
+
+def upload_key(instance, filename: str) -> str:
+    """
+    `upload_to` callable for `UploadedFile.file`.
+    """
+    return build_upload_key(instance.pk, filename)
+
+
+def copy_object(storage, src: str, dst: str) -> None:
+    """
+    Copy a stored object to a new key, server-side on S3.
+
+    S3 copies large objects part by part, with the storage's transfer
+    settings (see apps/files/storage/s3.py). A multipart copy starts a new
+    upload that only gets the headers passed in, so the source's content
+    type and metadata are read first and set explicitly.
+    """
+    if is_s3_storage(storage):
+        s3 = unwrap_storage(storage)
+        source = {"Bucket": s3.bucket.name, "Key": s3._normalize_name(src)}
+        head = s3.bucket.meta.client.head_object(**source)
+        extra_args = {name: head[name] for name in COPIED_HEADERS if name in head}
+        # Single-part copies take the headers above instead of the source's
+        extra_args["MetadataDirective"] = "REPLACE"
+        s3.bucket.copy(
+            source,
+            s3._normalize_name(dst),
+            ExtraArgs=extra_args,
+            Config=s3.transfer_config,
+        )
+        return
+
+    with storage.open(src, "rb") as fh:
+        saved = storage.save(dst, fh)
+    if saved != dst:
+        raise RuntimeError(f"Storage saved {src!r} as {saved!r} instead of {dst!r}.")
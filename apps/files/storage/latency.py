@@ -0,0 +1,130 @@
+"""
+A storage that behaves like a remote one, for benchmarks and tests.
+
+`LatencyStorage` keeps objects in memory (or in any storage it wraps) and
+adds a configurable delay, jitter and failure rate to each operation, so
+the cost of round trips can be measured without a network. Every call is
+counted, which lets tests assert how many requests a code path makes.
+
+Example STORAGES entry:
+
+    "default": {
+        "BACKEND": "apps.files.storage.latency.LatencyStorage",
+        "OPTIONS": {"latency": {"open": 0.03, "save": 0.05}, "jitter": 0.01},
+    }
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.files.storage import InMemoryStorage
+
+from .backends import StorageWrapper
+from .bulk import BulkStorageMixin
+
+OPERATIONS = ("save", "open", "delete", "exists", "url", "size")
+# Only delayed when configured by name; see LatencyStorage
+BATCH_OPERATIONS = ("bulk_delete",)
+
+
+class InjectedStorageError(OSError):
+    """
+    Raised by `LatencyStorage` for a simulated failure.
+    """
+
+
+class LatencyStorage(StorageWrapper):
+    """
+    Delay, fail and count storage operations.
+
+    - `latency` is seconds per call: one number for every single-object
+      operation, or a dict keyed by operation name (missing operations are
+      instant).
+    - `jitter` adds up to that many seconds more, uniformly at random.
+    - `failure_rate` is the chance a call raises `InjectedStorageError`
+      after its delay: one number or a dict, like `latency`.
+    - `seed` makes jitter and failures reproducible.
+
+    Batch operations cost one call per object, like storages without a
+    batch API, unless `latency` names `bulk_delete`; then a `bulk_delete`
+    is a single call, like S3's DeleteObjects.
+    """
+
+    def __init__(self, backend=None, latency=0, jitter=0, failure_rate=0, seed=None):
+        super().__init__(InMemoryStorage() if backend is None else backend)
+        self.latency = _per_operation(latency)
+        self.jitter = jitter
+        self.failure_rate = _per_operation(failure_rate)
+        self.calls = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """
+        Zero the call counts.
+        """
+        with self._lock:
+            self.calls.clear()
+
+    # Storage API
+
+    def _open(self, name, mode="rb"):
+        self._call("open")
+        return super()._open(name, mode)
+
+    def save(self, name, content, max_length=None):
+        self._call("save")
+        return super().save(name, content, max_length=max_length)
+
+    def delete(self, name):
+        self._call("delete")
+        super().delete(name)
+
+    def exists(self, name):
+        self._call("exists")
+        return super().exists(name)
+
+    def size(self, name):
+        self._call("size")
+        return super().size(name)
+
+    def url(self, name, *args, **kwargs):
+        self._call("url")
+        return super().url(name, *args, **kwargs)
+
+    # Batches go through `delete`, one delayed call per object
+
+    def bulk_delete(self, names):
+        if "bulk_delete" not in self.latency:
+            return BulkStorageMixin.bulk_delete(self, names)
+        names = list(names)
+        try:
+            self._call("bulk_delete")
+        except InjectedStorageError:
+            return names
+        for name in names:
+            self.backend.delete(name)
+        return []
+
+    def _call(self, operation: str) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+            delay = self.latency.get(operation, 0)
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.failure_rate.get(operation, 0)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise InjectedStorageError(f"Injected {operation} failure")
+
+
+def _per_operation(value) -> dict:
+    if isinstance(value, dict):
+        unknown = value.keys() - {*OPERATIONS, *BATCH_OPERATIONS}
+        if unknown:
+            raise ValueError(f"Unknown storage operations: {sorted(unknown)}")
+        return dict(value)
+    return dict.fromkeys(OPERATIONS, value) if value else {}
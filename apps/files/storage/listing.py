@@ -0,0 +1,109 @@
+"""
+Ordered, paginated listings of storage objects.
+
+Keys are yielded in code point order (the order S3 lists them in), so a
+listing can be merged against database keys sorted with a binary collation
+without holding either side in memory.
+"""
+
+import os
+import posixpath
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from django.core.files.storage import FileSystemStorage
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from .backends import unwrap_storage
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    name: str
+    modified: datetime
+
+
+def iter_storage_objects(
+    storage, prefix: str = "", *, page_size: int = 1000
+) -> Iterator[StoredObject]:
+    """
+    Yield every object under `prefix` in code point order.
+
+    S3 listings are fetched `page_size` keys at a time; filesystem listings
+    are read one directory at a time.
+    """
+    storage = unwrap_storage(storage)
+    if isinstance(storage, S3Boto3Storage):
+        yield from _iter_s3(storage, prefix, page_size)
+    elif isinstance(storage, FileSystemStorage):
+        yield from _iter_filesystem(storage, prefix)
+    else:
+        raise NotImplementedError(
+            f"Listing is not supported for {type(storage).__name__}."
+        )
+
+
+def iter_unreferenced(
+    objects: Iterable[StoredObject], keys: Iterable[str]
+) -> Iterator[StoredObject]:
+    """
+    Yield stored objects whose name does not appear in `keys`.
+
+    Both inputs must be sorted in code point order.
+    """
+    keys = iter(keys)
+    key = next(keys, None)
+    for obj in objects:
+        while key is not None and key < obj.name:
+            key = next(keys, None)
+        if key == obj.name:
+            continue
+        yield obj
+
+
+# Backend listings
+
+
+def _iter_s3(storage, prefix, page_size):
+    location = storage.location.strip("/")
+    key_prefix = posixpath.join(location, prefix) if location else prefix
+    strip = len(location) + 1 if location else 0
+
+    paginator = storage.connection.meta.client.get_paginator("list_objects_v2")
+    pages = paginator.paginate(
+        Bucket=storage.bucket_name,
+        Prefix=key_prefix,
+        PaginationConfig={"PageSize": page_size},
+    )
+    for page in pages:
+        for entry in page.get("Contents", ()):
+            key = entry["Key"]
+            if key.endswith("/"):
+                continue  # folder placeholder
+            yield StoredObject(key[strip:], entry["LastModified"])
+
+
+def _iter_filesystem(storage, prefix):
+    base = prefix.strip("/")
+    root = storage.path(base)
+    if os.path.isdir(root):
+        yield from _walk_sorted(root, base)
+
+
+def _walk_sorted(directory, rel):
+    # Sort directories as "name/" so the recursive walk matches the order
+    # of full paths (e.g. "a-b" sorts before "a/x").
+    with os.scandir(directory) as it:
+        entries = sorted(
+            it,
+            key=lambda e: f"{e.name}/" if e.is_dir(follow_symlinks=False) else e.name,
+        )
+
+    for entry in entries:
+        name = posixpath.join(rel, entry.name) if rel else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_sorted(entry.path, name)
+        elif entry.is_file(follow_symlinks=False):
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+            yield StoredObject(name, datetime.fromtimestamp(mtime, tz=UTC))
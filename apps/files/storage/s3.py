@@ -0,0 +1,103 @@
+"""
+S3 storage with tunable multipart transfers.
+
+Server-side reads and writes (uploads relayed through Django, cleanup, key
+migration) go through boto3's managed transfers, which split objects into
+parts and move several parts at once. The part size and the number of parts
+in flight come from settings, and the connection pool is sized to match so
+parallel parts don't queue for a connection.
+
+Batch deletes go out as `DeleteObjects` requests of up to 1000 keys.
+
+Benchmark with `python benchmarks/bench_s3_transfer.py`.
+"""
+
+import logging
+
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name, setting
+
+from .bulk import BulkStorageMixin
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# botocore's default connection pool size
+DEFAULT_POOL_CONNECTIONS = 10
+# Most keys S3 accepts in one DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+class TunedS3Storage(BulkStorageMixin, S3Boto3Storage):
+    """
+    `S3Boto3Storage` whose transfers use `AWS_S3_MULTIPART_CHUNKSIZE` and
+    `AWS_S3_MAX_CONCURRENCY`.
+
+    Objects at or above the part size are sent and fetched in parts. Reads
+    spool to disk beyond one part, instead of holding whole objects in
+    memory. An explicit `AWS_S3_TRANSFER_CONFIG` still takes precedence.
+    """
+
+    def __init__(self, **settings):
+        explicit = settings.get("transfer_config", setting("AWS_S3_TRANSFER_CONFIG"))
+        super().__init__(**settings)
+        if explicit is None:
+            self.transfer_config = build_transfer_config(
+                self.multipart_chunksize, self.max_concurrency
+            )
+        pool = max(
+            self.transfer_config.max_request_concurrency, DEFAULT_POOL_CONNECTIONS
+        )
+        self.client_config = self.client_config.merge(Config(max_pool_connections=pool))
+
+    def get_default_settings(self):
+        chunksize = setting("AWS_S3_MULTIPART_CHUNKSIZE", 16 * MB)
+        return {
+            **super().get_default_settings(),
+            "multipart_chunksize": chunksize,
+            "max_concurrency": setting("AWS_S3_MAX_CONCURRENCY", 10),
+            "max_memory_size": setting("AWS_S3_MAX_MEMORY_SIZE", chunksize),
+        }
+
+    def bulk_delete(self, names):
+        keys = {self._key(name): name for name in names}
+        client = self.connection.meta.client
+        batches = list(keys)
+        failed = []
+        for start in range(0, len(batches), DELETE_BATCH_SIZE):
+            batch = batches[start : start + DELETE_BATCH_SIZE]
+            try:
+                response = client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError):
+                logger.exception("Failed to delete %d storage objects", len(batch))
+                failed += [keys[key] for key in batch]
+                continue
+            for error in response.get("Errors", []):
+                name = keys[error["Key"]]
+                logger.error(
+                    "Failed to delete storage object %s: %s", name, error["Code"]
+                )
+                failed.append(name)
+        return failed
+
+    def _key(self, name):
+        return self._normalize_name(clean_name(name))
+
+
+def build_transfer_config(chunksize: int, concurrency: int) -> TransferConfig:
+    """
+    Transfer settings that move objects in `chunksize` parts, `concurrency`
+    parts at a time (one thread when `concurrency` is 1).
+    """
+    return TransferConfig(
+        multipart_threshold=chunksize,
+        multipart_chunksize=chunksize,
+        max_concurrency=concurrency,
+        use_threads=concurrency > 1,
+    )
@@ -0,0 +1,51 @@
+"""
+Storage calls timed for the Server-Timing header (apps/core/timing.py).
+
+Installed as the outermost media storage when request timing is enabled,
+so one call covers everything beneath it (the disk cache, S3 transfers).
+"""
+
+from apps.core.timing import timed
+
+from .backends import StorageWrapper
+
+
+class TimedStorage(StorageWrapper):
+    """
+    Report each call's duration as storage time on the current request.
+    """
+
+    def __init__(self, backend="media"):
+        super().__init__(backend)
+
+    def _open(self, name, mode="rb"):
+        with timed("storage"):
+            return super()._open(name, mode)
+
+    def save(self, name, content, max_length=None):
+        with timed("storage"):
+            return super().save(name, content, max_length=max_length)
+
+    def delete(self, name):
+        with timed("storage"):
+            super().delete(name)
+
+    def exists(self, name):
+        with timed("storage"):
+            return super().exists(name)
+
+    def listdir(self, path):
+        with timed("storage"):
+            return super().listdir(path)
+
+    def size(self, name):
+        with timed("storage"):
+            return super().size(name)
+
+    def url(self, name, *args, **kwargs):
+        with timed("storage"):
+            return super().url(name, *args, **kwargs)
+
+    def _bulk(self, method, names, **kwargs):
+        with timed("storage"):
+            return super()._bulk(method, names, **kwargs)
@@ -0,0 +1,186 @@
+from datetime import timedelta
+from functools import partial
+
+import pytest
+from django.contrib import admin
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.models import DELETION, LogEntry
+from django.core.files.storage import default_storage
+from django.urls import path, reverse
+from django.utils import timezone
+
+from apps.core.utils.pagination import EstimatedCountPaginator
+from apps.files import admin as files_admin
+from apps.files.cache import get_collection_version
+from apps.files.models import SharedLink, UploadedFile
+from tests.factories import UserFactory
+from tests.query_budget import check_query_budget
+
+from .factories import SharedLinkFactory, UploadedFileFactory
+
+# The admin is only routed when EXPOSE_ADMIN is set
+urlpatterns = [path("admin/", admin.site.urls)]
+pytestmark = [pytest.mark.urls(__name__), pytest.mark.django_db]
+
+# Helpers
+
+
+@pytest.fixture(autouse=True)
+def _plain_staticfiles(settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@pytest.fixture
+def admin_client(client):
+    client.force_login(UserFactory(is_staff=True, is_superuser=True))
+    return client
+
+
+def _changelist(model):
+    return reverse(f"admin:files_{model._meta.model_name}_changelist")
+
+
+def _ok(resp, code=200):
+    assert resp.status_code == code
+    return resp
+
+
+# Tests
+
+# Budgets include 2 queries for the session and user
+
+
+def test_uploaded_file_changelist_budget(admin_client):
+    check_query_budget(
+        lambda: _ok(admin_client.get(_changelist(UploadedFile))),
+        budget=4,
+        seed=UploadedFileFactory.create_batch,
+    )
+
+
+def test_shared_link_changelist_budget(admin_client):
+    check_query_budget(
+        lambda: _ok(admin_client.get(_changelist(SharedLink))),
+        budget=4,
+        seed=SharedLinkFactory.create_batch,
+    )
+
+
+def test_changelist_search_by_email_and_expiry_filter(admin_client):
+    mine = UploadedFileFactory(user=UserFactory(email="owner@example.com"))
+    UploadedFileFactory(expires_at=timezone.now() - timedelta(minutes=1))
+    UploadedFileFactory()
+
+    resp = _ok(admin_client.get(_changelist(UploadedFile), {"q": "Owner@Example.com"}))
+    assert list(resp.context["cl"].result_list) == [mine]
+
+    resp = _ok(admin_client.get(_changelist(UploadedFile), {"expiry": "expired"}))
+    assert resp.context["cl"].result_count == 1
+
+
+def test_expire_action_expires_whole_selection(
+    admin_client, django_capture_on_commit_callbacks
+):
+    files = UploadedFileFactory.create_batch(3)
+    owner = files[0].user_id
+    version = get_collection_version(owner)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        resp = admin_client.post(
+            _changelist(UploadedFile),
+            {
+                "action": "expire_selected",
+                "select_across": "1",
+                "index": "0",
+                ACTION_CHECKBOX_NAME: [str(files[0].pk)],
+            },
+        )
+
+    _ok(resp, 302)
+    assert not UploadedFile.objects.active().exists()
+    # Cached listings are only invalidated once the update commits
+    assert get_collection_version(owner) == version
+    for callback in callbacks:
+        callback()
+    assert get_collection_version(owner) != version
+
+
+def test_batched_delete_asks_for_confirmation_then_deletes(
+    admin_client, django_capture_on_commit_callbacks
+):
+    doomed, kept = UploadedFileFactory.create_batch(2)
+    data = {
+        "action": "delete_selected_in_batches",
+        "index": "0",
+        ACTION_CHECKBOX_NAME: [str(doomed.pk)],
+    }
+
+    resp = _ok(admin_client.post(_changelist(UploadedFile), data))
+    assert "admin/files/batch_delete_confirmation.html" in [
+        t.name for t in resp.templates
+    ]
+    assert resp.context["count"] == 1
+    assert "share links and stored files are deleted too" in resp.content.decode()
+    assert "admin/js/cancel.js" in resp.content.decode()  # "No, take me back"
+    assert UploadedFile.objects.filter(pk=doomed.pk).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = admin_client.post(_changelist(UploadedFile), {**data, "confirm": "yes"})
+
+    _ok(resp, 302)
+    assert list(UploadedFile.objects.all()) == [kept]
+    assert not default_storage.exists(doomed.file.name)
+
+
+def test_batched_delete_logs_each_deleted_row(admin_client, monkeypatch):
+    batches = partial(files_admin.iter_pk_batches, size=2)
+    monkeypatch.setattr(files_admin, "iter_pk_batches", batches)
+    files = UploadedFileFactory.create_batch(3)
+    data = {
+        "action": "delete_selected_in_batches",
+        "index": "0",
+        "confirm": "yes",
+        ACTION_CHECKBOX_NAME: [str(f.pk) for f in files],
+    }
+
+    _ok(admin_client.post(_changelist(UploadedFile), data), 302)
+
+    entries = LogEntry.objects.filter(action_flag=DELETION)
+    assert sorted(entries.values_list("object_id", flat=True)) == sorted(
+        str(f.pk) for f in files
+    )
+    assert {e.object_repr for e in entries} == {str(f) for f in files}
+
+
+def test_batched_delete_confirmation_describes_link_deletes(admin_client):
+    links = SharedLinkFactory.create_batch(2)
+    data = {
+        "action": "delete_selected_in_batches",
+        "select_across": "1",
+        "index": "0",
+        ACTION_CHECKBOX_NAME: [str(links[0].pk)],
+    }
+
+    resp = _ok(admin_client.post(_changelist(SharedLink), data))
+    assert resp.context["count"] == 2
+    content = resp.content.decode()
+    assert "The shared files are kept." in content
+    assert "stored files are deleted" not in content
+
+
+def test_stock_delete_action_is_disabled(admin_client):
+    resp = _ok(admin_client.get(_changelist(UploadedFile)))
+    actions = [name for name, _ in resp.context["action_form"].fields["action"].choices]
+    assert "delete_selected" not in actions
+    assert "delete_selected_in_batches" in actions
+
+
+def test_estimated_paginator_counts_exactly_off_postgres():
+    UploadedFileFactory.create_batch(3)
+    paginator = EstimatedCountPaginator(UploadedFile.objects.all(), 2)
+    assert paginator.count == 3
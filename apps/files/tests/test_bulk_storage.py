@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from apps.files.models import UploadedFile
+from apps.files.storage import bulk
+from apps.files.storage.bulk import BulkFileSystemStorage
+from apps.files.storage.s3 import TunedS3Storage
+
+from .factories import UploadedFileFactory
+
+# Helpers
+
+
+@pytest.fixture
+def bulk_calls(monkeypatch):
+    """
+    Record the names passed to each `bulk_delete` on local storage.
+
+    Starts from an empty queue; rolled-back tests leave names behind.
+    """
+    bulk._queued_deletes.set({})
+    calls = []
+    original = BulkFileSystemStorage.bulk_delete
+
+    def record(self, names):
+        calls.append(sorted(names))
+        return original(self, names)
+
+    monkeypatch.setattr(BulkFileSystemStorage, "bulk_delete", record)
+    return calls
+
+
+class FakeS3Client:
+    def __init__(self, fail=()):
+        self.requests = []
+        self.fail = set(fail)
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.requests.append(keys)
+        errors = [{"Key": k, "Code": "AccessDenied"} for k in keys if k in self.fail]
+        return {"Errors": errors}
+
+
+class FakeConnection:
+    def __init__(self, client):
+        self.meta = type("Meta", (), {"client": client})
+
+
+# Tests
+
+
+def test_filesystem_bulk_delete():
+    names = [
+        default_storage.save(f"bulk/{i}.txt", ContentFile(b"x" * i)) for i in (1, 2)
+    ]
+
+    assert default_storage.bulk_delete([*names, "bulk/missing"]) == []
+    assert not any(default_storage.exists(name) for name in names)
+
+
+@pytest.mark.django_db
+def test_queryset_delete_removes_blobs_in_one_batch(
+    bulk_calls, django_capture_on_commit_callbacks
+):
+    files = UploadedFileFactory.create_batch(3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            UploadedFile.objects.filter(pk__in=[f.pk for f in files]).delete()
+        assert bulk_calls == []  # nothing until commit
+
+    assert bulk_calls == [sorted(f.file.name for f in files)]
+
+
+@pytest.mark.django_db
+def test_rolled_back_delete_keeps_blob(bulk_calls, django_capture_on_commit_callbacks):
+    kept, deleted = UploadedFileFactory.create_batch(2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError), transaction.atomic():
+            kept.delete()
+            raise RuntimeError
+        deleted.delete()
+
+    assert bulk_calls == [[deleted.file.name]]
+    assert default_storage.exists(kept.file.name)
+
+
+@pytest.mark.django_db
+def test_delete_in_rolled_back_savepoint_keeps_blob(
+    bulk_calls, django_capture_on_commit_callbacks
+):
+    deleted, kept = UploadedFileFactory.create_batch(2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            deleted.delete()
+            with pytest.raises(RuntimeError), transaction.atomic():
+                UploadedFile.objects.get(pk=kept.pk).delete()
+                raise RuntimeError
+
+    assert bulk_calls == [[deleted.file.name]]
+    assert UploadedFile.objects.filter(pk=kept.pk).exists()
+    assert default_storage.exists(kept.file.name)
+
+
+@pytest.mark.django_db
+def test_blob_shared_with_another_upload_is_kept(
+    bulk_calls, django_capture_on_commit_callbacks
+):
+    deleted = UploadedFileFactory()
+    sharing = UploadedFileFactory(user=deleted.user)
+    UploadedFile.objects.filter(pk=sharing.pk).update(file=deleted.file.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        deleted.delete()
+
+    assert bulk_calls == []
+    assert default_storage.exists(deleted.file.name)
+
+
+@pytest.mark.django_db
+def test_cleanup_expired_uploads_deletes_rows_and_blobs_in_batches(
+    django_capture_on_commit_callbacks,
+):
+    past = timezone.now() - timedelta(minutes=1)
+    expired = UploadedFileFactory.create_batch(5, expires_at=past)
+    active = UploadedFileFactory()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("cleanup_expired_uploads", "--batch-size", "2")
+
+    assert not UploadedFile.objects.filter(pk__in=[f.pk for f in expired]).exists()
+    assert not any(default_storage.exists(f.file.name) for f in expired)
+    assert UploadedFile.objects.filter(pk=active.pk).exists()
+
+
+def test_s3_bulk_delete_batches_keys_and_reports_failures(monkeypatch):
+    client = FakeS3Client(fail={"media/k1"})
+    monkeypatch.setattr(TunedS3Storage, "connection", FakeConnection(client))
+    storage = TunedS3Storage(
+        bucket_name="bucket", access_key="key", secret_key="secret", location="media"
+    )
+
+    failed = storage.bulk_delete(f"k{i}" for i in range(1001))
+
+    assert [len(keys) for keys in client.requests] == [1000, 1]
+    assert failed == ["k1"]
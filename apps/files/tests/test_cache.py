@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+import time_machine
+from django.utils import timezone
+
+from apps.files.cache import get_active_file_stats, get_collection_version
+
+from .factories import UploadedFileFactory
+
+
+@pytest.mark.django_db
+def test_stats_are_served_from_cache(user, django_assert_num_queries):
+    UploadedFileFactory.create_batch(2, user=user)
+
+    with django_assert_num_queries(1):
+        assert get_active_file_stats(user.pk).count == 2
+    with django_assert_num_queries(0):
+        assert get_active_file_stats(user.pk).count == 2
+
+
+@pytest.mark.django_db
+def test_stats_expire_after_listing_cache_seconds(
+    user, settings, django_assert_num_queries
+):
+    # How long another worker's per-process cache may serve old counts
+    settings.LISTING_CACHE_SECONDS = 5
+    UploadedFileFactory(user=user)
+    get_active_file_stats(user.pk)
+
+    with time_machine.travel(timezone.now() + timedelta(seconds=6)):
+        with django_assert_num_queries(1):
+            get_active_file_stats(user.pk)
+
+
+@pytest.mark.django_db
+def test_upload_and_delete_invalidate_stats(user):
+    f = UploadedFileFactory(user=user)
+    version = get_collection_version(user.pk)
+    assert get_active_file_stats(user.pk).count == 1
+
+    UploadedFileFactory(user=user)
+    assert get_collection_version(user.pk) != version
+    assert get_active_file_stats(user.pk).count == 2
+
+    f.delete()
+    assert get_active_file_stats(user.pk).count == 1
+
+
+@pytest.mark.django_db
+def test_expiry_invalidates_stats(user):
+    UploadedFileFactory(user=user)
+    UploadedFileFactory(user=user, expires_at=timezone.now() + timedelta(minutes=5))
+    assert get_active_file_stats(user.pk).count == 2
+
+    with time_machine.travel(timezone.now() + timedelta(minutes=10)):
+        assert get_active_file_stats(user.pk).count == 1
+
+
+@pytest.mark.django_db
+def test_other_users_changes_do_not_invalidate(user):
+    get_active_file_stats(user.pk)
+    version = get_collection_version(user.pk)
+
+    UploadedFileFactory()  # someone else's upload
+
+    assert get_collection_version(user.pk) == version
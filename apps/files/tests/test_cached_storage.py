@@ -0,0 +1,142 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from apps.files.storage import cached
+from apps.files.storage.backends import is_s3_storage, unwrap_storage
+from apps.files.storage.cached import CachedStorage
+
+# Helpers
+
+
+class CountingStorage(FileSystemStorage):
+    """
+    Local storage that counts reads, standing in for a remote backend.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.reads = 0
+
+    def _open(self, name, mode="rb"):
+        self.reads += 1
+        return super()._open(name, mode)
+
+
+@pytest.fixture
+def origin(tmp_path):
+    return CountingStorage(location=tmp_path / "origin")
+
+
+@pytest.fixture
+def make_cached(origin, tmp_path):
+    def _make(**kwargs):
+        kwargs.setdefault("max_bytes", 1000)
+        kwargs.setdefault("max_object_bytes", 1000)
+        kwargs.setdefault("write_through", False)
+        return CachedStorage(origin, cache_dir=tmp_path / "cache", **kwargs)
+
+    return _make
+
+
+def _read(storage, name):
+    with storage.open(name) as fh:
+        return fh.read()
+
+
+# Tests
+
+
+def test_second_read_is_served_from_disk(origin, make_cached):
+    storage = make_cached()
+    storage.save("a.txt", ContentFile(b"hello"))
+
+    assert _read(storage, "a.txt") == b"hello"
+    assert _read(storage, "a.txt") == b"hello"
+    assert origin.reads == 1
+
+    stats = storage.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.bytes) == (1, 1, 1, 5)
+
+
+def test_write_through_caches_uploads(origin, make_cached):
+    storage = make_cached(write_through=True)
+    storage.save("a.txt", ContentFile(b"hello"))
+
+    assert _read(storage, "a.txt") == b"hello"
+    assert origin.reads == 0
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(origin, make_cached):
+    storage = make_cached(max_bytes=250, write_through=True)
+    for name in ("a", "b", "c"):
+        storage.save(name, ContentFile(name.encode() * 100))
+    # a and b fit the budget; c pushed out a, the least recently used
+
+    assert storage.stats().evictions == 1
+    _read(storage, "b")
+    _read(storage, "a")
+    assert origin.reads == 1
+
+
+def test_objects_over_the_size_limit_bypass_cache(origin, make_cached):
+    storage = make_cached(max_object_bytes=10)
+    storage.save("big", ContentFile(b"x" * 50))
+
+    assert _read(storage, "big") == b"x" * 50
+    assert _read(storage, "big") == b"x" * 50
+    assert origin.reads == 2
+    assert storage.stats().entries == 0
+
+
+def test_corrupt_copy_is_dropped_and_refetched(origin, make_cached, tmp_path):
+    make_cached(write_through=True).save("a.txt", ContentFile(b"hello"))
+    (copy,) = (tmp_path / "cache").glob("??/*")
+    copy.write_bytes(b"jello")
+    storage = make_cached()
+
+    assert _read(storage, "a.txt") == b"hello"
+    assert origin.reads == 1
+    assert storage.stats().corrupt == 1
+
+
+@pytest.mark.parametrize("verify, hashes", [(False, 1), (True, 3)])
+def test_copies_are_hashed_once_unless_verify(
+    monkeypatch, origin, make_cached, verify, hashes
+):
+    make_cached(write_through=True).save("a.txt", ContentFile(b"hello"))
+    storage = make_cached(verify=verify)
+    calls = []
+    monkeypatch.setattr(
+        cached, "_matches", lambda fh, expected: calls.append(expected) or True
+    )
+
+    for _ in range(3):
+        assert _read(storage, "a.txt") == b"hello"
+    assert len(calls) == hashes
+
+
+def test_delete_removes_local_copy(make_cached, tmp_path):
+    storage = make_cached(write_through=True)
+    storage.save("a.txt", ContentFile(b"hello"))
+    storage.delete("a.txt")
+
+    assert not storage.exists("a.txt")
+    assert list((tmp_path / "cache").glob("??/*")) == []
+    assert storage.stats().entries == 0
+
+
+def test_new_instance_picks_up_existing_copies(origin, make_cached):
+    make_cached(write_through=True).save("a.txt", ContentFile(b"hello"))
+    storage = make_cached()
+
+    assert storage.stats().entries == 1
+    assert _read(storage, "a.txt") == b"hello"
+    assert origin.reads == 0
+
+
+def test_wrapper_exposes_backend(origin, make_cached):
+    storage = make_cached()
+    assert unwrap_storage(storage) is origin
+    assert storage.location == origin.location
+    assert not is_s3_storage(storage)
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.files.models import SharedLink
+
+from .factories import SharedLinkFactory
+
+
+@pytest.mark.django_db
+def test_cleanup_links_deletes_expired_in_batches():
+    now = timezone.now()
+    expired = [
+        SharedLinkFactory(expires_at=now - timedelta(minutes=i + 1)) for i in range(5)
+    ]
+    active = SharedLinkFactory()
+
+    call_command("cleanup_expired_links", "--batch-size", "2")
+
+    assert not SharedLink.objects.filter(pk__in=[link.pk for link in expired]).exists()
+    assert SharedLink.objects.filter(pk=active.pk).exists()
+
+
+@pytest.mark.django_db
+def test_cleanup_links_keeps_recently_expired_within_retention(settings):
+    settings.SHARED_LINK_RETENTION_SECONDS = 3600
+    now = timezone.now()
+    recent = SharedLinkFactory(expires_at=now - timedelta(minutes=5))
+    old = SharedLinkFactory(expires_at=now - timedelta(hours=2))
+
+    call_command("cleanup_expired_links")
+
+    assert SharedLink.objects.filter(pk=recent.pk).exists()
+    assert not SharedLink.objects.filter(pk=old.pk).exists()
+
+
+@pytest.mark.django_db
+def test_cleanup_links_retention_option_overrides_setting(settings):
+    settings.SHARED_LINK_RETENTION_SECONDS = 3600
+    link = SharedLinkFactory(expires_at=timezone.now() - timedelta(minutes=5))
+
+    call_command("cleanup_expired_links", "--retention-seconds", "0")
+
+    assert not SharedLink.objects.filter(pk=link.pk).exists()
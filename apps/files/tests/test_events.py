@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.files.events import Snapshot, diff_snapshots, load_snapshot, stream_events
+from apps.files.models import UploadedFile
+
+from .factories import SharedLinkFactory, UploadedFileFactory
+
+# Helpers
+
+
+def _names(events):
+    return sorted(event.name for event in events)
+
+
+def _files_uploaded_minutes_ago(user, *minutes):
+    files = []
+    for m in minutes:
+        f = UploadedFileFactory(user=user)
+        # `uploaded_at` is set on insert
+        UploadedFile.objects.filter(pk=f.pk).update(
+            uploaded_at=timezone.now() - timedelta(minutes=m)
+        )
+        files.append(f)
+    return files
+
+
+async def _next_events(stream, create):
+    """
+    Consume the stream's preamble, make a change, and return the next chunk.
+    """
+    assert (await anext(stream)).startswith("retry:")
+    await sync_to_async(create)()
+    chunk = await anext(stream)
+    await stream.aclose()
+    return chunk
+
+
+# Tests
+
+
+def test_diff_reports_created_deleted_and_expired_files():
+    now = timezone.now()
+    later, earlier = now + timedelta(hours=1), now - timedelta(seconds=1)
+    old = Snapshot(
+        files={"kept": (now, later), "gone": (now, later), "lapsed": (now, earlier)}
+    )
+    new = Snapshot(files={"kept": (now, later), "new": (now, later)})
+
+    events = diff_snapshots(old, new, now)
+    assert _names(events) == ["file.created", "file.deleted", "file.expired"]
+
+
+@pytest.mark.django_db
+def test_snapshot_only_includes_active_rows_for_user(user):
+    now = timezone.now()
+    mine = UploadedFileFactory(user=user)
+    UploadedFileFactory(user=user, expires_at=now - timedelta(minutes=1))
+    UploadedFileFactory()  # someone else's
+
+    snapshot = async_to_sync(load_snapshot)(user.pk, now)
+    assert set(snapshot.files) == {mine.pk}
+
+
+@pytest.mark.django_db
+def test_snapshot_tracks_newest_rows_and_skips_rows_crossing_the_edge(
+    monkeypatch, user
+):
+    monkeypatch.setattr("apps.files.events.MAX_TRACKED", 2)
+    now = timezone.now()
+    newest, older, oldest = _files_uploaded_minutes_ago(user, 1, 2, 3)
+
+    before = async_to_sync(load_snapshot)(user.pk, now)
+    assert set(before.files) == {older.pk, newest.pk}
+    assert before.truncated
+
+    # `oldest` moves into view; only the deletion is news
+    newest.delete()
+    after = async_to_sync(load_snapshot)(user.pk, now)
+    assert set(after.files) == {oldest.pk, older.pk}
+    assert [e.name for e in diff_snapshots(before, after, now)] == ["file.deleted"]
+
+
+@pytest.mark.django_db
+def test_stream_reports_untracked_changes_as_files_changed(monkeypatch, settings, user):
+    monkeypatch.setattr("apps.files.events.MAX_TRACKED", 1)
+    settings.LIVE_EVENTS_POLL_SECONDS = 0
+    _, oldest = _files_uploaded_minutes_ago(user, 1, 2)
+
+    chunk = async_to_sync(_next_events)(stream_events(user.pk), oldest.delete)
+    assert chunk == "event: files.changed\ndata: {}\n\n"
+
+
+@pytest.mark.django_db
+def test_stream_emits_event_after_upload(settings, user):
+    settings.LIVE_EVENTS_POLL_SECONDS = 0
+
+    def create():
+        return UploadedFileFactory(user=user)
+
+    chunk = async_to_sync(_next_events)(stream_events(user.pk), create)
+    assert chunk.startswith("event: file.created\n")
+
+
+@pytest.mark.django_db
+def test_stream_ignores_share_link_changes(monkeypatch, settings, user):
+    monkeypatch.setattr("apps.files.events.HEARTBEAT_SECONDS", 0)
+    settings.LIVE_EVENTS_POLL_SECONDS = 0
+    f = UploadedFileFactory(user=user)
+
+    def share():
+        return SharedLinkFactory(file=f)
+
+    chunk = async_to_sync(_next_events)(stream_events(user.pk), share)
+    assert chunk == ": heartbeat\n\n"
+
+
+@pytest.mark.django_db
+def test_events_view_streams_for_logged_in_user(async_client, settings, user):
+    settings.LIVE_EVENTS_MAX_STREAM_SECONDS = 0
+    async_client.force_login(user)
+
+    resp = async_to_sync(async_client.get)(reverse("files:events"))
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/event-stream"
+    assert resp["Cache-Control"] == "no-store"
+
+
+@pytest.mark.django_db
+def test_events_view_requires_login(async_client):
+    resp = async_to_sync(async_client.get)(reverse("files:events"))
+    assert resp.status_code == 401
+
+
+@pytest.mark.django_db
+def test_events_view_refuses_wsgi(client, user):
+    client.force_login(user)
+    resp = client.get(reverse("files:events"))
+    assert resp.status_code == 501
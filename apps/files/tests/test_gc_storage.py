@@ -0,0 +1,95 @@
+import os
+import time
+from datetime import UTC, datetime
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+
+from apps.files.management.commands import gc_storage
+from apps.files.storage.listing import (
+    StoredObject,
+    iter_storage_objects,
+    iter_unreferenced,
+)
+
+from .factories import UploadedFileFactory
+
+# Helpers
+
+
+def _save_blob(name, *, age_hours=0):
+    """
+    Save a blob straight to storage, optionally back-dating its mtime.
+    """
+    name = default_storage.save(name, ContentFile(b"orphan"))
+    if age_hours:
+        ts = time.time() - age_hours * 3600
+        os.utime(default_storage.path(name), (ts, ts))
+    return name
+
+
+def _obj(name):
+    return StoredObject(name, datetime.now(tz=UTC))
+
+
+# Tests
+
+
+def test_iter_unreferenced_merges_sorted_streams():
+    objects = [_obj(n) for n in ["a", "b", "c", "d"]]
+    orphans = iter_unreferenced(objects, ["b", "bb", "d"])
+    assert [o.name for o in orphans] == ["a", "c"]
+
+
+def test_filesystem_listing_is_in_code_point_order():
+    for name in ["uploads/a/x.txt", "uploads/a-b.txt", "uploads/b.txt"]:
+        _save_blob(name)
+
+    names = [o.name for o in iter_storage_objects(default_storage, "uploads/")]
+    assert names == sorted(names)
+    assert names == ["uploads/a-b.txt", "uploads/a/x.txt", "uploads/b.txt"]
+
+
+@pytest.mark.django_db
+def test_gc_deletes_old_orphans_and_keeps_referenced_files():
+    live = UploadedFileFactory()
+    old_orphan = _save_blob("uploads/2020/01/01/old.txt", age_hours=48)
+    new_orphan = _save_blob("uploads/2020/01/01/new.txt")
+
+    call_command("gc_storage", "--prefix", "")
+
+    assert default_storage.exists(live.file.name)
+    assert not default_storage.exists(old_orphan)
+    assert default_storage.exists(new_orphan)  # still within grace period
+
+
+@pytest.mark.django_db
+def test_gc_deletes_from_storage_without_bulk_delete(monkeypatch, settings):
+    plain = FileSystemStorage(location=settings.MEDIA_ROOT)
+    monkeypatch.setattr(gc_storage, "default_storage", plain)
+    orphan = _save_blob("uploads/2020/01/01/old.txt", age_hours=48)
+
+    call_command("gc_storage")
+
+    assert not plain.exists(orphan)
+
+
+@pytest.mark.django_db
+def test_gc_quarantines_orphans():
+    orphan = _save_blob("uploads/2020/01/01/old.txt", age_hours=48)
+
+    call_command("gc_storage", "--action", "quarantine")
+
+    assert not default_storage.exists(orphan)
+    assert default_storage.exists(f"quarantine/{orphan}")
+
+
+@pytest.mark.django_db
+def test_gc_dry_run_leaves_orphans_in_place():
+    orphan = _save_blob("uploads/2020/01/01/old.txt", age_hours=48)
+
+    call_command("gc_storage", "--dry-run")
+
+    assert default_storage.exists(orphan)
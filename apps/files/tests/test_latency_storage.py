@@ -0,0 +1,72 @@
+import pytest
+from django.core.files.base import ContentFile
+
+from apps.files.storage import latency
+from apps.files.storage.latency import InjectedStorageError, LatencyStorage
+
+# Helpers
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Record requested delays instead of sleeping.
+    """
+    delays = []
+    monkeypatch.setattr(latency.time, "sleep", delays.append)
+    return delays
+
+
+# Tests
+
+
+def test_operations_are_counted_and_delayed(sleeps):
+    storage = LatencyStorage(latency={"save": 0.05, "open": 0.02})
+    name = storage.save("a.txt", ContentFile(b"hello"))
+
+    with storage.open(name) as fh:
+        assert fh.read() == b"hello"
+    assert storage.exists(name)
+    storage.delete(name)
+
+    assert storage.calls == {"save": 1, "open": 1, "exists": 1, "delete": 1}
+    assert sleeps == [0.05, 0.02]
+
+
+def test_jitter_and_failures_are_reproducible_with_a_seed(sleeps):
+    def run():
+        storage = LatencyStorage(latency=0.01, jitter=0.01, failure_rate=0.5, seed=7)
+        outcomes = []
+        for _ in range(20):
+            try:
+                storage.exists("a.txt")
+                outcomes.append(True)
+            except InjectedStorageError:
+                outcomes.append(False)
+        return outcomes
+
+    first, first_sleeps = run(), sleeps[:]
+    sleeps.clear()
+
+    assert run() == first
+    assert sleeps == first_sleeps
+    assert True in first and False in first
+    assert all(0.01 <= delay <= 0.02 for delay in sleeps)
+
+
+def test_bulk_delete_costs_one_call_only_when_configured(sleeps):
+    per_object = LatencyStorage(latency=0.01)
+    batched = LatencyStorage(latency={"delete": 0.01, "bulk_delete": 0.03})
+    for storage in (per_object, batched):
+        names = [storage.save(f"{i}.txt", ContentFile(b"x")) for i in range(3)]
+        storage.reset()
+        assert storage.bulk_delete(names) == []
+        assert not any(storage.exists(name) for name in names)
+
+    assert per_object.calls == {"delete": 3, "exists": 3}
+    assert batched.calls == {"bulk_delete": 1, "exists": 3}
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError, match="Unknown storage operations"):
+        LatencyStorage(latency={"upload": 0.1})
@@ -0,0 +1,87 @@
+"""
+EXPLAIN-based checks that hot per-user queries are served from indexes.
+
+Runs against SQLite and PostgreSQL. On PostgreSQL, sequential scans are
+disabled for the transaction so the planner's choice does not depend on
+table statistics of a near-empty test database.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.files.models import UploadedFile
+from apps.files.quota import get_user_storage_used_bytes
+
+from .factories import UploadedFileFactory
+
+# Helpers
+
+
+def _explain(sql: str) -> str:
+    """
+    Return the query plan for a raw SQL statement as a single string.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        rows = cursor.fetchall()
+    return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+
+def _explain_last_query(func) -> str:
+    """
+    Run `func` and return the plan of the last query it executed.
+    """
+    with CaptureQueriesContext(connection) as ctx:
+        func()
+    return _explain(ctx.captured_queries[-1]["sql"])
+
+
+def _assert_index_scan(plan: str, index_name: str | None = None) -> None:
+    table = UploadedFile._meta.db_table
+    if connection.vendor == "postgresql":
+        assert f"Seq Scan on {table}" not in plan, plan
+        assert "Index" in plan, plan
+    else:
+        assert f"SCAN {table}\n" not in f"{plan}\n", plan
+        assert f"SEARCH {table} USING" in plan, plan
+    if index_name:
+        assert index_name in plan, plan
+
+
+# Tests
+
+
+@pytest.fixture
+def populated_user(user):
+    UploadedFileFactory.create_batch(3, user=user)
+    UploadedFileFactory.create_batch(2)  # other owners
+    return user
+
+
+@pytest.mark.django_db
+def test_active_list_query_uses_index(populated_user):
+    qs = (
+        UploadedFile.objects.filter(user=populated_user)
+        .active()
+        .order_by("-uploaded_at", "-id")
+    )
+    plan = _explain_last_query(lambda: list(qs[:10]))
+    _assert_index_scan(plan)
+
+
+@pytest.mark.django_db
+def test_quota_sum_uses_covering_index(populated_user):
+    plan = _explain_last_query(lambda: get_user_storage_used_bytes(populated_user))
+    _assert_index_scan(plan, "files_upload_user_exp_size_idx")
+
+
+@pytest.mark.django_db
+def test_non_expiring_uploads_are_active(populated_user):
+    qs = UploadedFile.objects.filter(user=populated_user)
+    assert qs.active().count() == 3
+    assert qs.expired().count() == 0
@@ -0,0 +1,84 @@
+from boto3.s3.transfer import TransferConfig
+
+from apps.files.storage.backends import is_s3_storage
+from apps.files.storage.keys import copy_object
+from apps.files.storage.s3 import MB, TunedS3Storage
+
+# Helpers
+
+
+def _storage(**options):
+    return TunedS3Storage(
+        bucket_name="bucket", access_key="key", secret_key="secret", **options
+    )
+
+
+class FakeClient:
+    def __init__(self, head):
+        self.head = head
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": 32 * MB, **self.head}
+
+
+class FakeBucket:
+    name = "bucket"
+
+    def __init__(self, head=None):
+        self.copies = []
+        self.meta = type("Meta", (), {"client": FakeClient(head or {})})
+
+    def copy(self, source, key, ExtraArgs=None, Config=None):
+        self.copies.append((source, key, ExtraArgs, Config))
+
+
+# Tests
+
+
+def test_transfers_use_configured_part_size_and_concurrency(settings):
+    settings.AWS_S3_MULTIPART_CHUNKSIZE = 32 * MB
+    settings.AWS_S3_MAX_CONCURRENCY = 24
+    storage = _storage()
+
+    config = storage.transfer_config
+    assert config.multipart_threshold == config.multipart_chunksize == 32 * MB
+    assert config.max_request_concurrency == 24
+    assert storage.client_config.max_pool_connections == 24
+    assert storage.max_memory_size == 32 * MB
+    assert is_s3_storage(storage)
+
+
+def test_single_concurrency_disables_threads():
+    assert _storage(max_concurrency=1).transfer_config.use_threads is False
+
+
+def test_explicit_transfer_config_wins():
+    explicit = TransferConfig(max_concurrency=3)
+    assert _storage(transfer_config=explicit).transfer_config is explicit
+
+
+def test_copy_object_uses_managed_copy(monkeypatch):
+    storage = _storage(location="media")
+    bucket = FakeBucket(
+        head={
+            "ContentType": "text/plain",
+            "ContentDisposition": 'attachment; filename="a.txt"',
+            "Metadata": {"owner": "42"},
+            "ETag": '"abc"',
+        }
+    )
+    monkeypatch.setattr(TunedS3Storage, "bucket", bucket)
+
+    copy_object(storage, "old/a.txt", "uploads/ab/cd/a.txt")
+
+    ((source, key, extra_args, config),) = bucket.copies
+    assert source == {"Bucket": "bucket", "Key": "media/old/a.txt"}
+    assert key == "media/uploads/ab/cd/a.txt"
+    assert config is storage.transfer_config
+    # Multipart copies (32 MB > part size) keep only what is passed in
+    assert extra_args == {
+        "ContentType": "text/plain",
+        "ContentDisposition": 'attachment; filename="a.txt"',
+        "Metadata": {"owner": "42"},
+        "MetadataDirective": "REPLACE",
+    }
@@ -0,0 +1,107 @@
+import pytest
+from django.db import connection
+
+from apps.files.models import UploadedFile
+from apps.files.search import FTS_TABLE, search_files, uses_fts
+
+from .factories import UploadedFileFactory
+
+# Helpers
+
+
+def _search(user, term):
+    qs = UploadedFile.objects.filter(user=user)
+    return sorted(f.filename for f in search_files(qs, term))
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_search_matches_prefix_and_substring_case_insensitively(user):
+    for name in ["Report-2024.pdf", "annual_report.txt", "photo.jpg"]:
+        UploadedFileFactory(user=user, filename=name)
+
+    assert _search(user, "report") == ["Report-2024.pdf", "annual_report.txt"]
+    assert _search(user, "REP") == ["Report-2024.pdf", "annual_report.txt"]
+    assert _search(user, "pho") == ["photo.jpg"]
+
+
+@pytest.mark.django_db
+def test_search_short_terms_fall_back_to_substring_scan(user):
+    UploadedFileFactory(user=user, filename="a.md")
+    UploadedFileFactory(user=user, filename="b.txt")
+
+    assert _search(user, ".m") == ["a.md"]
+
+
+@pytest.mark.django_db
+def test_search_treats_query_syntax_literally(user):
+    UploadedFileFactory(user=user, filename='say "hi" OR bye.txt')
+    UploadedFileFactory(user=user, filename="other.txt")
+
+    assert _search(user, '"hi" OR') == ['say "hi" OR bye.txt']
+
+
+@pytest.mark.django_db
+def test_search_only_returns_own_files(user):
+    UploadedFileFactory(user=user, filename="mine.txt")
+    UploadedFileFactory(filename="theirs.txt")
+
+    assert _search(user, ".txt") == ["mine.txt"]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_rename_and_delete(user):
+    f = UploadedFileFactory(user=user, filename="draft.txt")
+
+    f.filename = "final.txt"
+    f.save()
+    assert _search(user, "draft") == []
+    assert _search(user, "final") == ["final.txt"]
+
+    UploadedFile.objects.filter(pk=f.pk).update(filename="bulk.txt")
+    assert _search(user, "bulk") == ["bulk.txt"]
+
+    f.delete()
+    assert _search(user, "bulk") == []
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not uses_fts(connection), reason="FTS5 trigram index only")
+def test_search_uses_fts_table_on_sqlite(user):
+    qs = search_files(UploadedFile.objects.filter(user=user), "report")
+    assert f"{FTS_TABLE} MATCH" in str(qs.query)
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not uses_fts(connection), reason="FTS5 trigram index only")
+def test_search_scans_for_common_terms(monkeypatch, user):
+    monkeypatch.setattr("apps.files.search.FTS_MAX_MATCHES", 1)
+    for name in ["report-1.pdf", "report-2.pdf", "photo.jpg"]:
+        UploadedFileFactory(user=user, filename=name)
+
+    qs = search_files(UploadedFile.objects.filter(user=user), "report")
+    assert f"{FTS_TABLE} MATCH" not in str(qs.query)
+    assert _search(user, "report") == ["report-1.pdf", "report-2.pdf"]
+    assert _search(user, "photo") == ["photo.jpg"]
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not uses_fts(connection), reason="FTS5 trigram index only")
+def test_search_index_survives_rowid_renumbering(user):
+    # VACUUM may renumber the rowids of a table without an integer key
+    mine = UploadedFileFactory(user=user, filename="mine-report.txt")
+    theirs = UploadedFileFactory(filename="their-notes.txt")
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE files_uploadedfile SET rowid = rowid + 1000")
+
+    assert _search(user, "report") == ["mine-report.txt"]
+
+    theirs.delete()
+    mine.filename = "ab"
+    mine.save()
+    mine.delete()
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,92 @@
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+
+from apps.files.cache import get_collection_version
+from apps.files.models import UploadedFile
+from apps.files.storage.keys import build_upload_key
+
+from .factories import UploadedFileFactory
+
+# Helpers
+
+
+def _legacy_upload(name="uploads/2025/01/31/report.PDF"):
+    """
+    Create an upload stored under the old date-based key.
+    """
+    f = UploadedFileFactory()
+    default_storage.delete(f.file.name)
+    legacy = default_storage.save(name, ContentFile(b"legacy bytes"))
+    UploadedFile.objects.filter(pk=f.pk).update(file=legacy)
+    return f.pk, legacy
+
+
+# Tests
+
+
+def test_upload_key_is_sharded_by_id_and_keeps_safe_extension():
+    file_id = uuid.UUID("abcdef00000000000000000000000000")
+    assert build_upload_key(file_id, "Report.PDF") == (
+        f"uploads/ab/cd/{file_id.hex}.pdf"
+    )
+    assert build_upload_key(file_id, "../weird.name with space").endswith(file_id.hex)
+
+
+@pytest.mark.django_db
+def test_upload_saves_without_existence_checks(monkeypatch):
+    def no_probe(self, name):
+        raise AssertionError(f"exists() called for {name}")
+
+    monkeypatch.setattr(FileSystemStorage, "exists", no_probe)
+    f = UploadedFileFactory(file__filename="notes.txt")
+
+    assert f.file.name == build_upload_key(f.pk, "notes.txt")
+    assert f.filename == "notes.txt"
+
+
+@pytest.mark.django_db
+def test_migrate_storage_keys_moves_legacy_objects():
+    pk, legacy = _legacy_upload()
+    current = UploadedFileFactory()
+
+    out = StringIO()
+    call_command("migrate_storage_keys", "--batch-size", "1", stdout=out)
+
+    f = UploadedFile.objects.get(pk=pk)
+    assert f.file.name == build_upload_key(pk, legacy)
+    assert f.file.read() == b"legacy bytes"
+    assert not default_storage.exists(legacy)
+    assert UploadedFile.objects.get(pk=current.pk).file.name == current.file.name
+    assert "Moved 1 stored uploads (0 failed)." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_migrate_storage_keys_bumps_owner_collection_version(
+    django_capture_on_commit_callbacks,
+):
+    pk, _ = _legacy_upload()
+    owner = UploadedFile.objects.get(pk=pk).user_id
+    version = get_collection_version(owner)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        call_command("migrate_storage_keys", stdout=StringIO())
+
+    assert len(callbacks) == 1
+    assert get_collection_version(owner) != version
+
+
+@pytest.mark.django_db
+def test_migrate_storage_keys_dry_run_changes_nothing():
+    pk, legacy = _legacy_upload()
+
+    out = StringIO()
+    call_command("migrate_storage_keys", "--dry-run", stdout=out)
+
+    assert UploadedFile.objects.get(pk=pk).file.name == legacy
+    assert default_storage.exists(legacy)
+    assert f"{legacy} -> " in out.getvalue()
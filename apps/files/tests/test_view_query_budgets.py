@@ -0,0 +1,79 @@
+import pytest
+from django.urls import reverse
+
+from tests.query_budget import check_query_budget
+
+from .factories import SharedLinkFactory, UploadedFileFactory
+
+AJAX = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+
+# Helpers
+
+
+@pytest.fixture(autouse=True)
+def _plain_staticfiles(settings):
+    # Full pages reference built assets missing from the test manifest
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@pytest.fixture
+def logged_in(client, user):
+    client.force_login(user)
+    return client
+
+
+def _ok(resp, code=200):
+    assert resp.status_code == code
+    return resp
+
+
+# Tests
+
+# Logged-in budgets include 2 queries for the session and user
+
+
+@pytest.mark.django_db
+def test_delete_view_budget(logged_in, user):
+    def delete(f):
+        url = reverse("files:delete_file", args=[f.pk])
+        return _ok(logged_in.post(url, {"page": 1}, **AJAX))
+
+    # Sizes span more than a page, so a row moves up to fill the gap
+    check_query_budget(
+        delete,
+        budget=7,
+        seed=lambda n: UploadedFileFactory.create_batch(n, user=user),
+        prepare=lambda: UploadedFileFactory(user=user),
+        sizes=(11, 30),
+    )
+
+
+@pytest.mark.django_db
+def test_generate_link_view_budget(logged_in, user):
+    f = UploadedFileFactory(user=user)
+    url = reverse("files:generate_link", args=[f.pk])
+
+    # First call creates the link, later calls reuse it
+    check_query_budget(lambda: _ok(logged_in.post(url)), budget=5)
+    check_query_budget(lambda: _ok(logged_in.post(url)), budget=4)
+
+
+@pytest.mark.django_db
+def test_public_share_view_budgets(client):
+    link = SharedLinkFactory()
+
+    check_query_budget(
+        lambda: _ok(client.get(reverse("files:share_page", args=[link.token]))),
+        budget=1,
+    )
+    check_query_budget(
+        lambda: _ok(
+            client.get(reverse("files:share_download", args=[link.token])), 302
+        ),
+        budget=1,
+    )
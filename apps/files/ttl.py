@@ -1,16 +1,20 @@
-from datetime import datetime
+from datetime import UTC, datetime
 
 from django.conf import settings
 from django.utils import timezone
 
+# Far-future expiry stored for uploads that never expire. Keeping the column
+# non-null lets "active" be a plain `expires_at > now` range scan.
+NEVER_EXPIRES = datetime(9999, 1, 1, tzinfo=UTC)
 
-def compute_expires_at(*, now: datetime | None = None) -> datetime | None:
+
+def compute_expires_at(*, now: datetime | None = None) -> datetime:
     """
     Return the expiration timestamp for an uploaded file based on the
-    configured TTL, or None if not configured.
+    configured TTL, or NEVER_EXPIRES if not configured.
     """
     ttl = getattr(settings, "DEFAULT_FILE_TTL_SECONDS", None)
     if not ttl:
-        return None
+        return NEVER_EXPIRES
     now = now or timezone.now()
     return now + timezone.timedelta(seconds=int(ttl))
@@ -2,6 +2,7 @@ from django.urls import path
 
 from .views import (
     DeleteFileView,
+    FileEventsView,
     GenerateLinkView,
     PublicDownloadRedirectView,
     PublicDownloadView,
@@ -18,4 +19,5 @@ urlpatterns = [
         name="share_download",
     ),
     path("delete/<uuid:file_id>/", DeleteFileView.as_view(), name="delete_file"),
+    path("events/", FileEventsView.as_view(), name="events"),
 ]
@@ -3,19 +3,27 @@ from datetime import timedelta
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.files.storage import default_storage
-from django.http import HttpResponse, HttpResponseRedirect
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.http import require_POST
-from storages.backends.s3boto3 import S3Boto3Storage
 
+from apps.core.mixins import FileListMixin
 from apps.core.utils.request import is_ajax
 
+from .events import stream_events
 from .mixins import SharedLinkLookupMixin, SharedLinkPresignMixin
 from .models import SharedLink, UploadedFile
+from .storage.backends import is_s3_storage
 
 
 class GenerateLinkView(LoginRequiredMixin, View):
@@ -46,12 +54,14 @@ class GenerateLinkView(LoginRequiredMixin, View):
 
 
 @method_decorator(require_POST, name="dispatch")
-class DeleteFileView(LoginRequiredMixin, View):
+class DeleteFileView(LoginRequiredMixin, FileListMixin, View):
     """
     Deletes a user-owned file (POST only).
 
-    AJAX returns 204 on success or 404 if missing;
-    non-AJAX redirects with a flash message.
+    AJAX returns a JSON delta for the dashboard page given in `page`: the
+    removed id, updated counts and pagination, and the row (if any) that
+    moves up from the next page to fill the gap; 404 if missing.
+    Non-AJAX redirects with a flash message.
     """
 
     def post(self, request, file_id):
@@ -63,13 +73,54 @@ class DeleteFileView(LoginRequiredMixin, View):
             messages.error(request, "File not found or not owned by you.")
             return redirect("core:dashboard")
 
+        obj_id = str(obj.pk)
         obj.delete()
         if is_ajax(request):
-            return HttpResponse(status=204)
+            page = self._page(request, request.POST.get("page", 1))
+            fill = self._fill_row(page)
+            return JsonResponse(
+                {
+                    "success": True,
+                    "id": obj_id,
+                    "fill_html": self._row_html(request, fill) if fill else "",
+                    "pagination_html": self._pagination_html(request, page),
+                    **self._counts(page),
+                }
+            )
         messages.success(request, "File deleted.")
         return redirect("core:dashboard")
 
 
+class FileEventsView(View):
+    """
+    Streams live change events for the current user's files (SSE).
+
+    Needs the ASGI app: WSGI servers (including runserver) buffer the
+    stream until it ends and hold a worker meanwhile, so they get 501,
+    which stops EventSource from reconnecting. Each stream ends after
+    LIVE_EVENTS_MAX_STREAM_SECONDS and the browser reconnects.
+    """
+
+    http_method_names = ["get"]
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(
+                "Live events need the ASGI app.", status=501, content_type="text/plain"
+            )
+
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponse(status=401)
+
+        resp = StreamingHttpResponse(
+            stream_events(user.pk), content_type="text/event-stream"
+        )
+        resp["Cache-Control"] = "no-store"
+        resp["X-Accel-Buffering"] = "no"  # disable proxy buffering (nginx)
+        return resp
+
+
 class PublicDownloadView(SharedLinkLookupMixin, View):
     """
     Renders the public download page for a shared link.
@@ -118,7 +169,7 @@ class PublicDownloadRedirectView(SharedLinkLookupMixin, SharedLinkPresignMixin,
 
         # S3-specific kwargs for presigning
         url_kwargs = {}
-        if isinstance(default_storage, S3Boto3Storage):
+        if is_s3_storage(default_storage):
             url_kwargs = {
                 "expire": self.expires_in_seconds(link),
                 "parameters": self.response_headers(uploaded.filename),
@@ -0,0 +1,54 @@
+"""
+JWT authentication that resolves users through a short-lived cache.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import cache_user, get_cached_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Drop-in replacement for `JWTAuthentication` that caches the user row.
+
+    Steady-state requests authenticate without a user query. The active
+    and password-change checks still run against the cached user on every
+    request, and signals evict the entry when the user changes.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        cached = get_cached_user(user_id)
+        if cached is None:
+            # Loads and checks the user; only users that pass are cached
+            user = super().get_user(validated_token)
+            cache_user(user)
+            return user
+
+        user, password_digest = cached
+        self.check_user(user, password_digest, validated_token)
+        return user
+
+    def check_user(self, user, password_digest, validated_token) -> None:
+        """
+        Repeat SimpleJWT's per-request user checks for a cached user.
+
+        `password_digest` is the cached revocation digest of the user's
+        password hash, which the cache does not hold.
+        """
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_digest
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
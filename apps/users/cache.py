@@ -0,0 +1,88 @@
+"""
+Cache helpers for users.
+
+Users resolved from JWT access tokens are cached briefly. Entries are
+dropped whenever the user row or its group/permission memberships change,
+and otherwise expire after JWT_USER_CACHE_SECONDS, which also bounds
+staleness from writes that skip signals (queryset `update()`) or happen in
+processes that do not share the cache.
+
+Entries hold plain field values, never the password hash. The revocation
+digest SimpleJWT compares tokens against is cached in its place.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def _user_key(user_id) -> str:
+    return f"users:auth:{user_id}"
+
+
+def _cached_fields(model) -> list[str]:
+    return [f.attname for f in model._meta.concrete_fields if f.attname != "password"]
+
+
+def get_cached_user(user_id):
+    """
+    Return `(user, password_digest)` for `user_id`, or None on a miss.
+
+    The user's `password` is deferred, so reading it loads it from the
+    database.
+    """
+    entry = cache.get(_user_key(user_id))
+    if entry is None:
+        return None
+
+    model = get_user_model()
+    fields = _cached_fields(model)
+    values = entry["fields"]
+    if list(values) != fields:
+        # Cached before a field was added or removed
+        return None
+    return model.from_db("default", fields, list(values.values())), entry["digest"]
+
+
+def cache_user(user) -> None:
+    """
+    Cache a freshly loaded user under its primary key.
+    """
+    entry = {
+        "fields": {name: getattr(user, name) for name in _cached_fields(type(user))},
+        "digest": get_md5_hash_password(user.password),
+    }
+    cache.set(_user_key(user.pk), entry, settings.JWT_USER_CACHE_SECONDS)
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Drop a user's cached entry now and again on commit.
+
+    The second delete stops a request that read the old row before the
+    commit from re-caching it under the same key.
+    """
+    key = _user_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def record_login(user, now=None) -> bool:
+    """
+    Set `last_login` at most once per LAST_LOGIN_UPDATE_INTERVAL_SECONDS.
+
+    Clients that fetch tokens in a loop would otherwise write the user row
+    on every call. A cache key marks the interval as recorded. The write is
+    a queryset update, so it doesn't evict the cached user (a `last_login`
+    that is one interval old is fine there). Returns whether it wrote.
+    """
+    interval = settings.LAST_LOGIN_UPDATE_INTERVAL_SECONDS
+    if not cache.add(f"users:last_login:{user.pk}", True, interval):
+        return False
+
+    user.last_login = now or timezone.now()
+    type(user).objects.filter(pk=user.pk).update(last_login=user.last_login)
+    return True
@@ -86,12 +86,11 @@ class SignUpForm(AuthTailwindFormMixin, PasswordConfirmMixin, forms.ModelForm):
                 attrs={"placeholder": _("Name"), "autocomplete": "name"}
             ),
         }
-
-    def clean_email(self):
-        email = self.cleaned_data["email"]
-        if User.objects.filter(email__iexact=email).exists():
-            raise forms.ValidationError(_("An account with this email already exists."))
-        return email
+        # The model lowercases the email in clean(), so the unique check is
+        # a single exact lookup on the email index
+        error_messages = {
+            "email": {"unique": _("An account with this email already exists.")}
+        }
 
 
 class EmailLoginForm(AuthTailwindFormMixin, AuthenticationForm):
@@ -0,0 +1,140 @@
+"""
+Password hashing behind a process-wide concurrency gate.
+
+Each PBKDF2 hash or verification burns tens of milliseconds of CPU. A
+burst of login or signup attempts could otherwise occupy every worker and
+starve unrelated endpoints. At most PASSWORD_HASH_CONCURRENCY hashes run
+at once per process; callers wait up to PASSWORD_HASH_WAIT_SECONDS for a
+slot and then fail with `HashingGateBusy`, which `HashingGateMiddleware`
+turns into 503 + Retry-After. While the gate is in use, each process logs
+its queue depth at most once a minute.
+"""
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between queue depth reports
+STATS_LOG_SECONDS = 60
+
+
+class HashingGateBusy(Exception):
+    """
+    No hashing slot became free within the wait timeout.
+    """
+
+    retry_after = 1  # seconds
+
+
+@dataclass(frozen=True)
+class GateStats:
+    limit: int
+    active: int
+    waiting: int
+    rejected: int  # since process start
+
+
+class HashingGate:
+    """
+    A bounded semaphore that tracks how many callers hold or await a slot.
+    """
+
+    def __init__(self, limit: int, timeout: float):
+        self.limit, self.timeout = limit, timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._active = self._waiting = self._rejected = 0
+        self._peak_waiting = 0
+        self._last_report = None
+
+    def stats(self) -> GateStats:
+        with self._lock:
+            return GateStats(self.limit, self._active, self._waiting, self._rejected)
+
+    def report(self) -> None:
+        """
+        Log the gate's stats, and the most callers seen waiting since the
+        last report, unless a report was logged in the last minute.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._last_report is not None and (
+                now - self._last_report < STATS_LOG_SECONDS
+            ):
+                return
+            self._last_report = now
+            stats = GateStats(self.limit, self._active, self._waiting, self._rejected)
+            peak, self._peak_waiting = self._peak_waiting, self._waiting
+        logger.info(
+            "hashing_gate limit=%d active=%d waiting=%d peak_waiting=%d rejected=%d",
+            stats.limit,
+            stats.active,
+            stats.waiting,
+            peak,
+            stats.rejected,
+        )
+
+    @contextmanager
+    def slot(self):
+        with self._lock:
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+        try:
+            acquired = self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                if acquired:
+                    self._active += 1
+                else:
+                    self._rejected += 1
+
+        if not acquired:
+            stats = self.stats()
+            logger.warning(
+                "Password hashing gate full: limit=%d active=%d waiting=%d "
+                "rejected=%d",
+                stats.limit,
+                stats.active,
+                stats.waiting,
+                stats.rejected,
+            )
+            self.report()
+            raise HashingGateBusy
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+            self.report()
+
+
+@functools.cache
+def get_hashing_gate() -> HashingGate:
+    return HashingGate(
+        settings.PASSWORD_HASH_CONCURRENCY, settings.PASSWORD_HASH_WAIT_SECONDS
+    )
+
+
+class GatedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's default PBKDF2 hasher, run through the hashing gate.
+
+    `verify()` and `harden_runtime()` hash through `encode()`, so gating
+    it covers logins, signups and password changes. The algorithm name is
+    unchanged, so existing hashes keep verifying.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        with get_hashing_gate().slot():
+            return super().encode(password, salt, iterations)
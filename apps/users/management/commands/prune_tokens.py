@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of outstanding tokens deleted per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options["batch_size"]
+
+        # Walk the primary key so each batch resumes where the last one
+        # stopped; expires_at has no index to seek on
+        deleted = {OutstandingToken: 0, BlacklistedToken: 0}
+        last_pk = 0
+        while True:
+            batch = list(
+                OutstandingToken.objects.filter(pk__gt=last_pk, expires_at__lte=now)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+
+            # One short transaction per batch keeps row locks brief; blacklist
+            # rows go with their outstanding token (cascade)
+            with transaction.atomic():
+                _, per_model = OutstandingToken.objects.filter(pk__in=batch).delete()
+            for model in deleted:
+                deleted[model] += per_model.get(model._meta.label, 0)
+            last_pk = batch[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted[OutstandingToken]} outstanding and "
+                f"{deleted[BlacklistedToken]} blacklisted expired tokens."
+            )
+        )
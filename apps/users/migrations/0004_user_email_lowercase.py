@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    clashes = list(
+        User.objects.values(lower=Lower("email"))
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+        .values_list("lower", flat=True)
+    )
+    if clashes:
+        raise RuntimeError(
+            "Cannot lowercase emails; these addresses differ only by case: "
+            + ", ".join(sorted(clashes))
+            + ". Merge or rename those accounts, then migrate again."
+        )
+    User.objects.exclude(email=Lower("email")).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0003_alter_user_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("email", django.db.models.functions.text.Lower("email"))
+                ),
+                name="users_user_email_lowercase",
+            ),
+        ),
+    ]
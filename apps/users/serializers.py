@@ -0,0 +1,44 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .cache import record_login
+from .tokens import IndexedRefreshToken, blacklist_index
+
+
+class CoalescedLoginTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token obtain that updates `last_login` at most once per interval.
+
+    Replaces SimpleJWT's UPDATE_LAST_LOGIN, which writes on every call.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        record_login(self.user)
+        return data
+
+
+class IndexedTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = IndexedRefreshToken
+
+
+class IndexedTokenVerifySerializer(TokenVerifySerializer):
+    """
+    Token verification that checks the blacklist through the in-process index.
+    """
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if (
+            api_settings.BLACKLIST_AFTER_ROTATION
+            and token.get(api_settings.JTI_CLAIM) in blacklist_index
+        ):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        return {}
@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    """
+    Evict the cached user after any save (deactivation, password or staff
+    changes) or delete.
+    """
+    invalidate_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_on_permission_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Evict cached users whose groups or direct permissions changed.
+
+    Changes made from the group/permission side list the affected users in
+    `pk_set`, except `clear()`, whose members are read before they go.
+    """
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_user(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        for user_id in pk_set:
+            invalidate_user(user_id)
+    elif action == "pre_clear":
+        for user_id in instance.user_set.values_list("pk", flat=True):
+            invalidate_user(user_id)
@@ -1 +1,184 @@
-# Create your tests here.
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.middleware import HashingGateMiddleware
+from tests.auth_url_helpers import jwt_obtain_pair_url
+from tests.factories import PASSWORD, UserFactory
+
+from . import hashers
+from .cache import record_login
+from .forms import EmailLoginForm, SignUpForm
+from .hashers import HashingGate, HashingGateBusy
+from .models import User
+
+# Helpers
+
+BEFORE = [("users", "0003_alter_user_name")]
+AFTER = [("users", "0004_user_email_lowercase")]
+
+
+@pytest.fixture
+def full_gate(monkeypatch):
+    """
+    Install a one-slot hashing gate that is already taken.
+    """
+    gate = HashingGate(limit=1, timeout=0)
+    monkeypatch.setattr(hashers, "get_hashing_gate", lambda: gate)
+    with gate.slot():
+        yield gate
+
+
+def _migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_create_user_stores_lowercase_email():
+    user = User.objects.create_user(" Ada@Example.COM ", password=PASSWORD)
+    assert user.email == "ada@example.com"
+    assert User.objects.get_by_natural_key("ADA@example.com") == user
+
+
+@pytest.mark.django_db
+def test_login_is_case_insensitive(rf):
+    user = UserFactory()
+    data = {"username": user.email.upper(), "password": PASSWORD}
+    form = EmailLoginForm(rf.post("/"), data=data)
+    assert form.is_valid(), form.errors
+    assert form.get_user() == user
+
+
+@pytest.mark.django_db
+def test_signup_rejects_email_differing_by_case_with_one_lookup():
+    user = UserFactory()
+    data = {
+        "email": user.email.upper(),
+        "name": "Dup",
+        "password1": "S3cure-pass!",
+        "password2": "S3cure-pass!",
+    }
+    form = SignUpForm(data=data)
+    with CaptureQueriesContext(connection) as ctx:
+        assert not form.is_valid()
+    assert form.errors["email"] == ["An account with this email already exists."]
+
+    # An exact match the unique index can answer (no UPPER()/LOWER() on the column)
+    lookups = [q["sql"] for q in ctx.captured_queries if '"users_user"' in q["sql"]]
+    assert len(lookups) == 1
+    assert '"users_user"."email" = ' in lookups[0]
+
+
+@pytest.mark.django_db
+def test_token_obtain_records_last_login_once_per_interval(api_client, user):
+    creds = {"email": user.email, "password": PASSWORD}
+
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(3):
+            assert api_client.post(jwt_obtain_pair_url(), creds).status_code == 200
+    writes = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    assert len(writes) == 1
+
+    user.refresh_from_db()
+    assert user.last_login is not None
+
+
+@pytest.mark.django_db
+def test_record_login_writes_again_after_interval(settings, user):
+    settings.LAST_LOGIN_UPDATE_INTERVAL_SECONDS = 0
+    assert record_login(user)
+    assert record_login(user)
+
+    settings.LAST_LOGIN_UPDATE_INTERVAL_SECONDS = 60
+    assert record_login(user)
+    assert not record_login(user)
+
+
+def test_hashing_gate_rejects_when_full_and_counts():
+    gate = HashingGate(limit=1, timeout=0.01)
+    with gate.slot():
+        with pytest.raises(HashingGateBusy):
+            with gate.slot():
+                pass
+        assert gate.stats().active == 1
+    stats = gate.stats()
+    assert (stats.active, stats.waiting, stats.rejected) == (0, 0, 1)
+
+
+def test_hashing_gate_logs_queue_depth_at_most_once_a_minute(caplog):
+    gate = HashingGate(limit=1, timeout=0.01)
+
+    with caplog.at_level("INFO", logger="apps.users.hashers"):
+        with gate.slot():
+            with pytest.raises(HashingGateBusy), gate.slot():
+                pass
+        with gate.slot():
+            pass
+
+    reports = [r.getMessage() for r in caplog.records if r.levelname == "INFO"]
+    assert reports == [
+        "hashing_gate limit=1 active=1 waiting=0 peak_waiting=1 rejected=1"
+    ]
+
+
+@pytest.mark.django_db
+def test_token_obtain_returns_503_when_hashing_gate_full(api_client, user, full_gate):
+    creds = {"email": user.email, "password": PASSWORD}
+    # The default of curl, requests and most HTTP libraries
+    resp = api_client.post(jwt_obtain_pair_url(), creds, HTTP_ACCEPT="*/*")
+    assert resp.status_code == 503
+    assert resp["Retry-After"] == "1"
+    assert "detail" in resp.json()
+    assert full_gate.stats().rejected == 1
+
+
+@pytest.mark.django_db
+def test_login_page_returns_503_when_hashing_gate_full(client, user, full_gate):
+    data = {"username": user.email, "password": PASSWORD}
+    resp = client.post(reverse("users:login"), data, HTTP_ACCEPT="text/html")
+    assert resp.status_code == 503
+    assert resp["Content-Type"].startswith("text/plain")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_returns_503_under_asgi_when_hashing_gate_full(
+    async_client, user, full_gate
+):
+    # Each ASGI request runs its sync code in its own thread, hence the
+    # committed (transactional) user
+    async_view = sync_to_async(lambda request: None)
+    assert iscoroutinefunction(HashingGateMiddleware(async_view))
+
+    creds = {"email": user.email, "password": PASSWORD}
+    resp = async_to_sync(async_client.post)(
+        jwt_obtain_pair_url(), creds, content_type="application/json"
+    )
+    assert resp.status_code == 503
+    assert resp["Retry-After"] == "1"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_lowercases_emails_and_refuses_clashes():
+    old_apps = _migrate(BEFORE)
+    OldUser = old_apps.get_model("users", "User")
+    OldUser.objects.create(email="Mixed@Example.com", password="-")
+    _migrate(AFTER)
+    assert User.objects.get().email == "mixed@example.com"
+
+    old_apps = _migrate(BEFORE)
+    OldUser = old_apps.get_model("users", "User")
+    OldUser.objects.create(email="MIXED@example.com", password="-")
+    with pytest.raises(RuntimeError, match="mixed@example.com"):
+        _migrate(AFTER)
+    _migrate(BEFORE)  # leave the schema migrated for later tests
+    OldUser.objects.all().delete()
+    _migrate(AFTER)
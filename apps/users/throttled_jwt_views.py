@@ -9,6 +9,12 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from .serializers import (
+    CoalescedLoginTokenObtainPairSerializer,
+    IndexedTokenRefreshSerializer,
+    IndexedTokenVerifySerializer,
+)
+
 
 @extend_schema(
     tags=["Authentication"],
@@ -16,6 +22,7 @@ from rest_framework_simplejwt.views import (
 )
 class ThrottledTokenObtainPairView(TokenObtainPairView):
     throttle_scope = "auth:token"
+    serializer_class = CoalescedLoginTokenObtainPairSerializer
 
 
 @extend_schema(
@@ -24,6 +31,7 @@ class ThrottledTokenObtainPairView(TokenObtainPairView):
 )
 class ThrottledTokenRefreshView(TokenRefreshView):
     throttle_scope = "auth:refresh"
+    serializer_class = IndexedTokenRefreshSerializer
 
 
 @extend_schema(
@@ -32,3 +40,4 @@ class ThrottledTokenRefreshView(TokenRefreshView):
 )
 class ThrottledTokenVerifyView(TokenVerifyView):
     throttle_scope = "auth:verify"
+    serializer_class = IndexedTokenVerifySerializer
@@ -0,0 +1,108 @@
+"""
+In-process index of blacklisted refresh tokens.
+
+Each process keeps the unexpired blacklisted JTIs in a dict and extends it
+incrementally by primary key, so blacklist checks are dictionary lookups
+instead of a join against a table that grows with every refresh. A shared
+cache counter tells other processes when to sync; without a shared cache,
+they sync every TOKEN_BLACKLIST_SYNC_SECONDS.
+
+Rotation stays authoritative: blacklisting a token that is already
+blacklisted fails, so a replayed refresh token is rejected even by a
+process whose index is behind.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+_VERSION_KEY = "users:blacklist:version"
+
+
+class BlacklistIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget everything loaded so far; the next check re-reads the table.
+        """
+        with self._lock:
+            self._expiry: dict[str, float] = {}  # jti -> exp (epoch seconds)
+            self._high_water = 0  # largest BlacklistedToken pk loaded
+            self._version = None
+            self._synced_at = float("-inf")
+
+    def __contains__(self, jti) -> bool:
+        self.sync()
+        exp = self._expiry.get(jti)
+        return exp is not None and exp > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def sync(self, force: bool = False) -> None:
+        """
+        Load blacklist rows added since the last sync, if any may exist.
+        """
+        version = cache.get(_VERSION_KEY)
+        interval = settings.TOKEN_BLACKLIST_SYNC_SECONDS
+        if (
+            not force
+            and version == self._version
+            and time.monotonic() - self._synced_at < interval
+        ):
+            return
+
+        with self._lock:
+            rows = (
+                BlacklistedToken.objects.filter(pk__gt=self._high_water)
+                .order_by("pk")
+                .values_list("pk", "token__jti", "token__expires_at")
+            )
+            now = time.time()
+            for pk, jti, expires_at in rows:
+                self._expiry[jti] = expires_at.timestamp()
+                self._high_water = pk
+            # Expired tokens fail verification anyway; keep the dict compact
+            self._expiry = {j: exp for j, exp in self._expiry.items() if exp > now}
+            self._version, self._synced_at = version, time.monotonic()
+
+    def add(self, jti: str, exp: float) -> None:
+        """
+        Record a token this process just blacklisted and tell the others.
+        """
+        self._expiry[jti] = exp
+        try:
+            cache.incr(_VERSION_KEY)
+        except ValueError:
+            cache.set(_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+blacklist_index = BlacklistIndex()
+
+
+class IndexedRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check uses the in-process index.
+    """
+
+    def check_blacklist(self) -> None:
+        if self.payload[api_settings.JTI_CLAIM] in blacklist_index:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted, created = super().blacklist()
+        if not created:
+            # Another request already rotated this token
+            raise TokenError(_("Token is blacklisted"))
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        return blacklisted, created
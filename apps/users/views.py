@@ -15,8 +15,9 @@ class SignUpView(CreateView):
     success_url = reverse_lazy("users:login")
 
     def form_valid(self, form):
-        form.save()
+        # Saves the form (hashing the password once)
+        response = super().form_valid(form)
         messages.success(
             self.request, "Your account was created successfully. You can log in now."
         )
-        return super().form_valid(form)
+        return response
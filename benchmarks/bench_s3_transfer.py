@@ -0,0 +1,124 @@
+"""
+Benchmark S3 upload and download throughput against transfer concurrency.
+
+Saves and reads back objects of each size through `TunedS3Storage`, once
+per concurrency level, and prints MB/s for each. Runs against any S3 API:
+pass `--endpoint-url` for a local stand-in such as MinIO, or install moto
+(`pip install "moto[server]"`) and one is started in-process.
+
+Usage:
+    python benchmarks/bench_s3_transfer.py [--sizes 10,100,1000]
+        [--concurrency 1,2,4,8,16] [--chunk-mb 16] [--endpoint-url URL]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.files import File  # noqa: E402
+
+from apps.files.storage.s3 import MB, TunedS3Storage  # noqa: E402
+
+READ_CHUNK = 1 * MB
+
+
+def int_list(value: str) -> list[int]:
+    return [int(x) for x in value.split(",") if x.strip()]
+
+
+def start_stand_in() -> str:
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        sys.exit("Pass --endpoint-url, or install moto[server] for a local S3.")
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # request log
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    return f"http://{host}:{port}"
+
+
+def make_payload(directory: str, size_mb: int) -> Path:
+    path = Path(directory) / f"{size_mb}mb.bin"
+    with path.open("wb") as fh:
+        for _ in range(size_mb):
+            fh.write(os.urandom(MB))
+    return path
+
+
+def timed(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int_list, default=[10, 100, 1000])
+    parser.add_argument("--concurrency", type=int_list, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--endpoint-url")
+    parser.add_argument("--bucket", default="bench-transfer")
+    args = parser.parse_args()
+
+    endpoint = args.endpoint_url or start_stand_in()
+    options = {
+        "bucket_name": args.bucket,
+        "endpoint_url": endpoint,
+        "access_key": os.environ.get("AWS_ACCESS_KEY_ID", "bench"),
+        "secret_key": os.environ.get("AWS_SECRET_ACCESS_KEY", "bench"),
+        "region_name": "us-east-1",
+        "location": f"bench/{uuid.uuid4().hex}",
+        "file_overwrite": True,
+        "multipart_chunksize": args.chunk_mb * MB,
+    }
+    setup = TunedS3Storage(**options)
+    if setup.bucket.creation_date is None:
+        setup.bucket.create()
+
+    print(f"{endpoint}, {args.chunk_mb} MB parts\n")
+    print(f"{'size MB':>8}{'threads':>9}{'put MB/s':>10}{'get MB/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes:
+            payload = make_payload(tmp, size_mb)
+            for concurrency in args.concurrency:
+                storage = TunedS3Storage(**options, max_concurrency=concurrency)
+                name = f"{size_mb}mb-{concurrency}"
+
+                def put(storage=storage, name=name, payload=payload):
+                    with payload.open("rb") as fh:
+                        storage.save(name, File(fh))
+
+                def get(storage=storage, name=name):
+                    with storage.open(name) as fh:
+                        while fh.read(READ_CHUNK):
+                            pass
+
+                put_s, get_s = timed(put, args.repeat), timed(get, args.repeat)
+                storage.delete(name)
+                print(
+                    f"{size_mb:>8}{concurrency:>9}"
+                    f"{size_mb / put_s:>10.1f}{size_mb / get_s:>10.1f}"
+                )
+            payload.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark filename search for a user with many files.
+
+Builds a throwaway test database, fills it with one user's files and times
+the path `search_files` picks ("auto") against the FTS5 index alone and a
+plain `icontains` scan, for the first page of results and for the COUNT(*)
+that page-number pagination adds. Exits non-zero if the picked path is
+clearly slower than the best of the two for any term.
+
+Usage:
+    python benchmarks/bench_search.py [--files 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.files.models import UploadedFile  # noqa: E402
+from apps.files.search import (  # noqa: E402
+    MIN_TRIGRAM_LENGTH,
+    analyze_search_table,
+    search_files,
+    search_fts,
+    uses_fts,
+)
+
+WORDS = ["invoice", "report", "photo", "scan", "draft", "backup", "notes", "slide"]
+TERMS = ["invoice", "port-12", "99.pdf", "zzz-no-match", "ph"]
+# Allowed slack for the picked path over the best one: factor, plus ms
+TOLERANCE = (1.5, 2.0)
+
+
+def populate(user, count: int, batch: int = 5000) -> None:
+    for start in range(0, count, batch):
+        UploadedFile.objects.bulk_create(
+            UploadedFile(
+                id=uuid.uuid4(),
+                user=user,
+                file=f"uploads/bench/{i}",
+                filename=f"{WORDS[i % len(WORDS)]}-{i}.pdf",
+                size=1024,
+            )
+            for i in range(start, min(start + batch, count))
+        )
+
+
+def timed(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = get_user_model().objects.create_user(
+            email="bench@example.com", password="bench-password"
+        )
+        start = time.perf_counter()
+        populate(user, args.files)
+        analyze_search_table(connection)
+        print(
+            f"{connection.vendor}: {args.files} files "
+            f"in {time.perf_counter() - start:.1f}s\n"
+        )
+
+        base = UploadedFile.objects.filter(user=user).active()
+        ordered = base.order_by("-uploaded_at", "-id")
+        print(f"{'term':<14}{'path':<10}{'page ms':>10}{'count ms':>10}{'hits':>8}")
+        regressions = []
+        for term in TERMS:
+            paths = {
+                # Includes the probe that picks the path
+                "auto": lambda term=term: search_files(ordered, term),
+                "scan": lambda term=term: ordered.filter(filename__icontains=term),
+            }
+            if uses_fts(connection) and len(term) >= MIN_TRIGRAM_LENGTH:
+                paths["indexed"] = lambda term=term: search_fts(ordered, term)
+            totals = {}
+            for path, build in paths.items():
+                page_ms = timed(lambda build=build: list(build()[:10]), args.repeat)
+                count_ms = timed(lambda build=build: build().count(), args.repeat)
+                totals[path] = page_ms + count_ms
+                print(
+                    f"{term:<14}{path:<10}{page_ms:>10.2f}{count_ms:>10.2f}"
+                    f"{build().count():>8}"
+                )
+            best = min(totals.values())
+            factor, slack = TOLERANCE
+            if totals["auto"] > best * factor + slack:
+                regressions.append(term)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if regressions:
+        sys.exit(f"search_files picked a slow path for: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark file list serialization cost per 100 rows.
+
+Compares the full `UploadedFileReadUpdateSerializer` with the lean
+`UploadedFileRowSerializer`, for all fields and for a sparse `id,filename`
+fieldset. Rows are unsaved model instances, so no database is needed.
+
+Usage:
+    python benchmarks/bench_serializers.py [--rows 100] [--repeat 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from apps.files.api.serializers import (  # noqa: E402
+    UploadedFileReadUpdateSerializer,
+    UploadedFileRowSerializer,
+)
+from apps.files.models import UploadedFile  # noqa: E402
+
+
+def make_rows(count: int) -> list[UploadedFile]:
+    now = timezone.now()
+    return [
+        UploadedFile(
+            id=uuid.uuid4(),
+            filename=f"report-{i}.pdf",
+            size=1024 * i,
+            file=f"uploads/bench/report-{i}.pdf",
+            uploaded_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    request = APIRequestFactory().get(
+        "/api/v1/files/", HTTP_HOST=settings.ALLOWED_HOSTS[0]
+    )
+    cases = {
+        "model serializer": (UploadedFileReadUpdateSerializer, None),
+        "row serializer": (UploadedFileRowSerializer, None),
+        "row, id+filename": (UploadedFileRowSerializer, ("id", "filename")),
+    }
+
+    print(f"{'serializer':<20}{f'ms / {args.rows} rows':>16}")
+    for label, (cls, fields) in cases.items():
+        context = {"request": request, "fields": fields}
+
+        def run(cls=cls, context=context):
+            return cls(rows, many=True, context=context).data
+
+        print(f"{label:<20}{timed(run, args.repeat):>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark storage-bound code paths against simulated storage latency.
+
+Media storage is replaced by `LatencyStorage`, which keeps objects in memory
+and delays each call, so results depend on round trips rather than on the
+network. Reports, for each scenario, wall time and storage calls made:
+
+- cleanup: `cleanup_expired_uploads` with per-object deletes and with a
+  batch delete API
+- download: reading the same objects twice, straight from storage and
+  through the local disk cache
+
+Usage:
+    python benchmarks/bench_storage_latency.py [--files 200] [--latency-ms 20]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.files.base import ContentFile  # noqa: E402
+from django.core.files.storage import default_storage  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.files.models import UploadedFile  # noqa: E402
+from apps.files.storage.cached import CachedStorage  # noqa: E402
+from apps.files.storage.keys import build_upload_key  # noqa: E402
+from apps.files.storage.latency import LatencyStorage  # noqa: E402
+
+PAYLOAD = b"x" * 4096
+
+
+def latency_storages(options: dict) -> dict:
+    return {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "apps.files.storage.latency.LatencyStorage",
+            "OPTIONS": options,
+        },
+    }
+
+
+def populate(user, count: int) -> None:
+    expired = timezone.now() - timedelta(minutes=1)
+    rows = []
+    for _ in range(count):
+        file_id = uuid.uuid4()
+        key = default_storage.save(
+            build_upload_key(file_id, "a.bin"), ContentFile(PAYLOAD)
+        )
+        rows.append(
+            UploadedFile(
+                id=file_id,
+                user=user,
+                file=key,
+                filename=f"{file_id.hex}.bin",
+                size=len(PAYLOAD),
+                expires_at=expired,
+            )
+        )
+    UploadedFile.objects.bulk_create(rows)
+
+
+def report(label: str, seconds: float, storage: LatencyStorage) -> None:
+    calls = ", ".join(f"{op}={n}" for op, n in sorted(storage.calls.items()))
+    print(f"{label:<32}{seconds * 1000:>10.0f} ms   {calls}")
+
+
+def bench_cleanup(user, count: int, latency: float) -> None:
+    scenarios = {
+        "cleanup, per-object deletes": {"delete": latency},
+        "cleanup, batch delete API": {"delete": latency, "bulk_delete": latency},
+    }
+    for label, delays in scenarios.items():
+        with override_settings(STORAGES=latency_storages({"latency": delays})):
+            populate(user, count)
+            storage = default_storage._wrapped
+            storage.reset()
+            start = time.perf_counter()
+            call_command("cleanup_expired_uploads", stdout=io.StringIO())
+            report(label, time.perf_counter() - start, storage)
+
+
+def bench_download(count: int, latency: float) -> None:
+    names = [f"uploads/bench/{i}" for i in range(count)]
+
+    def read_all(storage):
+        for name in names:
+            with storage.open(name) as fh:
+                fh.read()
+
+    origin = LatencyStorage(latency={"open": latency})
+    for name in names:
+        origin.save(name, ContentFile(PAYLOAD))
+
+    origin.reset()
+    start = time.perf_counter()
+    read_all(origin)
+    read_all(origin)
+    report("download x2, direct", time.perf_counter() - start, origin)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = CachedStorage(
+            origin, cache_dir=cache_dir, max_bytes=count * len(PAYLOAD) * 2
+        )
+        origin.reset()
+        start = time.perf_counter()
+        read_all(cached)
+        read_all(cached)
+        report("download x2, disk cache", time.perf_counter() - start, origin)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = get_user_model().objects.create_user(
+            email="bench@example.com", password="bench-password"
+        )
+        print(f"{args.files} objects, {args.latency_ms:g} ms per storage call\n")
+        bench_cleanup(user, args.files, latency)
+        bench_download(args.files, latency)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
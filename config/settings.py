@@ -1,3 +1,5 @@
+import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -97,6 +99,43 @@ DEFAULT_FILE_TTL_SECONDS = config(
     cast=int,
 )
 
+# How long expired or revoked share links are kept (so they keep returning
+# 410 Gone) before `cleanup_expired_links` deletes them
+SHARED_LINK_RETENTION_SECONDS = config(
+    "SHARED_LINK_RETENTION_SECONDS",
+    default=0,
+    cast=int,
+)
+
+# Live dashboard events (server-sent events): how often each open stream
+# checks for changes, and how long a stream lives before the browser
+# reconnects
+LIVE_EVENTS_POLL_SECONDS = config("LIVE_EVENTS_POLL_SECONDS", default=2, cast=float)
+LIVE_EVENTS_MAX_STREAM_SECONDS = config(
+    "LIVE_EVENTS_MAX_STREAM_SECONDS",
+    default=300,
+    cast=int,
+)
+
+# How long a user resolved from a JWT access token stays cached (0 disables)
+JWT_USER_CACHE_SECONDS = config("JWT_USER_CACHE_SECONDS", default=60, cast=int)
+
+# How often each process re-reads the refresh-token blacklist when no shared
+# cache announces changes
+TOKEN_BLACKLIST_SYNC_SECONDS = config(
+    "TOKEN_BLACKLIST_SYNC_SECONDS", default=5, cast=float
+)
+
+# Minimum time between last_login writes when a user obtains API tokens
+LAST_LOGIN_UPDATE_INTERVAL_SECONDS = config(
+    "LAST_LOGIN_UPDATE_INTERVAL_SECONDS", default=300, cast=int
+)
+
+# Fraction of requests timed (db, storage, render) and logged (0 disables)
+SERVER_TIMING_SAMPLE_RATE = config("SERVER_TIMING_SAMPLE_RATE", default=0.0, cast=float)
+# Also send the timings to clients in a Server-Timing header
+SERVER_TIMING_HEADER = config("SERVER_TIMING_HEADER", default=DEBUG, cast=bool)
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -125,6 +164,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -133,6 +173,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.core.middleware.HashingGateMiddleware",
 ]
 
 # Dev-only apps and middleware
@@ -146,7 +187,8 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates, with renders timed for Server-Timing
+        "BACKEND": "apps.core.timing.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -177,6 +219,56 @@ DATABASES = {
 }
 
 
+# Cache
+
+# Defaults to per-process memory. Deployments with several workers should
+# point this at a shared backend (e.g. DatabaseCache or RedisCache) so
+# per-user listing versions and counts stay consistent across processes.
+CACHES = {
+    "default": {
+        "BACKEND": (
+            config("CACHE_BACKEND", default="").strip()
+            or "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="").strip() or "vaultshare",
+    }
+}
+_PER_PROCESS_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+# Longest time cached listing counts and pages are reused (seconds). Other
+# workers only see a user's changes through a shared cache; with a
+# per-process one they wait for their entries to expire, so keep it short
+LISTING_CACHE_SECONDS = config(
+    "LISTING_CACHE_SECONDS",
+    default=5 if CACHES["default"]["BACKEND"] in _PER_PROCESS_CACHES else 60 * 60,
+    cast=int,
+)
+
+
+# Password hashing
+
+# Django's defaults, with PBKDF2 (the active hasher) behind a per-process
+# concurrency gate; see apps/users/hashers.py
+PASSWORD_HASHERS = [
+    "apps.users.hashers.GatedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Concurrent password hashes per process, and how long a request waits for
+# a free slot before getting 503
+PASSWORD_HASH_CONCURRENCY = config(
+    "PASSWORD_HASH_CONCURRENCY", default=os.cpu_count() or 2, cast=int
+)
+PASSWORD_HASH_WAIT_SECONDS = config(
+    "PASSWORD_HASH_WAIT_SECONDS", default=0.5, cast=float
+)
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -235,7 +327,7 @@ if USE_S3:
             "BACKEND": STATICFILES_BACKEND,
         },
         "default": {
-            "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+            "BACKEND": "apps.files.storage.s3.TunedS3Storage",
             "OPTIONS": {"location": AWS_MEDIA_LOCATION},
         },
     }
@@ -251,7 +343,16 @@ if USE_S3:
     AWS_DEFAULT_ACL = None
     AWS_QUERYSTRING_AUTH = True
     AWS_QUERYSTRING_EXPIRE = 300  # TTL (seconds) – 5 minutes
-    AWS_S3_FILE_OVERWRITE = False
+    # Upload keys are unique by construction (apps/files/storage/keys.py), so
+    # skip the HEAD request that looks for a free name on every save
+    AWS_S3_FILE_OVERWRITE = True
+
+    # Multipart transfers for server-side reads and writes: part size, and
+    # parts moved in parallel per transfer (1 disables threads)
+    AWS_S3_MULTIPART_CHUNKSIZE = (
+        config("AWS_S3_MULTIPART_CHUNK_MB", default=16, cast=int) * 1024 * 1024
+    )
+    AWS_S3_MAX_CONCURRENCY = config("AWS_S3_MAX_CONCURRENCY", default=10, cast=int)
 
     # R2/other S3-compatible targets (optional)
     AWS_S3_ENDPOINT_URL = config("AWS_S3_ENDPOINT_URL", default=None)
@@ -272,10 +373,36 @@ else:
             "BACKEND": STATICFILES_BACKEND,
         },
         "default": {
-            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "BACKEND": "apps.files.storage.bulk.BulkFileSystemStorage",
+            "OPTIONS": {"allow_overwrite": True},  # keys are unique
         },
     }
 
+# Local disk cache in front of media storage, in bytes (0 disables)
+STORAGE_CACHE_MAX_BYTES = config("STORAGE_CACHE_MAX_BYTES", default=0, cast=int)
+# Directory for cached copies (shared by all processes on a host; defaults
+# to the system temp directory, outside the checkout)
+STORAGE_CACHE_DIR = config("STORAGE_CACHE_DIR", default="") or os.path.join(
+    tempfile.gettempdir(), "vaultshare-storage-cache"
+)
+# Also cache uploads as they are saved, not only objects that are read
+STORAGE_CACHE_WRITE_THROUGH = config(
+    "STORAGE_CACHE_WRITE_THROUGH", default=True, cast=bool
+)
+
+if STORAGE_CACHE_MAX_BYTES:
+    STORAGES["origin"] = STORAGES["default"]
+    STORAGES["default"] = {
+        "BACKEND": "apps.files.storage.cached.CachedStorage",
+        "OPTIONS": {"backend": "origin"},
+    }
+
+# Time media storage calls for sampled requests; the timing layer stays out
+# of the storage chain otherwise
+if SERVER_TIMING_SAMPLE_RATE:
+    STORAGES["media"] = STORAGES["default"]
+    STORAGES["default"] = {"BACKEND": "apps.files.storage.timed.TimedStorage"}
+
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -290,13 +417,13 @@ NPM_BIN_PATH = config("NPM_BIN_PATH", default=None)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.ScopedRateThrottle",
+        "apps.core.throttling.AnonRateThrottle",
+        "apps.core.throttling.UserRateThrottle",
+        "apps.core.throttling.ScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         # generic fallbacks
@@ -331,7 +458,9 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=14),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
-    "UPDATE_LAST_LOGIN": True,  # update User.last_login on token obtain
+    # last_login is updated by the obtain view, at most once per
+    # LAST_LOGIN_UPDATE_INTERVAL_SECONDS per user
+    "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",  # default HMAC using SECRET_KEY
     "AUTH_HEADER_TYPES": ("Bearer",),  # use Authorization: Bearer <token>
     "LEEWAY": 30,  # allow 30s clock skew when validating token exp/nbf
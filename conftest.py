@@ -1,8 +1,10 @@
 import tempfile
 
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from apps.users.tokens import blacklist_index
 from tests.factories import UserFactory
 
 
@@ -58,3 +60,21 @@ def _temp_media(settings):
         settings.MEDIA_ROOT = tmpdir
         yield
         # files auto-removed with tmpdir context
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """
+    Start every test with an empty cache; user ids are reused across tests.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_blacklist_index():
+    """
+    Drop blacklist rows cached in-process; primary keys restart per test.
+    """
+    blacklist_index.reset()
@@ -16,6 +16,7 @@
     const fileLabel = document.getElementById('file-label');
     const pickerGroup = document.getElementById('file-picker-group');
     const filenameGroup = document.getElementById('filename-group');
+    const searchInput = document.getElementById('files-search');
 
     // File selection state helper
     const hasFile = () => fileInput.files && fileInput.files.length > 0;
@@ -127,8 +128,7 @@
             const data = await res.json().catch(() => ({}));
 
             if (res.ok && data.success) {
-                // Swap in the fresh list HTML
-                listBodyEl.innerHTML = data.html;
+                insertUploadedRow(data);
 
                 // Reset form + UI state
                 uploadForm.reset();
@@ -154,6 +154,57 @@
         }
     });
 
+    /* ---------- Delta helpers ---------- */
+    const rowsEl = () => document.getElementById('files-rows');
+
+    function currentPage() {
+        const url = new URL(window.location.href);
+        return Number(url.searchParams.get('page') || '1');
+    }
+
+    const currentSearch = () => new URL(window.location.href).searchParams.get('search') || '';
+
+    function setPagination(html) {
+        const el = document.getElementById('files-pagination');
+        if (el) el.innerHTML = html;
+    }
+
+    // Full refresh, used only when the visible page boundaries shift
+    function goToPage(page) {
+        const url = new URL(window.location.href);
+        url.searchParams.set('page', String(page));
+        history.replaceState(null, '', url.toString());
+        loadPage(url.toString());
+    }
+
+    // New uploads go to the top of page 1; push the overflow row off the end
+    function insertUploadedRow(data) {
+        const rows = rowsEl();
+        // Search results may or may not include the new file; let the server decide
+        if (currentPage() !== 1 || !rows || currentSearch()) {
+            goToPage(1);
+            return;
+        }
+        rows.insertAdjacentHTML('afterbegin', data.row_html);
+        while (rows.children.length > data.page_size) {
+            rows.lastElementChild.remove();
+        }
+        setPagination(data.pagination_html);
+    }
+
+    // Drop the deleted row and pull up the first row of the next page
+    function removeDeletedRow(data, row) {
+        row?.remove();
+        if (data.count === 0 || data.page !== currentPage() || !rowsEl()) {
+            goToPage(data.page);
+            return;
+        }
+        if (data.fill_html) {
+            rowsEl().insertAdjacentHTML('beforeend', data.fill_html);
+        }
+        setPagination(data.pagination_html);
+    }
+
     /* ---------- Pagination (AJAX) ---------- */
     async function loadPage(url) {
         try {
@@ -179,6 +230,21 @@
         }
     }
 
+    /* ---------- Filename search ---------- */
+    let searchTimer;
+    searchInput?.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            const url = new URL(window.location.href);
+            const term = searchInput.value.trim();
+            if (term) url.searchParams.set('search', term);
+            else url.searchParams.delete('search');
+            url.searchParams.delete('page');
+            history.replaceState(null, '', url.toString());
+            loadPage(url.toString());
+        }, 300);
+    });
+
     /* ---------- Pagination link click handler ---------- */
     listBodyEl.addEventListener('click', (e) => {
         const a = e.target.closest('a[data-page-link]');
@@ -194,6 +260,26 @@
         loadPage(url.toString());
     });
 
+    /* ---------- Live updates (server-sent events) ---------- */
+    const eventsUrl = document.getElementById('files-list')?.dataset.eventsUrl;
+    if (eventsUrl && window.EventSource) {
+        const source = new EventSource(eventsUrl);
+        const hasRow = (id) => document.getElementById(`f-${id}`) !== null;
+
+        // Changes made elsewhere (another tab, the API, expiry) that this
+        // page has not already applied itself trigger a refresh of the page
+        source.addEventListener('file.created', (e) => {
+            if (!hasRow(JSON.parse(e.data).id)) loadPage(window.location.href);
+        });
+        for (const name of ['file.deleted', 'file.expired']) {
+            source.addEventListener(name, (e) => {
+                if (hasRow(JSON.parse(e.data).id)) loadPage(window.location.href);
+            });
+        }
+        // A change the stream couldn't pin down (large accounts)
+        source.addEventListener('files.changed', () => loadPage(window.location.href));
+    }
+
     /* --------------- Delete handler --------------- */
     listBodyEl.addEventListener('submit', async (e) => {
         const form = e.target.closest('form.delete-form');
@@ -219,6 +305,8 @@
 
         try {
             const formData = new FormData(form);
+            formData.set('page', String(currentPage()));
+            formData.set('search', currentSearch());
             const res = await fetch(form.action, {
                 method: 'POST',
                 headers: {
@@ -229,26 +317,17 @@
                 credentials: 'same-origin',
             });
 
-            if (res.status === 204) {
-                row?.remove();
-                const remaining = listBodyEl.querySelectorAll('li[id^="f-"]').length;
-                if (remaining === 0) {
-                    // If page became empty, try loading previous page; else reload current
-                    const url = new URL(window.location.href);
-                    const currentPage = Number(url.searchParams.get('page') || '1');
-                    const targetPage = Math.max(1, currentPage - 1);
-                    url.searchParams.set('page', String(targetPage));
-                    history.replaceState(null, '', url.toString());
-                    loadPage(url.toString());
-                }
+            const data = res.ok ? await res.json().catch(() => ({})) : {};
+            if (data.success) {
+                removeDeletedRow(data, row);
                 return;
             }
 
             // Try to surface server message if provided
             let msg = 'Could not delete file. Please try again.';
             try {
-                const data = await res.json();
-                if (data?.detail) msg = data.detail;
+                const err = await res.json();
+                if (err?.detail) msg = err.detail;
             } catch { }
             alert(msg);
         } catch {
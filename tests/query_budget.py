@@ -0,0 +1,93 @@
+"""
+Query-count budgets for views.
+
+A budget check runs a request against a small and a larger data set and
+fails if either run exceeds the declared number of queries, or if the count
+grows with the number of rows (an N+1). Failures list the SQL of each run
+and a diff between them.
+"""
+
+import difflib
+import re
+from collections.abc import Callable
+from typing import Any
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Row counts each request is measured at
+SIZES = (1, 10)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"IN \((?:\?, )*\?\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replace literals with placeholders so runs with different data compare equal.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _IN_LIST_RE.sub("IN (...)", sql)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def check_query_budget(
+    request: Callable[..., Any],
+    *,
+    budget: int,
+    seed: Callable[[int], Any] | None = None,
+    prepare: Callable[[], Any] | None = None,
+    sizes: tuple[int, ...] = SIZES,
+) -> list[int]:
+    """
+    Run `request` once per size and check its query counts.
+
+    - `seed(n)` adds `n` rows before a run, growing the data set to each size
+      in turn. Without it, the request runs once.
+    - `prepare()` runs before each request, outside the measurement, and its
+      result is passed to `request` (e.g. a fresh object to delete).
+    - Caches are cleared before each run, so budgets cover the cold path.
+
+    Returns the query count of each run.
+    """
+    runs = []
+    seeded = 0
+    for size in sizes if seed else sizes[:1]:
+        if seed:
+            seed(size - seeded)
+            seeded = size
+        args = (prepare(),) if prepare else ()
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            request(*args)
+        runs.append((size, [q["sql"] for q in ctx.captured_queries]))
+
+    counts = [len(queries) for _, queries in runs]
+    if max(counts) > budget or len(set(counts)) > 1:
+        raise QueryBudgetExceeded(_report(runs, budget))
+    return counts
+
+
+def _report(runs, budget: int) -> str:
+    lines = [f"Query budget is {budget}; got:"]
+    for size, queries in runs:
+        lines.append(f"\n--- {len(queries)} queries with {size} row(s) ---")
+        lines += [f"{i}. {sql}" for i, sql in enumerate(queries, 1)]
+
+    if len(runs) > 1:
+        (small, first), (large, last) = runs[0], runs[-1]
+        diff = difflib.unified_diff(
+            [normalize_sql(sql) for sql in first],
+            [normalize_sql(sql) for sql in last],
+            fromfile=f"{small} row(s)",
+            tofile=f"{large} row(s)",
+            lineterm="",
+        )
+        lines += ["\n--- normalized diff ---", *diff]
+    return "\n".join(lines)
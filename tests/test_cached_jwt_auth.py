@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.cache import _user_key, get_cached_user
+
+# Helpers
+
+
+def _bearer(client, user):
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+def _user_queries(client):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(reverse("files_api:files-list"))
+    assert resp.status_code == status.HTTP_200_OK
+    return [q["sql"] for q in ctx.captured_queries if '"users_user"' in q["sql"]]
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_repeat_requests_skip_user_query(api_client, user):
+    client = _bearer(api_client, user)
+    assert len(_user_queries(client)) == 1
+    assert _user_queries(client) == []
+
+
+@pytest.mark.django_db
+def test_cached_entry_holds_no_password_hash(api_client, user):
+    _user_queries(_bearer(api_client, user))
+
+    payload = pickle.dumps(cache.get(_user_key(user.pk)))
+    assert user.password.encode() not in payload
+
+    cached_user, _ = get_cached_user(user.pk)
+    assert cached_user.email == user.email
+    assert "password" in cached_user.get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected_despite_cache(api_client, user):
+    client = _bearer(api_client, user)
+    _user_queries(client)  # warm the cache
+
+    user.is_active = False
+    user.save()
+
+    resp = client.get(reverse("files_api:files-list"))
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_password_change_evicts_cached_user(api_client, user):
+    _user_queries(_bearer(api_client, user))
+    assert get_cached_user(user.pk) is not None
+
+    user.set_password("a-new-password-123")
+    user.save()
+    assert get_cached_user(user.pk) is None
+
+
+@pytest.mark.django_db
+def test_group_changes_evict_cached_user(api_client, user):
+    client = _bearer(api_client, user)
+    group = Group.objects.create(name="staff")
+
+    _user_queries(client)
+    user.groups.add(group)
+    assert get_cached_user(user.pk) is None
+
+    _user_queries(client)
+    group.user_set.clear()
+    assert get_cached_user(user.pk) is None
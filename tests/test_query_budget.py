@@ -0,0 +1,26 @@
+import pytest
+
+from apps.files.models import UploadedFile
+from apps.files.tests.factories import UploadedFileFactory
+from tests.query_budget import QueryBudgetExceeded, check_query_budget, normalize_sql
+
+
+def test_normalize_sql_replaces_literals():
+    sql = "SELECT * FROM t WHERE a = 'x''y' AND b IN (1, 2, 3) LIMIT 10"
+    assert normalize_sql(sql) == "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?"
+
+
+@pytest.mark.django_db
+def test_growing_query_count_fails_with_diff(user):
+    def n_plus_one():
+        for f in UploadedFile.objects.filter(user=user):
+            f.user  # noqa: B018 - loads each user separately
+
+    with pytest.raises(QueryBudgetExceeded) as exc:
+        check_query_budget(
+            n_plus_one,
+            budget=20,
+            seed=lambda n: UploadedFileFactory.create_batch(n, user=user),
+        )
+    assert "--- normalized diff ---" in str(exc.value)
+    assert '+SELECT "users_user"' in str(exc.value)
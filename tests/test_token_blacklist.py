@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.tokens import _VERSION_KEY, blacklist_index
+from tests.auth_url_helpers import jwt_refresh_url, jwt_verify_url
+
+# Helpers
+
+
+def _outstanding(user, expires_at, blacklisted=False):
+    token = OutstandingToken.objects.create(
+        user=user,
+        jti=f"jti-{OutstandingToken.objects.count()}",
+        token="-",
+        expires_at=expires_at,
+    )
+    if blacklisted:
+        BlacklistedToken.objects.create(token=token)
+    return token
+
+
+# Tests
+
+
+@pytest.mark.django_db
+def test_index_sees_tokens_blacklisted_by_other_processes(settings, user):
+    settings.TOKEN_BLACKLIST_SYNC_SECONDS = 3600
+    token = RefreshToken.for_user(user)
+    blacklist_index.sync(force=True)
+
+    token.blacklist()  # the stock class, as another process would
+    assert token["jti"] not in blacklist_index
+
+    cache.set(_VERSION_KEY, 1)  # another process announcing its write
+    assert token["jti"] in blacklist_index
+
+
+@pytest.mark.django_db
+def test_blacklist_check_is_query_free_once_synced(
+    django_assert_num_queries, settings, user
+):
+    settings.TOKEN_BLACKLIST_SYNC_SECONDS = 3600
+    blacklist_index.sync(force=True)
+
+    with django_assert_num_queries(0):
+        assert "unknown-jti" not in blacklist_index
+
+
+@pytest.mark.django_db
+def test_replayed_refresh_token_rejected_by_stale_index(api_client, settings, user):
+    settings.TOKEN_BLACKLIST_SYNC_SECONDS = 3600
+    refresh = str(RefreshToken.for_user(user))
+    resp = api_client.post(jwt_refresh_url(), {"refresh": refresh})
+    assert resp.status_code == status.HTTP_200_OK
+
+    blacklist_index.reset()
+    blacklist_index.sync(force=True)
+    blacklist_index._expiry.clear()  # as if this process never saw the rotation
+
+    resp = api_client.post(jwt_refresh_url(), {"refresh": refresh})
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_verify_rejects_blacklisted_refresh_token(api_client, user):
+    token = RefreshToken.for_user(user)
+    token.blacklist()
+
+    resp = api_client.post(jwt_verify_url(), {"token": str(token)})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_prune_tokens_deletes_only_expired(user):
+    now = timezone.now()
+    for _ in range(3):
+        _outstanding(user, now - timedelta(days=1), blacklisted=True)
+    _outstanding(user, now - timedelta(days=1))
+    keep = _outstanding(user, now + timedelta(days=1), blacklisted=True)
+
+    out = StringIO()
+    call_command("prune_tokens", "--batch-size", "2", stdout=out)
+
+    assert list(OutstandingToken.objects.all()) == [keep]
+    assert BlacklistedToken.objects.count() == 1
+    assert "Deleted 4 outstanding and 3 blacklisted" in out.getvalue()